@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Incremental analysis cache for run CSV directories.
+
+SQLite sidecar (`<results_dir>/.analysis_cache.sqlite`) holding one parsed row
+per run CSV, keyed on path and validated by (mtime, size, SHA-256):
+
+- unchanged files (same mtime and size) are never reopened
+- touched files with the same content hash only get their stat refreshed
+- new/changed files are parsed, and removed files are dropped
+
+Statistics are computed by the analysis scripts from `load_frame()` (the
+bootstrap needs every run anyway); the cache only saves the reparse.
+
+Usage:
+    cache = AnalysisCache(Path("results/nc9_overhead_invariance/ground_only"))
+    report = cache.refresh()
+    df = cache.load_frame()
+"""
+
+import hashlib
+import os
+import sqlite3
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from fast_loader import (ANALYSIS_COLUMNS, DEFAULT_COLUMNS, RUN_FIELDS, LoadReport, list_run_files,
+                         parse_run_text, run_protocol)
+
+# Sidecar file name (created inside the results directory)
+CACHE_FILENAME = ".analysis_cache.sqlite"
+
+# Bump when the table layout or parsing rules change (forces a rebuild)
+SCHEMA_VERSION = 1
+
+_SQL_TYPES = {str: 'TEXT', int: 'INTEGER', float: 'REAL'}
+
+
+@dataclass
+class RefreshReport:
+    """What a cache refresh did."""
+    reused: int = 0      # stat unchanged, not reopened
+    rehashed: int = 0    # stat changed but content identical
+    parsed: int = 0      # new or modified runs
+    removed: int = 0     # files no longer present
+    failures: List[Tuple[str, str]] = field(default_factory=list)
+
+    def summary(self) -> str:
+        return (f"{self.reused} cached, {self.parsed} parsed, "
+                f"{self.rehashed} rehashed, {self.removed} removed, "
+                f"{len(self.failures)} failed")
+
+    def print_summary(self, max_examples: int = 5) -> None:
+        """Print parse failures as one summary (see fast_loader.LoadReport)."""
+        found = self.reused + self.rehashed + self.parsed + len(self.failures)
+        LoadReport(files_found=found, failures=self.failures).print_summary(max_examples)
+
+
+class AnalysisCache:
+    """Persistent parsed-run cache for one results directory."""
+
+    def __init__(self, results_dir: Path, pattern: str = "*.csv",
+                 metrics: Sequence[str] = DEFAULT_COLUMNS,
+                 db_path: Optional[Path] = None):
+        """
+        Args:
+            results_dir: Directory of run CSVs
+            pattern: Filename glob for run CSVs
+            metrics: Metric columns to cache (analysis names, see fast_loader)
+            db_path: Cache file (default: <results_dir>/.analysis_cache.sqlite)
+        """
+        self.results_dir = Path(results_dir)
+        self.pattern = pattern
+        self.metrics = list(metrics)
+        self.db_path = Path(db_path) if db_path else self.results_dir / CACHE_FILENAME
+
+        raw_names = {ANALYSIS_COLUMNS.get(name, name): name for name in RUN_FIELDS}
+        self._raw = {metric: raw_names[metric] for metric in self.metrics}
+
+        self._conn = sqlite3.connect(self.db_path)
+        self._init_schema()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _init_schema(self) -> None:
+        cur = self._conn.cursor()
+        cur.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = cur.execute("SELECT value FROM meta WHERE key = 'layout'").fetchone()
+        layout = f"{SCHEMA_VERSION}:{self.pattern}:{','.join(self.metrics)}"
+
+        if row is None or row[0] != layout:
+            # Layout changed (or fresh file): rebuild from scratch
+            cur.execute("DROP TABLE IF EXISTS runs")
+            metric_cols = ', '.join(
+                f"{m} {_SQL_TYPES[RUN_FIELDS[self._raw[m]]]}" for m in self.metrics)
+            cur.execute(f"""CREATE TABLE runs (
+                path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, sha256 TEXT,
+                protocol TEXT, seed INTEGER, {metric_cols})""")
+            cur.execute("INSERT OR REPLACE INTO meta VALUES ('layout', ?)", (layout,))
+        self._conn.commit()
+
+    def refresh(self) -> RefreshReport:
+        """Synchronize the cache with the results directory."""
+        report = RefreshReport()
+        cur = self._conn.cursor()
+
+        indexed = {path: (mtime, size, digest) for path, mtime, size, digest
+                   in cur.execute("SELECT path, mtime_ns, size, sha256 FROM runs")}
+        present = set()
+
+        for path in list_run_files(self.results_dir, self.pattern):
+            present.add(path)
+            st = os.stat(path)
+            known = indexed.get(path)
+            if known is not None and known[0] == st.st_mtime_ns and known[1] == st.st_size:
+                report.reused += 1
+                continue
+
+            with open(path, 'rb') as f:
+                content = f.read()
+            digest = hashlib.sha256(content).hexdigest()
+
+            if known is not None and known[2] == digest:
+                cur.execute("UPDATE runs SET mtime_ns = ?, size = ? WHERE path = ?",
+                            (st.st_mtime_ns, st.st_size, path))
+                report.rehashed += 1
+                continue
+
+            # New or modified run: replace its row
+            cur.execute("DELETE FROM runs WHERE path = ?", (path,))
+            try:
+                record = parse_run_text(content.decode())
+                protocol = run_protocol(record)
+                values = {m: record.get(self._raw[m]) for m in self.metrics}
+            except Exception as e:
+                report.failures.append((os.path.basename(path), f"{type(e).__name__}: {e}"))
+                continue
+
+            placeholders = ', '.join('?' * (6 + len(self.metrics)))
+            cur.execute(f"INSERT INTO runs VALUES ({placeholders})",
+                        (path, st.st_mtime_ns, st.st_size, digest, protocol,
+                         record['seed'], *values.values()))
+            report.parsed += 1
+
+        for path in set(indexed) - present:
+            cur.execute("DELETE FROM runs WHERE path = ?", (path,))
+            report.removed += 1
+
+        self._conn.commit()
+        return report
+
+    def load_frame(self, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Cached runs as a DataFrame (categorical protocol, sorted by protocol/seed)."""
+        columns = list(self.metrics if columns is None else columns)
+        df = pd.read_sql_query(
+            f"SELECT protocol, seed, {', '.join(columns)} FROM runs ORDER BY protocol, seed",
+            self._conn)
+        df['protocol'] = df['protocol'].astype('category')
+        return df
@@ -21,16 +21,28 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from scipy import stats
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Tuple
+
+from fast_loader import ANALYSIS_COLUMNS, load_run_directory
+from grouped_stats import summarize
+from hypothesis_tests import compare_groups, omnibus_row
+from resampling import bootstrap_summary
+from results_store import read_runs, store_has_experiment
 
 # Configuration
 CONTROL_DIR = Path("results/nc10_stability_analysis/ground_baseline")
+
+# Results store experiment for the ground baseline
+# (same runs as NC9 ground-only - CONTROL_DIR symlinks to them)
+STORE_EXPERIMENT = "nc9_ground_only"
 OUTPUT_DIR = Path("results/nc10_stability_analysis")
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-# Dual-layer reference (NC9 result from Week 29)
+# Dual-layer runs (ground + satellites); ANOVA is recomputed from these when present
+DUAL_LAYER_DIR = Path("results/nc9_overhead_invariance/dual_layer")
+
+# Dual-layer reference (NC9 result from Week 29), used when DUAL_LAYER_DIR is absent
 DUAL_LAYER_P_VALUE = 0.837
 DUAL_LAYER_NRL = {
     'AODV': 0.220,   # 22.0% overhead
@@ -48,95 +60,67 @@ class Color:
     NC = '\033[0m'  # No Color
 
 
-def load_single_csv(csv_path: Path) -> Dict:
-    """Load single control experiment CSV file."""
-    try:
-        # Read key-value CSV format
-        df = pd.read_csv(csv_path)
-
-        # Convert to dictionary
-        data = dict(zip(df['metric'], df['value']))
-
-        # Extract required fields
-        return {
-            'protocol': str(data['ground_routing']).upper(),
-            'seed': int(data['seed']),
-            'nrl': float(data['nrl']),
-            'pdr': float(data['pdr']),
-            'delay_ms': float(data['avg_delay_ms'])
-        }
-    except Exception as e:
-        print(f"{Color.YELLOW}Warning: Failed to load {csv_path.name}: {e}{Color.NC}")
-        return None
-
-
 def load_control_data() -> pd.DataFrame:
     """Load ground-only control experiment data."""
+    if store_has_experiment(STORE_EXPERIMENT):
+        df = read_runs(experiment=STORE_EXPERIMENT,
+                       columns=['seed', 'nrl', 'pdr', 'avg_delay_ms'])
+        df = df.rename(columns=ANALYSIS_COLUMNS).drop(columns=['experiment'])
+        return df.sort_values(['protocol', 'seed']).reset_index(drop=True)
+
     if not CONTROL_DIR.exists():
         print(f"{Color.RED}ERROR: Control experiment directory not found: {CONTROL_DIR}{Color.NC}")
         print("Run scripts/run_control_ground_only.sh first")
         return None
 
-    data = []
-    csv_files = sorted(CONTROL_DIR.glob("ground_only_*.csv"))
+    df, report = load_run_directory(CONTROL_DIR, pattern="ground_only_*.csv",
+                                    columns=['nrl', 'pdr', 'delay_ms'])
 
-    if not csv_files:
+    if report.files_found == 0:
         print(f"{Color.RED}ERROR: No CSV files found in {CONTROL_DIR}{Color.NC}")
         return None
 
-    for csv_file in csv_files:
-        record = load_single_csv(csv_file)
-        if record:
-            data.append(record)
+    if report.failures:
+        print(Color.YELLOW, end='')
+        report.print_summary()
+        print(Color.NC, end='')
 
-    if not data:
+    if df.empty:
         print(f"{Color.RED}ERROR: Failed to load any data{Color.NC}")
         return None
 
-    return pd.DataFrame(data)
+    return df
 
 
 def compute_statistics(df: pd.DataFrame) -> pd.DataFrame:
-    """Compute statistics per protocol."""
-    stats_list = []
-
-    for protocol in sorted(df['protocol'].unique()):
-        protocol_data = df[df['protocol'] == protocol]['nrl']
-
-        n = len(protocol_data)
-        mean = protocol_data.mean()
-        std = protocol_data.std()
-        sem = protocol_data.sem()
-
-        # 95% CI using t-distribution
-        from scipy.stats import t as t_dist
-        t_critical = t_dist.ppf(0.975, n - 1) if n > 1 else 1.96
-        margin = t_critical * sem
-
-        stats_list.append({
-            'protocol': protocol,
-            'n': n,
-            'mean': mean,
-            'std': std,
-            'sem': sem,
-            'ci_lower': mean - margin,
-            'ci_upper': mean + margin,
-            'cv': (std / mean * 100) if mean > 0 else 0.0
-        })
-
-    return pd.DataFrame(stats_list)
+    """Compute NRL statistics per protocol (t and bootstrap BCa intervals)."""
+    summary = summarize(df, by=['protocol'], metrics=['nrl'])
+    boot = bootstrap_summary(df, by=['protocol'], metrics=['nrl'])
+    summary = summary.merge(boot.drop(columns='metric'), on='protocol', how='left')
+    return summary[['protocol', 'n', 'mean', 'std', 'sem', 'ci_lower', 'ci_upper',
+                    'boot_lower', 'boot_upper', 'cv']]
 
 
 def run_anova(df: pd.DataFrame) -> Tuple[float, float]:
     """Run ANOVA to test if protocols differ."""
-    # Split data by protocol
-    groups = [df[df['protocol'] == protocol]['nrl'].values
-              for protocol in sorted(df['protocol'].unique())]
+    tests = compare_groups(df, metrics=['nrl'], posthoc=False)
+    anova = omnibus_row(tests, 'nrl', 'anova')
+    return anova['statistic'], anova['p_value']
+
+
+def load_dual_layer_p() -> Tuple[float, str]:
+    """Dual-layer NRL ANOVA p-value, computed from runs when available.
 
-    # Run one-way ANOVA
-    f_stat, p_value = stats.f_oneway(*groups)
+    Returns:
+        (p-value, source label) - falls back to the published NC9 reference
+    """
+    if DUAL_LAYER_DIR.exists():
+        df, _ = load_run_directory(DUAL_LAYER_DIR, columns=['nrl'])
+        if df['protocol'].nunique() > 1:
+            _, p_value = run_anova(df)
+            return p_value, f"{len(df)} runs in {DUAL_LAYER_DIR}"
 
-    return f_stat, p_value
+    return DUAL_LAYER_P_VALUE, "NC9 reference"
 
 
 def plot_comparison(df: pd.DataFrame, stats_df: pd.DataFrame,
@@ -237,7 +221,8 @@ def plot_comparison(df: pd.DataFrame, stats_df: pd.DataFrame,
 
 
 def generate_report(df: pd.DataFrame, stats_df: pd.DataFrame,
-                   ground_f: float, ground_p: float) -> None:
+                   ground_f: float, ground_p: float,
+                   dual_p: float, dual_source: str) -> None:
     """Generate text report."""
     report_path = OUTPUT_DIR / 'ground_baseline_report.txt'
 
@@ -263,6 +248,7 @@ def generate_report(df: pd.DataFrame, stats_df: pd.DataFrame,
             f.write(f"  Mean NRL: {row['mean']:.4f} ({row['mean']*100:.1f}% overhead)\n")
             f.write(f"  Std dev:  {row['std']:.4f}\n")
             f.write(f"  95% CI:   [{row['ci_lower']:.4f}, {row['ci_upper']:.4f}]\n")
+            f.write(f"  Boot CI:  [{row['boot_lower']:.4f}, {row['boot_upper']:.4f}] (BCa)\n")
             f.write(f"  CV:       {row['cv']:.2f}%\n")
 
         # ANOVA results
@@ -270,7 +256,7 @@ def generate_report(df: pd.DataFrame, stats_df: pd.DataFrame,
         f.write("STATISTICAL COMPARISON\n")
         f.write("-" * 80 + "\n")
         f.write(f"Ground-Only ANOVA:  F={ground_f:.3f}, p={ground_p:.4f}\n")
-        f.write(f"Dual-Layer ANOVA:   p={DUAL_LAYER_P_VALUE:.4f} (NC9 result)\n")
+        f.write(f"Dual-Layer ANOVA:   p={dual_p:.4f} ({dual_source})\n")
         f.write("\n")
 
         # Interpretation
@@ -280,7 +266,7 @@ def generate_report(df: pd.DataFrame, stats_df: pd.DataFrame,
 
         if ground_p < 0.05:
             f.write("✓ SUCCESS: Protocols DIFFER in ground-only MANET (p < 0.05)\n")
-            f.write("✓ Dual-layer: Protocols IDENTICAL (p = 0.837)\n")
+            f.write(f"✓ Dual-layer: Protocols IDENTICAL (p = {dual_p:.3f})\n")
             f.write("✓ CONCLUSION: Overhead invariance is LEO-specific!\n\n")
             f.write("PUBLICATION IMPACT:\n")
             f.write("  - Proves invariance is architectural phenomenon (not measurement artifact)\n")
@@ -341,6 +327,7 @@ def main():
     # Run ANOVA
     print("Running ANOVA...")
     ground_f, ground_p = run_anova(df)
+    dual_p, dual_source = load_dual_layer_p()
     print(f"{Color.GREEN}  ✓ ANOVA complete{Color.NC}")
     print("")
 
@@ -349,13 +336,13 @@ def main():
     print("ANOVA RESULTS")
     print("=" * 80)
     print(f"Ground-Only MANET:  F={ground_f:.3f}, p={ground_p:.4f}")
-    print(f"Dual-Layer (NC9):   p={DUAL_LAYER_P_VALUE:.4f}")
+    print(f"Dual-Layer (NC9):   p={dual_p:.4f} ({dual_source})")
     print("")
 
     # Interpret results
     if ground_p < 0.05:
         print(f"{Color.GREEN}{Color.BOLD}✓ SUCCESS: Protocols DIFFER in ground-only (p < 0.05){Color.NC}")
-        print(f"{Color.GREEN}✓ Dual-layer: Protocols IDENTICAL (p = 0.837){Color.NC}")
+        print(f"{Color.GREEN}✓ Dual-layer: Protocols IDENTICAL (p = {dual_p:.3f}){Color.NC}")
         print(f"{Color.GREEN}✓ PROOF: Invariance is LEO-specific (architectural phenomenon)!{Color.NC}")
         print("")
         print(f"{Color.BOLD}PUBLICATION IMPACT:{Color.NC}")
@@ -379,12 +366,12 @@ def main():
 
     # Generate plots
     print("Generating plots...")
-    plot_comparison(df, stats_df, ground_p, DUAL_LAYER_P_VALUE)
+    plot_comparison(df, stats_df, ground_p, dual_p)
     print("")
 
     # Generate report
     print("Generating report...")
-    generate_report(df, stats_df, ground_f, ground_p)
+    generate_report(df, stats_df, ground_f, ground_p, dual_p, dual_source)
     print("")
 
     # Final summary
@@ -11,102 +11,75 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
-from scipy import stats
-from typing import Dict, List, Any
+from typing import Dict, Any
 
+from analysis_cache import AnalysisCache
+from fast_loader import ANALYSIS_COLUMNS, DEFAULT_COLUMNS
+from grouped_stats import summarize
+from hypothesis_tests import compare_groups, omnibus_row
+from resampling import bootstrap_summary, permutation_test
+from results_store import STORE_DIR, read_runs, store_has_experiment
 
-def load_single_csv(csv_path: Path) -> Dict[str, Any]:
-    """Load single NC9 CSV file, extract NRL metrics."""
-    # Read key-value CSV
-    df = pd.read_csv(csv_path)
+# Results store experiment holding the NC9 ground-only runs
+STORE_EXPERIMENT = "nc9_ground_only"
 
-    # Convert to dictionary
-    data = dict(zip(df['metric'], df['value']))
 
-    # Extract required fields
-    return {
-        'ground_routing': str(data['ground_routing']),
-        'seed': int(data['seed']),
-        'pdr': float(data['pdr']),
-        'avg_delay_ms': float(data['avg_delay_ms']),
-        'nrl': float(data['nrl']),
-        'data_bytes_tx': int(data['data_bytes_tx']),
-        'control_bytes_tx': int(data['control_bytes_tx'])
-    }
-
-
-def load_all_data(results_dir: Path) -> pd.DataFrame:
-    """Load NRL data from all CSV files."""
-    # Find all CSV files
-    all_files = sorted(results_dir.glob("*.csv"))
-
-    # Load all files
-    records = []
-    for file in all_files:
-        try:
-            data = load_single_csv(file)
-            records.append({
-                'protocol': data['ground_routing'].upper(),
-                'seed': data['seed'],
-                'pdr': data['pdr'],
-                'delay_ms': data['avg_delay_ms'],
-                'nrl': data['nrl'],
-                'data_bytes': data['data_bytes_tx'],
-                'control_bytes': data['control_bytes_tx']
-            })
-        except Exception as e:
-            print(f"Warning: Failed to load {file.name}: {e}")
-            continue
-
-    return pd.DataFrame(records)
+def load_from_store(store_dir: Path = STORE_DIR,
+                    experiment: str = STORE_EXPERIMENT) -> pd.DataFrame:
+    """Load NRL data from the columnar results store (projected columns only)."""
+    df = read_runs(store_dir, experiment=experiment,
+                   columns=['seed', 'pdr', 'avg_delay_ms', 'nrl',
+                            'data_bytes_tx', 'control_bytes_tx', 'runtime_seconds'])
+    df = df.rename(columns=ANALYSIS_COLUMNS).drop(columns=['experiment'])
+    return df.sort_values(['protocol', 'seed']).reset_index(drop=True)
 
 
 def compute_summary_stats(df: pd.DataFrame) -> Dict[str, Dict[str, float]]:
-    """Compute summary statistics per protocol."""
-    results = {}
+    """Compute NRL summary statistics per protocol."""
+    summary = summarize(df, by=['protocol'], metrics=['nrl'])
 
-    for protocol in sorted(df['protocol'].unique()):
-        protocol_data = df[df['protocol'] == protocol]['nrl']
-
-        # Basic statistics
-        mean = protocol_data.mean()
-        std = protocol_data.std()
-        sem = protocol_data.sem()
-        n = len(protocol_data)
-
-        # 95% confidence interval using t-distribution
-        from scipy.stats import t
-        t_critical = t.ppf(0.975, n - 1)  # Two-tailed, α=0.05
-        margin = t_critical * sem
-
-        results[protocol] = {
-            'n': int(n),
-            'mean': float(mean),
-            'std': float(std),
-            'sem': float(sem),
-            'ci_lower': float(mean - margin),
-            'ci_upper': float(mean + margin),
-            'cv': float((std / mean) * 100) if mean > 0 else 0.0,
-            'min': float(protocol_data.min()),
-            'max': float(protocol_data.max())
-        }
+    # Bootstrap BCa interval (no normality assumption on 15 seeds)
+    boot = bootstrap_summary(df, by=['protocol'], metrics=['nrl']).set_index('protocol')
+    summary['boot_lower'] = summary['protocol'].map(boot['boot_lower']).astype(float)
+    summary['boot_upper'] = summary['protocol'].map(boot['boot_upper']).astype(float)
 
-    return results
+    return {
+        row['protocol']: {
+            'n': int(row['n']),
+            'mean': float(row['mean']),
+            'std': float(row['std']),
+            'sem': float(row['sem']),
+            'ci_lower': float(row['ci_lower']),
+            'ci_upper': float(row['ci_upper']),
+            'boot_lower': float(row['boot_lower']),
+            'boot_upper': float(row['boot_upper']),
+            'cv': float(row['cv']),
+            'min': float(row['min']),
+            'max': float(row['max'])
+        }
+        for _, row in summary.iterrows()
+    }
 
 
-def run_anova(df: pd.DataFrame) -> Dict[str, Any]:
-    """Run one-way ANOVA to test protocol differences."""
-    # Extract NRL data for each protocol
-    groups = [df[df['protocol'] == protocol]['nrl'].values
-              for protocol in sorted(df['protocol'].unique())]
+def run_anova(df: pd.DataFrame, tests: pd.DataFrame) -> Dict[str, Any]:
+    """Extract the NRL omnibus tests (one-way ANOVA plus Welch/Kruskal/permutation checks).
 
-    # Run one-way ANOVA
-    f_stat, p_value = stats.f_oneway(*groups)
+    Args:
+        tests: Result table from hypothesis_tests.compare_groups
+    """
+    anova = omnibus_row(tests, 'nrl', 'anova')
+    welch = omnibus_row(tests, 'nrl', 'welch_anova')
+    kruskal = omnibus_row(tests, 'nrl', 'kruskal')
 
     return {
-        'f_stat': float(f_stat),
-        'p_value': float(p_value),
-        'significant': bool(p_value < 0.05)
+        'f_stat': float(anova['statistic']),
+        'p_value': float(anova['p_value']),
+        'significant': bool(anova['p_value'] < 0.05),
+        'welch_f': float(welch['statistic']),
+        'welch_p': float(welch['p_value']),
+        'kruskal_h': float(kruskal['statistic']),
+        'kruskal_p': float(kruskal['p_value']),
+        'permutation_p': permutation_test(df, metric='nrl')
     }
 
 
@@ -241,6 +214,7 @@ def generate_text_report(df: pd.DataFrame, stats: Dict, anova: Dict,
             f.write(f"  Mean NRL:       {s['mean']:.4f} ({s['mean']*100:.2f}% overhead)\n")
             f.write(f"  Std deviation:  {s['std']:.4f}\n")
             f.write(f"  95% CI:         [{s['ci_lower']:.4f}, {s['ci_upper']:.4f}]\n")
+            f.write(f"  Bootstrap CI:   [{s['boot_lower']:.4f}, {s['boot_upper']:.4f}] (BCa)\n")
             f.write(f"  Range:          [{s['min']:.4f}, {s['max']:.4f}]\n")
             f.write(f"  Coeff of var:   {s['cv']:.2f}%\n")
 
@@ -259,6 +233,9 @@ def generate_text_report(df: pd.DataFrame, stats: Dict, anova: Dict,
         f.write(f"F-statistic:     {anova['f_stat']:.4f}\n")
         f.write(f"p-value:         {anova['p_value']:.6f}\n")
         f.write(f"Significant:     {'YES (p < 0.05)' if anova['significant'] else 'NO (p >= 0.05)'}\n")
+        f.write(f"Welch ANOVA:     F={anova['welch_f']:.4f}, p={anova['welch_p']:.6f}\n")
+        f.write(f"Kruskal-Wallis:  H={anova['kruskal_h']:.4f}, p={anova['kruskal_p']:.6f}\n")
+        f.write(f"Permutation:     p={anova['permutation_p']:.6f}\n")
 
         # Practical significance
         f.write("\n" + "-" * 80 + "\n")
@@ -306,6 +283,8 @@ def generate_csv_summary(stats: Dict, output_path: Path) -> None:
             'std_nrl': s['std'],
             'ci_lower': s['ci_lower'],
             'ci_upper': s['ci_upper'],
+            'boot_ci_lower': s['boot_lower'],
+            'boot_ci_upper': s['boot_upper'],
             'cv_percent': s['cv'],
             'min_nrl': s['min'],
             'max_nrl': s['max']
@@ -328,9 +307,19 @@ def main():
     print("=" * 80)
     print()
 
-    # Load data
-    print("Loading data from results/nc9_overhead_invariance/ground_only/...")
-    df = load_all_data(results_dir)
+    # Load data (columnar store if imported, otherwise the per-seed CSVs via
+    # the incremental cache - only new/changed seeds are reparsed)
+    if store_has_experiment(STORE_EXPERIMENT):
+        print(f"Loading data from {STORE_DIR} (experiment={STORE_EXPERIMENT})...")
+        df = load_from_store()
+    else:
+        print("Loading data from results/nc9_overhead_invariance/ground_only/...")
+        cache = AnalysisCache(results_dir)
+        refresh = cache.refresh()
+        refresh.print_summary()
+        print(f"  ✓ Cache: {refresh.summary()}")
+        df = cache.load_frame()
+        cache.close()
     print(f"  ✓ Loaded {len(df)} simulations")
     print(f"  ✓ Protocols: {', '.join(sorted(df['protocol'].unique()))}")
     print()
@@ -341,9 +330,10 @@ def main():
     print(f"  ✓ Statistics computed for {len(stats)} protocols")
     print()
 
-    # Run ANOVA
+    # Run hypothesis tests (all metrics, omnibus + post-hoc)
     print("Running ANOVA...")
-    anova = run_anova(df)
+    tests = compare_groups(df)
+    anova = run_anova(df, tests)
     print(f"  ✓ ANOVA complete: F={anova['f_stat']:.4f}, p={anova['p_value']:.6f}")
     print()
 
@@ -367,6 +357,17 @@ def main():
 
     csv_path = output_dir / "nc9_nrl_summary.csv"
     generate_csv_summary(stats, csv_path)
+
+    metrics_path = output_dir / "nc9_metric_summary.csv"
+    metric_summary = summarize(df).merge(
+        bootstrap_summary(df, metrics=[m for m in DEFAULT_COLUMNS if m in df.columns]),
+        on=['protocol', 'metric'], how='left')
+    metric_summary.to_csv(metrics_path, index=False)
+    print(f"  ✓ Saved: {metrics_path}")
+
+    tests_path = output_dir / "nc9_hypothesis_tests.csv"
+    tests.to_csv(tests_path, index=False)
+    print(f"  ✓ Saved: {tests_path}")
     print()
 
     # Print summary
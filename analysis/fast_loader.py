@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Fast loader for unified-simulation `metric,value` run CSVs.
+
+Each run CSV is ~15 lines, so building a pandas DataFrame per file is almost
+pure overhead. This module parses the files with a plain tokenizer into typed
+records, fans large directories out across a process pool in chunks, and
+assembles one columnar DataFrame (categorical `protocol`) at the end.
+
+Files that fail to parse are collected into a LoadReport instead of printing
+one warning per file.
+
+Usage:
+    df, report = load_run_directory(Path("results/nc9_overhead_invariance/ground_only"))
+    report.print_summary()
+"""
+
+import fnmatch
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+# Metrics written by build/unified-simulation and their types.
+# Satellite-only runs omit the ground/NRL fields, ground-only runs omit ISL fields.
+RUN_FIELDS: Dict[str, type] = {
+    'isl_routing': str,
+    'isl_category': str,
+    'ground_routing': str,
+    'ground_category': str,
+    'ground_mobility': str,
+    'ground_nodes': int,
+    'satellites': int,
+    'sim_time': float,
+    'seed': int,
+    'flows': int,
+    'tx_packets': int,
+    'rx_packets': int,
+    'pdr': float,
+    'avg_delay_ms': float,
+    'runtime_seconds': float,
+    'data_bytes_tx': int,
+    'control_bytes_tx': int,
+    'nrl': float,
+}
+
+# Column renames applied when handing runs to the analysis scripts
+ANALYSIS_COLUMNS = {
+    'avg_delay_ms': 'delay_ms',
+    'data_bytes_tx': 'data_bytes',
+    'control_bytes_tx': 'control_bytes',
+}
+
+# Metric columns produced by default (analysis names, protocol/seed always included)
+DEFAULT_COLUMNS = ['pdr', 'delay_ms', 'nrl', 'data_bytes', 'control_bytes', 'runtime_seconds']
+
+# PacketTracer sidecars written next to run CSVs; not run CSVs themselves
+TIMESERIES_SUFFIX = '.timeseries.csv'    # --nrl-bin-ms
+CONTROL_SUFFIX = '.control.csv'          # --control-breakdown
+SIDECAR_SUFFIXES = (TIMESERIES_SUFFIX, CONTROL_SUFFIX)
+
+# Per-message-type control bytes in run CSVs ("control_bytes_aodv_rreq", ...)
+CONTROL_TYPE_PREFIX = 'control_bytes_'
+
+# Directories smaller than this are parsed in-process (pool startup costs more)
+PARALLEL_THRESHOLD = 2000
+
+# Files handed to each pool task (amortizes pickling/dispatch overhead)
+CHUNK_SIZE = 512
+
+
+@dataclass
+class LoadReport:
+    """Outcome of a directory load: counts plus failures collected per file."""
+    files_found: int = 0
+    files_loaded: int = 0
+    failures: List[Tuple[str, str]] = field(default_factory=list)  # (file name, error)
+
+    def print_summary(self, max_examples: int = 5) -> None:
+        """Print one summary line for all failed files (plus a few examples)."""
+        if not self.failures:
+            return
+        print(f"Warning: Failed to load {len(self.failures)}/{self.files_found} files")
+        for name, error in self.failures[:max_examples]:
+            print(f"  - {name}: {error}")
+        if len(self.failures) > max_examples:
+            print(f"  ... and {len(self.failures) - max_examples} more")
+
+
+def parse_run_text(text: str) -> Dict[str, Any]:
+    """Tokenize `metric,value` text into a typed record (unknown metrics dropped).
+
+    Raises:
+        ValueError: Missing header or a value that does not match its metric type
+    """
+    lines = text.splitlines()
+    if not lines or not lines[0].startswith('metric,value'):
+        raise ValueError("missing 'metric,value' header")
+
+    record: Dict[str, Any] = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(',')
+        kind = RUN_FIELDS.get(name)
+        if kind is None or not sep:
+            continue
+        value = value.strip()
+        if kind is str:
+            record[name] = value
+        elif kind is int:
+            # Integers may be printed in fixed notation by some builds ("20.000000")
+            record[name] = int(value) if value.isdigit() else int(float(value))
+        else:
+            record[name] = float(value)
+    return record
+
+
+def parse_run_csv(csv_path: Path) -> Dict[str, Any]:
+    """Read and tokenize one run CSV."""
+    with open(csv_path, 'r') as f:
+        return parse_run_text(f.read())
+
+
+def parse_control_mix(text: str) -> Dict[str, int]:
+    """Control bytes per routing message type from run CSV text.
+
+    Types a run never sent are absent from its CSV (treat as 0).
+
+    Returns:
+        {message type: bytes}, e.g. {'aodv_rreq': 81234, 'aodv_hello': 40210}
+    """
+    mix: Dict[str, int] = {}
+    for line in text.splitlines()[1:]:
+        name, _, value = line.partition(',')
+        if name.startswith(CONTROL_TYPE_PREFIX) and name != 'control_bytes_tx':
+            mix[name[len(CONTROL_TYPE_PREFIX):]] = int(float(value))
+    return mix
+
+
+def run_protocol(record: Dict[str, Any]) -> str:
+    """Protocol label for a run: ground protocol if present, else ISL protocol."""
+    protocol = record.get('ground_routing') or record.get('isl_routing')
+    if not protocol:
+        raise ValueError("run has neither ground_routing nor isl_routing")
+    return str(protocol).upper()
+
+
+def _load_chunk(paths: Sequence[str], columns: Sequence[str]) -> Tuple[Dict[str, list], List[Tuple[str, str]]]:
+    """Parse a chunk of files into column lists (runs inside pool workers)."""
+    raw_names = {ANALYSIS_COLUMNS.get(name, name): name for name in RUN_FIELDS}
+    out: Dict[str, list] = {name: [] for name in ['protocol', 'seed', *columns]}
+    failures: List[Tuple[str, str]] = []
+
+    for path in paths:
+        try:
+            record = parse_run_csv(Path(path))
+            row = {'protocol': run_protocol(record), 'seed': record['seed']}
+            for name in columns:
+                row[name] = record.get(raw_names[name])
+        except Exception as e:
+            failures.append((os.path.basename(path), f"{type(e).__name__}: {e}"))
+            continue
+        for name, value in row.items():
+            out[name].append(value)
+
+    return out, failures
+
+
+def list_run_files(results_dir: Path, pattern: str = "*.csv") -> List[str]:
+    """List matching files with os.scandir (cheap for 10^5-entry directories)."""
+    with os.scandir(results_dir) as entries:
+        paths = [entry.path for entry in entries
+                 if fnmatch.fnmatch(entry.name, pattern) and entry.is_file()
+                 and not entry.name.startswith('.')  # Hidden / in-progress outputs
+                 and not entry.name.endswith(SIDECAR_SUFFIXES)]
+    paths.sort()
+    return paths
+
+
+def load_run_files(paths: Sequence[str],
+                   columns: Optional[Sequence[str]] = None,
+                   workers: Optional[int] = None,
+                   executor: str = 'process') -> Tuple[pd.DataFrame, LoadReport]:
+    """Load run CSVs into one columnar DataFrame.
+
+    Args:
+        paths: Run CSV paths
+        columns: Metric columns to keep (analysis names, see ANALYSIS_COLUMNS);
+                 default DEFAULT_COLUMNS. `protocol` and `seed` are always included.
+        workers: Pool size (default: os.cpu_count()); 1 forces in-process parsing
+        executor: 'process' or 'thread'
+
+    Returns:
+        (DataFrame with categorical `protocol`, LoadReport)
+    """
+    columns = list(DEFAULT_COLUMNS if columns is None else columns)
+    known = {ANALYSIS_COLUMNS.get(name, name) for name in RUN_FIELDS}
+    unknown = [name for name in columns if name not in known]
+    if unknown:
+        raise ValueError(f"Unknown run columns: {unknown}")
+
+    report = LoadReport(files_found=len(paths))
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(paths) < PARALLEL_THRESHOLD:
+        parts = [_load_chunk(paths, columns)]
+    else:
+        pool_cls = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+        chunks = [paths[i:i + CHUNK_SIZE] for i in range(0, len(paths), CHUNK_SIZE)]
+        with pool_cls(max_workers=workers) as pool:
+            parts = list(pool.map(_load_chunk, chunks, [columns] * len(chunks)))
+
+    merged: Dict[str, list] = {name: [] for name in ['protocol', 'seed', *columns]}
+    for out, failures in parts:
+        for name, values in out.items():
+            merged[name].extend(values)
+        report.failures.extend(failures)
+    report.files_loaded = len(merged['seed'])
+
+    df = pd.DataFrame(merged)
+    df['protocol'] = df['protocol'].astype('category')
+    return df, report
+
+
+def load_run_directory(results_dir: Path,
+                       pattern: str = "*.csv",
+                       columns: Optional[Sequence[str]] = None,
+                       workers: Optional[int] = None,
+                       executor: str = 'process') -> Tuple[pd.DataFrame, LoadReport]:
+    """Load every run CSV in a directory (see load_run_files for arguments)."""
+    return load_run_files(list_run_files(results_dir, pattern), columns, workers, executor)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Vectorized grouped summary statistics for simulation sweeps.
+
+One groupby pass computes n/mean/std/SEM/t-CI/CV/min/max for every metric
+and every group (protocol, or any combination of sweep axes such as
+protocol × ground_mobility × ground_nodes), returned as a tidy frame:
+
+    protocol  metric  n  mean  std  sem  ci_lower  ci_upper  cv  min  max
+
+Usage:
+    tidy = summarize(df)                                    # by protocol
+    tidy = summarize(df, by=['protocol', 'ground_nodes'])   # sweep cells
+    nrl = tidy[tidy['metric'] == 'nrl']
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# Metrics summarized by default (analysis column names, see fast_loader)
+DEFAULT_METRICS = ['pdr', 'delay_ms', 'nrl', 'data_bytes', 'control_bytes', 'runtime_seconds']
+
+# Column order of the tidy output (after the grouping keys)
+SUMMARY_COLUMNS = ['metric', 'n', 'mean', 'std', 'sem', 'ci_lower', 'ci_upper', 'cv', 'min', 'max']
+
+
+def add_t_interval(summary: pd.DataFrame, confidence: float = 0.95) -> pd.DataFrame:
+    """Add sem/ci_lower/ci_upper/cv columns from n/mean/std (vectorized over rows).
+
+    Groups with n < 2 get NaN SEM and CI bounds.
+    """
+    n = summary['n'].astype(float)
+    summary['sem'] = summary['std'] / np.sqrt(n)
+
+    dof = np.where(n > 1, n - 1, np.nan)
+    t_critical = stats.t.ppf((1 + confidence) / 2, dof)  # Two-tailed
+    margin = t_critical * summary['sem']
+    summary['ci_lower'] = summary['mean'] - margin
+    summary['ci_upper'] = summary['mean'] + margin
+
+    summary['cv'] = np.where(summary['mean'] > 0,
+                             summary['std'] / summary['mean'] * 100, 0.0)
+    return summary
+
+
+def summarize(df: pd.DataFrame,
+              by: Sequence[str] = ('protocol',),
+              metrics: Optional[Sequence[str]] = None,
+              confidence: float = 0.95) -> pd.DataFrame:
+    """Summary statistics for every (group, metric) cell in one vectorized pass.
+
+    Args:
+        df: One row per run
+        by: Grouping keys (any columns of df)
+        metrics: Numeric columns to summarize (default: DEFAULT_METRICS present in df)
+        confidence: Two-sided t-interval confidence level
+
+    Returns:
+        Tidy frame: grouping keys + SUMMARY_COLUMNS, one row per (group, metric),
+        sorted by keys then metric order
+    """
+    by = list(by)
+    if metrics is None:
+        metrics = [m for m in DEFAULT_METRICS if m in df.columns]
+    metrics = list(metrics)
+
+    # Long format: one row per (run, metric), metric ordered as requested
+    long = df.melt(id_vars=by, value_vars=metrics, var_name='metric')
+    long['metric'] = pd.Categorical(long['metric'], categories=metrics, ordered=True)
+
+    tidy = (long.groupby(by + ['metric'], observed=True, sort=True)['value']
+                .agg(['count', 'mean', 'std', 'min', 'max'])
+                .rename(columns={'count': 'n'})
+                .reset_index())
+    tidy['n'] = tidy['n'].astype(int)
+    tidy['metric'] = tidy['metric'].astype(str)
+
+    add_t_interval(tidy, confidence)
+    return tidy[by + SUMMARY_COLUMNS]
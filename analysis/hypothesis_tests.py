@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Batched hypothesis tests for simulation sweeps.
+
+Compares groups (protocols by default) within every (cell, metric) of a sweep
+in one vectorized pass over groupby aggregates - no per-cell Python loops:
+
+- Omnibus: one-way ANOVA, Welch ANOVA, Kruskal-Wallis (tie-corrected)
+- Post-hoc (pairwise): Tukey HSD, Games-Howell
+- Benjamini-Hochberg FDR correction within each test family
+
+Result is one long table:
+
+    <cells>  metric  test  group_a  group_b  statistic  df1  df2  p_value  p_adj  significant
+
+Omnibus rows have empty group_a/group_b. Post-hoc p-values already control
+the family-wise error within a cell; p_adj additionally applies BH across
+all cells and metrics of the same test.
+
+Usage:
+    results = compare_groups(df, metrics=['nrl', 'pdr'])
+    results = compare_groups(sweep_df, cells=['ground_mobility', 'ground_nodes'])
+    anova = omnibus_row(results, 'nrl', 'anova')
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from grouped_stats import DEFAULT_METRICS
+
+# Test names as they appear in the `test` column
+OMNIBUS_TESTS = ['anova', 'welch_anova', 'kruskal']
+POSTHOC_TESTS = ['tukey_hsd', 'games_howell']
+
+RESULT_COLUMNS = ['metric', 'test', 'group_a', 'group_b', 'statistic',
+                  'df1', 'df2', 'p_value', 'p_adj', 'significant']
+
+
+def benjamini_hochberg(p_values: np.ndarray) -> np.ndarray:
+    """Benjamini-Hochberg adjusted p-values (NaNs are passed through)."""
+    p = np.asarray(p_values, dtype=float)
+    adjusted = np.full(p.shape, np.nan)
+    valid = ~np.isnan(p)
+    m = int(valid.sum())
+    if m == 0:
+        return adjusted
+
+    order = np.argsort(p[valid])
+    ranked = p[valid][order] * m / np.arange(1, m + 1)
+    ranked = np.minimum.accumulate(ranked[::-1])[::-1]  # Enforce monotonicity
+
+    out = np.empty(m)
+    out[order] = np.clip(ranked, 0.0, 1.0)
+    adjusted[valid] = out
+    return adjusted
+
+
+def _group_aggregates(long: pd.DataFrame, keys: list, group: str) -> pd.DataFrame:
+    """n/mean/var/rank-sum per (cell, metric, group)."""
+    agg = (long.groupby(keys + [group], observed=True, sort=True)
+               .agg(n=('value', 'count'), mean=('value', 'mean'),
+                    var=('value', 'var'), rank_sum=('rank', 'sum'))
+               .reset_index())
+    return agg[agg['n'] > 0]
+
+
+def _cell_sum(agg: pd.DataFrame, keys: list, values: pd.Series) -> pd.Series:
+    """Sum of per-group values over each (cell, metric), broadcast back to the groups."""
+    return values.groupby([agg[c] for c in keys], observed=True).transform('sum')
+
+
+def _omnibus(agg: pd.DataFrame, long: pd.DataFrame, keys: list) -> pd.DataFrame:
+    """ANOVA, Welch ANOVA and Kruskal-Wallis for every (cell, metric)."""
+    n = agg['n'].astype(float)
+    var = agg['var']
+    n_total = _cell_sum(agg, keys, n)
+    grand_mean = _cell_sum(agg, keys, n * agg['mean']) / n_total
+
+    # Welch weights w_i = n_i / s_i^2 and weighted grand mean
+    w = n / var
+    w_sum = _cell_sum(agg, keys, w)
+    w_grand = _cell_sum(agg, keys, w * agg['mean']) / w_sum
+
+    terms = agg[keys].copy()
+    terms['k'] = 1
+    terms['n'] = n
+    terms['ss_between'] = n * (agg['mean'] - grand_mean) ** 2
+    terms['ss_within'] = (n - 1) * var.fillna(0.0)
+    terms['welch_num'] = w * (agg['mean'] - w_grand) ** 2
+    terms['welch_lambda'] = (1 - w / w_sum) ** 2 / (n - 1)
+    terms['rank_term'] = agg['rank_sum'] ** 2 / n
+    sums = terms.groupby(keys, observed=True, sort=True).sum()
+
+    # Tie correction term sum(t^3 - t) over tied value blocks
+    tie_sizes = long.groupby(keys + ['value'], observed=True, sort=True).size().astype(float)
+    tie_sum = ((tie_sizes ** 3 - tie_sizes)
+               .groupby(level=list(range(len(keys))), observed=True).sum()
+               .reindex(sums.index).to_numpy())
+
+    k = sums['k'].to_numpy(dtype=float)
+    n_tot = sums['n'].to_numpy(dtype=float)
+    lam = sums['welch_lambda'].to_numpy()
+    valid = (k > 1) & (n_tot > k)
+    df_between = k - 1
+    df_within = n_tot - k
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        f_anova = (sums['ss_between'].to_numpy() / df_between) / (sums['ss_within'].to_numpy() / df_within)
+        f_welch = ((sums['welch_num'].to_numpy() / df_between)
+                   / (1 + 2 * (k - 2) / (k ** 2 - 1) * lam))
+        df_welch = (k ** 2 - 1) / (3 * lam)
+        h = ((12 / (n_tot * (n_tot + 1)) * sums['rank_term'].to_numpy() - 3 * (n_tot + 1))
+             / (1 - tie_sum / (n_tot ** 3 - n_tot)))
+
+    index = sums.index.to_frame(index=False)
+    frames = []
+    for test, statistic, df1, df2, p in [
+            ('anova', f_anova, df_between, df_within, stats.f.sf(f_anova, df_between, df_within)),
+            ('welch_anova', f_welch, df_between, df_welch, stats.f.sf(f_welch, df_between, df_welch)),
+            ('kruskal', h, df_between, np.full_like(k, np.nan), stats.chi2.sf(h, df_between))]:
+        rows = index.copy()
+        rows['test'] = test
+        rows['group_a'] = None
+        rows['group_b'] = None
+        rows['statistic'] = statistic
+        rows['df1'] = df1
+        rows['df2'] = df2
+        rows['p_value'] = np.where(valid, p, np.nan)
+        frames.append(rows)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _posthoc(agg: pd.DataFrame, keys: list, group: str) -> pd.DataFrame:
+    """Tukey HSD and Games-Howell for every pair of groups in every (cell, metric)."""
+    agg = agg.copy()
+    cell = agg.groupby(keys, observed=True, sort=True)
+    agg['k'] = cell['n'].transform('size')
+    agg['n_total'] = cell['n'].transform('sum')
+    agg['ms_within'] = (((agg['n'] - 1) * agg['var'].fillna(0.0))
+                        .groupby([agg[c] for c in keys], observed=True).transform('sum')
+                        / (agg['n_total'] - agg['k']))
+    agg['order'] = cell.cumcount()
+
+    pairs = agg.merge(agg[keys + [group, 'order', 'n', 'mean', 'var']], on=keys, suffixes=('_a', '_b'))
+    pairs = pairs[pairs['order_a'] < pairs['order_b']].reset_index(drop=True)
+    if pairs.empty:
+        return pd.DataFrame(columns=keys + ['test', 'group_a', 'group_b',
+                                            'statistic', 'df1', 'df2', 'p_value'])
+
+    diff = (pairs['mean_a'] - pairs['mean_b']).abs().to_numpy()
+    k = pairs['k'].to_numpy(dtype=float)
+    na = pairs['n_a'].to_numpy(dtype=float)
+    nb = pairs['n_b'].to_numpy(dtype=float)
+    va = pairs['var_a'].to_numpy(dtype=float)
+    vb = pairs['var_b'].to_numpy(dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Tukey-Kramer: pooled variance, df = N - k
+        df_tukey = pairs['n_total'].to_numpy(dtype=float) - k
+        q_tukey = diff / np.sqrt(pairs['ms_within'].to_numpy() / 2 * (1 / na + 1 / nb))
+
+        # Games-Howell: per-pair variances, Welch-Satterthwaite df
+        se2 = va / na + vb / nb
+        q_gh = diff / np.sqrt(se2 / 2)
+        df_gh = se2 ** 2 / ((va / na) ** 2 / (na - 1) + (vb / nb) ** 2 / (nb - 1))
+
+    def sf(q, df):
+        valid = np.isfinite(q) & np.isfinite(df) & (df > 0) & (k > 1)
+        p = np.full(q.shape, np.nan)
+        if valid.any():
+            p[valid] = stats.studentized_range.sf(q[valid], k[valid], df[valid])
+        return np.clip(p, 0.0, 1.0)
+
+    frames = []
+    for test, q, dof in [('tukey_hsd', q_tukey, df_tukey), ('games_howell', q_gh, df_gh)]:
+        rows = pairs[keys].copy()
+        rows['test'] = test
+        rows['group_a'] = pairs[f'{group}_a'].astype(str)
+        rows['group_b'] = pairs[f'{group}_b'].astype(str)
+        rows['statistic'] = q
+        rows['df1'] = k - 1
+        rows['df2'] = dof
+        rows['p_value'] = sf(q, dof)
+        frames.append(rows)
+    return pd.concat(frames, ignore_index=True)
+
+
+def compare_groups(df: pd.DataFrame,
+                   group: str = 'protocol',
+                   cells: Sequence[str] = (),
+                   metrics: Optional[Sequence[str]] = None,
+                   alpha: float = 0.05,
+                   posthoc: bool = True) -> pd.DataFrame:
+    """Run all omnibus and post-hoc tests for every (cell, metric).
+
+    Args:
+        df: One row per run
+        group: Column whose levels are compared (e.g. protocol)
+        cells: Sweep axes defining independent comparisons (e.g. ground_nodes)
+        metrics: Metric columns to test (default: DEFAULT_METRICS present in df)
+        alpha: Significance level applied to BH-adjusted p-values
+        posthoc: Also run Tukey HSD / Games-Howell pairwise tests
+
+    Returns:
+        Long result table: cells + RESULT_COLUMNS
+    """
+    cells = list(cells)
+    if metrics is None:
+        metrics = [m for m in DEFAULT_METRICS if m in df.columns]
+    metrics = list(metrics)
+    keys = cells + ['metric']
+
+    long = df.melt(id_vars=cells + [group], value_vars=metrics, var_name='metric').dropna(subset=['value'])
+    long['metric'] = pd.Categorical(long['metric'], categories=metrics, ordered=True)
+    long['rank'] = long.groupby(keys, observed=True)['value'].rank(method='average')
+
+    agg = _group_aggregates(long, keys, group)
+    parts = [_omnibus(agg, long, keys)]
+    if posthoc:
+        parts.append(_posthoc(agg, keys, group))
+    results = pd.concat(parts, ignore_index=True)
+
+    results['p_adj'] = np.nan
+    for test, rows in results.groupby('test', sort=False).groups.items():
+        results.loc[rows, 'p_adj'] = benjamini_hochberg(results.loc[rows, 'p_value'].to_numpy())
+    results['significant'] = results['p_adj'] < alpha
+
+    test_order = pd.Categorical(results['test'], categories=OMNIBUS_TESTS + POSTHOC_TESTS, ordered=True)
+    results = (results.assign(_test=test_order)
+                      .sort_values(keys + ['_test', 'group_a', 'group_b'], na_position='first')
+                      .drop(columns='_test')
+                      .reset_index(drop=True))
+    results['metric'] = results['metric'].astype(str)
+    return results[cells + RESULT_COLUMNS]
+
+
+def omnibus_row(results: pd.DataFrame, metric: str, test: str = 'anova') -> pd.Series:
+    """Single omnibus result (for experiments without sweep cells)."""
+    rows = results[(results['metric'] == metric) & (results['test'] == test)]
+    if len(rows) != 1:
+        raise ValueError(f"Expected one {test} row for {metric}, found {len(rows)}")
+    return rows.iloc[0]
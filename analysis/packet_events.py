@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped reader for binary packet-event traces.
+
+unified-simulation --packet-events=true writes `<output>.events.bin`: a
+16-byte header followed by fixed-width 24-byte records (see
+src/packet-event-writer.h). The records are exposed as a NumPy structured
+array backed by `np.memmap`, so a 10^8-event trace (2.4 GB) is analyzed
+with vectorized column operations and only the pages actually touched are
+read.
+
+    time_ns int64 | node uint32 | iface uint16 | dir uint8 | cls uint8 | size uint32 | flow uint32
+
+Usage:
+    events = read_events(Path("results/aodv_seed1.events.bin"))
+    tx = events[events['dir'] == DIR_TX]
+    print(control_bytes_by_class(tx))
+
+    python3 analysis/packet_events.py results/aodv_seed1.events.bin
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# File header written by PacketEventWriter::Open
+MAGIC = b'PKTEVNT1'
+HEADER_SIZE = 16
+FORMAT_VERSION = 1
+
+# One record (little-endian, no padding)
+EVENT_DTYPE = np.dtype([
+    ('time_ns', '<i8'),
+    ('node', '<u4'),
+    ('iface', '<u2'),
+    ('dir', 'u1'),
+    ('cls', 'u1'),
+    ('size', '<u4'),
+    ('flow', '<u4'),
+])
+
+DIR_TX = 0
+DIR_RX = 1
+
+# `cls` values: ControlMessageType order in src/packet-tracer.h, 255 = data
+CLASS_NAMES = [
+    'aodv_rreq', 'aodv_rrep', 'aodv_rerr', 'aodv_rrep_ack', 'aodv_hello',
+    'olsr_hello', 'olsr_tc', 'olsr_mid', 'olsr_hna',
+    'dsdv_periodic', 'dsdv_triggered', 'control_other',
+]
+CLASS_DATA = 255
+
+
+def read_events(path: Path) -> np.ndarray:
+    """Map an event trace as a read-only structured array (no copy).
+
+    Raises:
+        ValueError: Bad magic, version or record size
+    """
+    with open(path, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE or header[:8] != MAGIC:
+        raise ValueError(f"{path}: not a packet-event trace")
+    record_size = int.from_bytes(header[8:12], 'little')
+    version = int.from_bytes(header[12:16], 'little')
+    if version != FORMAT_VERSION or record_size != EVENT_DTYPE.itemsize:
+        raise ValueError(f"{path}: unsupported trace (version {version}, record size {record_size})")
+
+    n_records = (path.stat().st_size - HEADER_SIZE) // EVENT_DTYPE.itemsize
+    if n_records == 0:
+        return np.zeros(0, dtype=EVENT_DTYPE)
+    return np.memmap(path, dtype=EVENT_DTYPE, mode='r', offset=HEADER_SIZE, shape=(n_records,))
+
+
+def class_name(cls: int) -> str:
+    if cls == CLASS_DATA:
+        return 'data'
+    return CLASS_NAMES[cls] if cls < len(CLASS_NAMES) else f'class_{cls}'
+
+
+def control_bytes_by_class(events: np.ndarray) -> Dict[str, int]:
+    """Total bytes per event class (bincount over the cls column).
+
+    Events are classed per packet: an OLSR packet bundling several messages
+    counts entirely toward its first message's type. The per-node
+    `<output>.control.csv` splits such packets per message, so the two
+    breakdowns agree in total but not necessarily per type.
+    """
+    totals = np.bincount(events['cls'], weights=events['size'], minlength=256)
+    return {class_name(c): int(totals[c]) for c in np.flatnonzero(totals)}
+
+
+def bytes_by_node_class(events: np.ndarray) -> pd.DataFrame:
+    """Node × class byte matrix (one bincount over node * 256 + cls)."""
+    if len(events) == 0:
+        return pd.DataFrame()
+    nodes = events['node'].astype(np.int64)
+    key = nodes * 256 + events['cls']
+    totals = np.bincount(key, weights=events['size'], minlength=(int(nodes.max()) + 1) * 256)
+    matrix = totals.reshape(-1, 256)
+    used_nodes = np.flatnonzero(matrix.any(axis=1))
+    used_classes = np.flatnonzero(matrix.any(axis=0))
+    return pd.DataFrame(matrix[np.ix_(used_nodes, used_classes)].astype(np.int64),
+                        index=pd.Index(used_nodes, name='node'),
+                        columns=[class_name(c) for c in used_classes])
+
+
+def nrl_timeseries(events: np.ndarray, bin_s: float = 1.0) -> pd.DataFrame:
+    """Transmitted control/data bytes and NRL per time bin."""
+    tx = events[events['dir'] == DIR_TX]
+    bins = (tx['time_ns'] // int(bin_s * 1e9)).astype(np.int64)
+    n_bins = int(bins.max()) + 1 if len(bins) else 0
+    is_data = tx['cls'] == CLASS_DATA
+    data = np.bincount(bins[is_data], weights=tx['size'][is_data], minlength=n_bins)
+    control = np.bincount(bins[~is_data], weights=tx['size'][~is_data], minlength=n_bins)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        nrl = np.where(data > 0, control / data, np.nan)
+    return pd.DataFrame({'t_s': np.arange(n_bins) * bin_s,
+                         'control_bytes_tx': control.astype(np.int64),
+                         'data_bytes_tx': data.astype(np.int64),
+                         'nrl': nrl})
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point: summarize one event trace."""
+    parser = argparse.ArgumentParser(description="Summarize a binary packet-event trace")
+    parser.add_argument('trace', type=Path)
+    args = parser.parse_args(argv)
+
+    try:
+        events = read_events(args.trace)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        return 1
+
+    tx = events[events['dir'] == DIR_TX]
+    print(f"Events: {len(events)} ({len(tx)} TX, {len(events) - len(tx)} RX)")
+    if len(events):
+        print(f"Time span: {events['time_ns'].min() / 1e9:.3f}s - {events['time_ns'].max() / 1e9:.3f}s")
+
+    totals = control_bytes_by_class(tx)
+    data_bytes = totals.pop('data', 0)
+    control_bytes = sum(totals.values())
+    print(f"\nTX bytes by class (data: {data_bytes}, control: {control_bytes})")
+    for name, value in sorted(totals.items(), key=lambda item: -item[1]):
+        share = 100.0 * value / control_bytes if control_bytes else 0.0
+        print(f"  {name:<16} {value:>12} ({share:.1f}%)")
+    if data_bytes:
+        print(f"\nNRL: {control_bytes / data_bytes:.4f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
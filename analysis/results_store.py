@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Columnar results store - one typed row per unified-simulation run.
+
+Replaces the per-seed `metric,value` CSV trees with a Parquet dataset
+partitioned by experiment/protocol (hive layout):
+
+    results/store/experiment=nc9_ground_only/protocol=AODV/<run>.parquet
+
+Analysis scripts read the store with column projection, so only the
+metrics they actually use are decoded.
+
+Usage:
+    # One-shot import of the existing CSV trees
+    python3 analysis/results_store.py import results/nc9_overhead_invariance
+
+    # Append a single run (e.g. right after build/unified-simulation exits)
+    python3 analysis/results_store.py append nc9_ground_only results/.../aodv_seed1.csv
+
+    # Merge per-run fragments into one file per partition
+    python3 analysis/results_store.py compact
+"""
+
+import argparse
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from fast_loader import RUN_FIELDS, SIDECAR_SUFFIXES, parse_run_csv, run_protocol
+
+# Default store location (relative to repository root)
+STORE_DIR = Path("results/store")
+
+# Content-addressed run store written by scripts/run_sweep.py (experiment
+# outputs are symlinks into it, see scripts/experiment_spec.py)
+RUN_STORE_DIR = Path("results/runs")
+
+# Partition keys (hive-style directories)
+PARTITION_KEYS = ['experiment', 'protocol']
+
+_ARROW_TYPES = {str: pa.string(), int: pa.int64(), float: pa.float64()}
+
+# Row schema (partition columns are encoded in the directory layout)
+RUN_SCHEMA = pa.schema(
+    [pa.field(name, _ARROW_TYPES[kind]) for name, kind in RUN_FIELDS.items()]
+    + [pa.field('source', pa.string())]
+)
+
+
+def _records_to_table(records: List[Dict[str, Any]]) -> pa.Table:
+    columns = {name: [r.get(name) for r in records] for name in RUN_SCHEMA.names}
+    return pa.Table.from_pydict(columns, schema=RUN_SCHEMA)
+
+
+def _source_key(source: str) -> str:
+    return os.path.abspath(source)
+
+
+def _hidden_tmp(path: Path) -> Path:
+    """Temp name for `path` that dataset discovery skips (leading '.')."""
+    return path.with_name(f".{path.name}.tmp")
+
+
+def stored_sources(experiment: str, store_dir: Path = STORE_DIR) -> Set[str]:
+    """Source CSVs already stored for an experiment (normalized paths)."""
+    sources: Set[str] = set()
+    for fragment in (store_dir / f"experiment={experiment}").glob("protocol=*/*.parquet"):
+        column = pq.read_table(fragment, columns=['source']).column('source')
+        sources.update(_source_key(s) for s in column.to_pylist() if s is not None)
+    return sources
+
+
+def append_runs(records: Iterable[Dict[str, Any]], experiment: str,
+                store_dir: Path = STORE_DIR) -> int:
+    """Append runs to the store, one Parquet fragment per (experiment, protocol).
+
+    Runs whose `source` CSV is already stored for the experiment are skipped,
+    so re-importing a tree never duplicates rows.
+
+    Returns:
+        Number of rows written
+    """
+    known = stored_sources(experiment, store_dir)
+    by_protocol: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        source = record.get('source')
+        if source is not None:
+            key = _source_key(source)
+            if key in known:
+                continue
+            known.add(key)
+        by_protocol.setdefault(run_protocol(record), []).append(record)
+
+    written = 0
+    for protocol, rows in sorted(by_protocol.items()):
+        partition = store_dir / f"experiment={experiment}" / f"protocol={protocol}"
+        partition.mkdir(parents=True, exist_ok=True)
+
+        # Write to a hidden temp name first so readers never see a partial fragment
+        final_path = partition / f"part-{uuid.uuid4().hex}.parquet"
+        tmp_path = _hidden_tmp(final_path)
+        pq.write_table(_records_to_table(rows), tmp_path)
+        tmp_path.replace(final_path)
+        written += len(rows)
+
+    return written
+
+
+def append_run_csv(csv_path: Path, experiment: str, store_dir: Path = STORE_DIR) -> int:
+    """Append a single unified-simulation output CSV to the store.
+
+    Returns:
+        1 if the run was added, 0 if it was already stored
+    """
+    record = parse_run_csv(csv_path)
+    record['source'] = str(csv_path)
+    return append_runs([record], experiment, store_dir)
+
+
+def read_runs(store_dir: Path = STORE_DIR,
+              experiment: Optional[str] = None,
+              columns: Optional[List[str]] = None,
+              protocols: Optional[List[str]] = None) -> pd.DataFrame:
+    """Read runs from the store with column projection and partition pruning.
+
+    Args:
+        experiment: Restrict to one experiment partition (None = all)
+        columns: Metric columns to decode (None = all); partition keys always included
+        protocols: Restrict to these protocols (upper-case)
+
+    Returns:
+        DataFrame with `experiment`, `protocol` and the requested metric columns
+    """
+    dataset = ds.dataset(store_dir, format='parquet', partitioning='hive',
+                         schema=RUN_SCHEMA.append(pa.field('experiment', pa.string()))
+                                          .append(pa.field('protocol', pa.string())))
+
+    expr = None
+    if experiment is not None:
+        expr = ds.field('experiment') == experiment
+    if protocols is not None:
+        protocol_expr = ds.field('protocol').isin([p.upper() for p in protocols])
+        expr = protocol_expr if expr is None else expr & protocol_expr
+
+    projection = None
+    if columns is not None:
+        projection = PARTITION_KEYS + [c for c in columns if c not in PARTITION_KEYS]
+
+    df = dataset.to_table(columns=projection, filter=expr).to_pandas()
+    df['protocol'] = df['protocol'].astype('category')
+    return df
+
+
+def store_has_experiment(experiment: str, store_dir: Path = STORE_DIR) -> bool:
+    """Check whether the store contains a partition for this experiment."""
+    return (store_dir / f"experiment={experiment}").is_dir()
+
+
+def compact(store_dir: Path = STORE_DIR) -> int:
+    """Merge per-run fragments into a single file per partition.
+
+    The merged file is written into a hidden sibling directory that replaces
+    the partition by rename, so readers see either the old fragments or the
+    merged file, never both. Fragments appended while merging are carried over.
+
+    Returns:
+        Number of partitions rewritten
+    """
+    rewritten = 0
+    for partition in sorted(store_dir.glob("experiment=*/protocol=*")):
+        fragments = sorted(partition.glob("*.parquet"))
+        if len(fragments) <= 1:
+            continue
+
+        table = pa.concat_tables([pq.read_table(f, schema=RUN_SCHEMA) for f in fragments])
+        token = uuid.uuid4().hex
+        staging = partition.with_name(f".{partition.name}.compact-{token}")
+        staging.mkdir()
+        pq.write_table(table, staging / f"part-{token}.parquet")
+
+        retired = partition.with_name(f".{partition.name}.old-{token}")
+        partition.rename(retired)
+        staging.rename(partition)
+
+        merged = {f.name for f in fragments}
+        for fragment in retired.glob("*.parquet"):
+            if fragment.name not in merged:
+                fragment.replace(partition / fragment.name)
+        shutil.rmtree(retired)
+        rewritten += 1
+
+    return rewritten
+
+
+def _in_run_store(path: Path) -> bool:
+    """Whether a (symlinked) run CSV resolves into the content-addressed run store."""
+    try:
+        path.resolve().relative_to(RUN_STORE_DIR.resolve())
+        return True
+    except ValueError:
+        return False
+
+
+def import_csv_tree(tree: Path, store_dir: Path = STORE_DIR,
+                    prefix: Optional[str] = None
+                    ) -> Tuple[Dict[str, int], List[Tuple[str, str]]]:
+    """One-shot import of a CSV results tree into the store.
+
+    Each subdirectory containing CSVs becomes one experiment, named
+    `<prefix>_<subdir>` (prefix defaults to the first token of the tree name),
+    e.g. results/nc9_overhead_invariance/ground_only -> nc9_ground_only.
+
+    Hand-made symlinks between experiment trees (e.g. NC10 ground baseline ->
+    NC9 outputs) are skipped so the same run is never stored twice; symlinks
+    into the content-addressed run store are the experiment's own outputs
+    and are imported. Hidden files are skipped as well.
+
+    Returns:
+        (rows imported per experiment - runs already stored are skipped,
+         (file, error) for every CSV that could not be imported)
+    """
+    prefix = prefix or tree.name.split('_')[0]
+    imported: Dict[str, int] = {}
+    failures: List[Tuple[str, str]] = []
+
+    csv_dirs = sorted({p.parent for p in tree.rglob("*.csv")})
+    for csv_dir in csv_dirs:
+        relative = csv_dir.relative_to(tree)
+        suffix = '_'.join(relative.parts) if relative.parts else tree.name
+        experiment = f"{prefix}_{suffix}" if relative.parts else suffix
+
+        records = []
+        for csv_path in sorted(csv_dir.glob("*.csv")):
+            if csv_path.name.startswith('.') or csv_path.name.endswith(SIDECAR_SUFFIXES):
+                continue
+            if csv_path.is_symlink() and not _in_run_store(csv_path):
+                continue
+            try:
+                record = parse_run_csv(csv_path)
+                run_protocol(record)
+            except Exception as e:
+                failures.append((str(csv_path), f"{type(e).__name__}: {e}"))
+                continue
+            record['source'] = str(csv_path)
+            records.append(record)
+
+        if records:
+            imported[experiment] = append_runs(records, experiment, store_dir)
+
+    return imported, failures
+
+
+def print_failures(failures: List[Tuple[str, str]], max_examples: int = 5) -> None:
+    """Print one summary line for all files that failed to import."""
+    if not failures:
+        return
+    print(f"Warning: Failed to import {len(failures)} files")
+    for name, error in failures[:max_examples]:
+        print(f"  - {name}: {error}")
+    if len(failures) > max_examples:
+        print(f"  ... and {len(failures) - max_examples} more")
+
+
+def main():
+    """Command-line entry point (import / append / compact)."""
+    parser = argparse.ArgumentParser(description="DyMeN-Sim columnar results store")
+    parser.add_argument('--store', type=Path, default=STORE_DIR,
+                        help=f"Store directory (default: {STORE_DIR})")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_import = sub.add_parser('import', help="Import existing metric,value CSV trees")
+    p_import.add_argument('trees', type=Path, nargs='+')
+    p_import.add_argument('--prefix', help="Experiment name prefix (default: tree name token)")
+
+    p_append = sub.add_parser('append', help="Append single-run CSVs to one experiment")
+    p_append.add_argument('experiment')
+    p_append.add_argument('csv_files', type=Path, nargs='+')
+
+    sub.add_parser('compact', help="Merge per-run fragments within each partition")
+
+    args = parser.parse_args()
+
+    if args.command == 'import':
+        failures: List[Tuple[str, str]] = []
+        for tree in args.trees:
+            imported, tree_failures = import_csv_tree(tree, args.store, args.prefix)
+            for experiment, rows in imported.items():
+                print(f"  ✓ {experiment}: {rows} runs")
+            failures.extend(tree_failures)
+        print_failures(failures)
+        print(f"  ✓ Partitions compacted: {compact(args.store)}")
+    elif args.command == 'append':
+        appended = sum(append_run_csv(csv_path, args.experiment, args.store)
+                       for csv_path in args.csv_files)
+        print(f"  ✓ Appended {appended} runs to {args.experiment} "
+              f"({len(args.csv_files) - appended} already stored)")
+    elif args.command == 'compact':
+        print(f"  ✓ Partitions compacted: {compact(args.store)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Group-sequential stopping rule for seed sweeps.
+
+After each batch of seeds the sweep asks whether more runs are needed:
+
+- Efficacy: the NRL one-way ANOVA is tested at the incremental nominal level
+  of a Lan-DeMets O'Brien-Fleming alpha-spending function,
+      alpha(t) = 2 - 2 * Phi(z_{1-alpha/2} / sqrt(t)),  t = n / n_max,
+  so repeated looks keep the overall type I error at alpha. Each look spends
+  alpha(t_k) - alpha(t_{k-1}) (conservative; no joint-boundary recursion).
+- Futility: stop for "no difference" (the invariance verdict) once the
+  conditional power of the final look, under the current trend, drops below
+  a threshold (default 10%). The ANOVA p-value is mapped to a chi-square
+  statistic X = ||Z(t)||^2 with df = k - 1; extrapolating the observed drift,
+  the final statistic is noncentral chi-square with noncentrality
+  X / (t (1 - t)) after scaling by 1 / (1 - t). The bound is non-binding: it
+  never rejects, so the type I error stays at alpha.
+- Precision: once every protocol's 95% t-CI half-width is within the target,
+  the estimates (and hence the invariance verdict) are settled.
+- Budget: stop at n_max seeds per protocol.
+
+The statistics come from the same modules as analyze_nc9_invariance.py
+(fast_loader, grouped_stats, hypothesis_tests).
+
+Usage:
+    python3 analysis/sequential.py results/nc9_overhead_invariance/ground_only \\
+        --batch 3 --max-seeds 15 --ci-half-width 0.05 --futility-power 0.1
+
+Exit status: 0 = stop (verdict settled), 3 = continue (run another batch),
+1 = error.
+"""
+
+import argparse
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from scipy import stats
+
+from fast_loader import load_run_directory
+from grouped_stats import summarize
+from hypothesis_tests import compare_groups, omnibus_row
+
+# Exit codes understood by scripts/run_nc9_ground_overhead.sh
+EXIT_STOP = 0
+EXIT_ERROR = 1
+EXIT_CONTINUE = 3
+
+# Fewer seeds than this never stop the sweep (variance estimates too noisy)
+MIN_SEEDS = 3
+
+
+def obrien_fleming_spent(t: float, alpha: float = 0.05) -> float:
+    """Cumulative alpha spent at information fraction t (Lan-DeMets O'Brien-Fleming)."""
+    if t <= 0:
+        return 0.0
+    t = min(t, 1.0)
+    return float(2 - 2 * stats.norm.cdf(stats.norm.ppf(1 - alpha / 2) / np.sqrt(t)))
+
+
+def nominal_level(n: int, n_max: int, batch: int, alpha: float = 0.05) -> float:
+    """Alpha available at the look after n seeds (looks every `batch` seeds)."""
+    previous = max(0, ((n - 1) // batch) * batch)
+    return obrien_fleming_spent(n / n_max, alpha) - obrien_fleming_spent(previous / n_max, alpha)
+
+
+def conditional_power(p_value: float, df: int, t: float, final_alpha: float) -> float:
+    """Probability that the final look rejects, given the interim result and its trend.
+
+    Args:
+        p_value: Interim omnibus p-value
+        df: Numerator degrees of freedom (groups - 1)
+        t: Information fraction of the interim look
+        final_alpha: Nominal level of the final look
+    """
+    if t >= 1.0:
+        return float(p_value <= final_alpha)
+    statistic = stats.chi2.isf(p_value, df)
+    critical = stats.chi2.isf(final_alpha, df)
+    return float(stats.ncx2.sf(critical / (1 - t), df, statistic / (t * (1 - t))))
+
+
+@dataclass
+class Decision:
+    """Outcome of one interim look."""
+    stop: bool
+    reason: str
+    n: int                 # Seeds per protocol (minimum across protocols)
+    p_value: float
+    nominal_alpha: float
+    max_half_width: float
+    conditional_power: float = float('nan')
+
+    def summary(self) -> str:
+        action = "STOP" if self.stop else "CONTINUE"
+        return (f"{action} ({self.reason}): n={self.n}, p={self.p_value:.4f} "
+                f"(nominal α={self.nominal_alpha:.5f}), "
+                f"conditional power={self.conditional_power:.3f}, "
+                f"max CI half-width={self.max_half_width:.4f}")
+
+
+def decide(results_dir: Path,
+           metric: str = 'nrl',
+           n_max: int = 15,
+           batch: int = 3,
+           alpha: float = 0.05,
+           ci_half_width: float = 0.05,
+           pattern: str = "*.csv",
+           futility_power: float = 0.10) -> Decision:
+    """Evaluate the stopping rule on the runs currently in results_dir.
+
+    futility_power = 0 disables the futility bound.
+    """
+    df, report = load_run_directory(results_dir, pattern=pattern, columns=[metric])
+    report.print_summary()
+    if df.empty:
+        return Decision(False, "no runs yet", 0, float('nan'), 0.0, float('inf'))
+
+    # Balanced looks: only the first n seeds of every protocol count
+    n = int(df.groupby('protocol', observed=True).size().min())
+    df = df.sort_values('seed').groupby('protocol', observed=True).head(n)
+
+    summary = summarize(df, by=['protocol'], metrics=[metric])
+    max_half_width = float((summary['ci_upper'] - summary['ci_lower']).max() / 2)
+
+    if n < MIN_SEEDS or df['protocol'].nunique() < 2:
+        return Decision(False, f"fewer than {MIN_SEEDS} seeds", n, float('nan'), 0.0, max_half_width)
+
+    omnibus = omnibus_row(compare_groups(df, metrics=[metric], posthoc=False), metric, 'anova')
+    p_value = float(omnibus['p_value'])
+    level = nominal_level(n, n_max, batch, alpha)
+    power = conditional_power(p_value, int(omnibus['df1']), n / n_max,
+                              nominal_level(n_max, n_max, batch, alpha))
+
+    def decision(stop: bool, reason: str) -> Decision:
+        return Decision(stop, reason, n, p_value, level, max_half_width, power)
+
+    if p_value <= level:
+        return decision(True, "protocols differ")
+    if n < n_max and power < futility_power:
+        return decision(True, "futility: no difference expected")
+    if max_half_width <= ci_half_width:
+        return decision(True, "precision target reached")
+    if n >= n_max:
+        return decision(True, "seed budget exhausted")
+    return decision(False, "verdict not settled")
+
+
+def main():
+    """Command-line entry point (exit status encodes the decision)."""
+    parser = argparse.ArgumentParser(description="Group-sequential stopping rule for seed sweeps")
+    parser.add_argument('results_dir', type=Path)
+    parser.add_argument('--metric', default='nrl')
+    parser.add_argument('--max-seeds', type=int, default=15, help="Seeds per protocol at full information")
+    parser.add_argument('--batch', type=int, default=3, help="Seeds per protocol between looks")
+    parser.add_argument('--alpha', type=float, default=0.05)
+    parser.add_argument('--ci-half-width', type=float, default=0.05,
+                        help="Stop once every protocol's 95%% CI half-width is within this")
+    parser.add_argument('--futility-power', type=float, default=0.10,
+                        help="Stop for no difference once conditional power falls below this (0 = off)")
+    parser.add_argument('--pattern', default="*.csv")
+    args = parser.parse_args()
+
+    if not args.results_dir.exists():
+        print(f"ERROR: {args.results_dir} not found")
+        sys.exit(EXIT_ERROR)
+
+    decision = decide(args.results_dir, args.metric, args.max_seeds, args.batch,
+                      args.alpha, args.ci_half_width, args.pattern, args.futility_power)
+    print(decision.summary())
+    sys.exit(EXIT_STOP if decision.stop else EXIT_CONTINUE)
+
+
+if __name__ == '__main__':
+    main()
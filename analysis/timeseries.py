@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+NRL(t) from PacketTracer time bins.
+
+unified-simulation --nrl-bin-ms=<width> writes `<output>.timeseries.csv`
+next to each run CSV, one row per bin:
+
+    t_s, control_bytes_tx, data_bytes_tx, control_bytes_rx, data_bytes_rx,
+    control_packets_tx, data_packets_tx, control_packets_rx, data_packets_rx
+
+This module loads those files (all integer columns, parsed by the pyarrow
+CSV engine), stacks runs into one long frame and computes NRL(t) with a
+rolling window, so convergence bursts and mobility-induced control storms
+can be plotted per protocol without packet captures.
+
+Usage:
+    python3 analysis/timeseries.py results/nc9_overhead_invariance/ground_only \\
+        --window 10 --output results/nc9_overhead_invariance/nrl_timeseries.png
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from fast_loader import TIMESERIES_SUFFIX
+
+# Counter columns written by PacketTracer::FormatTimeSeries
+COUNTER_COLUMNS = [
+    'control_bytes_tx', 'data_bytes_tx', 'control_bytes_rx', 'data_bytes_rx',
+    'control_packets_tx', 'data_packets_tx', 'control_packets_rx', 'data_packets_rx',
+]
+
+# "<protocol>_seed<N>.timeseries.csv" (the run scripts' naming)
+_RUN_NAME = re.compile(r'(?P<protocol>[A-Za-z]+)_seed(?P<seed>\d+)')
+
+
+def load_timeseries(path: Path) -> pd.DataFrame:
+    """Load one time-series CSV (t_s float, counters uint64)."""
+    dtypes = {'t_s': 'float64', **{name: 'uint64' for name in COUNTER_COLUMNS}}
+    try:
+        return pd.read_csv(path, dtype=dtypes, engine='pyarrow')
+    except ImportError:
+        return pd.read_csv(path, dtype=dtypes)
+
+
+def load_timeseries_directory(results_dir: Path, pattern: str = f"*{TIMESERIES_SUFFIX}") -> pd.DataFrame:
+    """Stack every time-series file below results_dir into one long frame.
+
+    Protocol and seed come from the file name (`aodv_seed3.timeseries.csv`);
+    other names keep the file stem as `run` with protocol/seed missing.
+
+    Returns:
+        Frame with run, protocol (categorical), seed, t_s and the counters
+    """
+    frames = []
+    for path in sorted(results_dir.glob(pattern)):
+        if path.name.startswith('.'):
+            continue  # In-progress sweep output
+        run = path.name[:-len(TIMESERIES_SUFFIX)]
+        df = load_timeseries(path)
+        match = _RUN_NAME.search(run)
+        df.insert(0, 'run', run)
+        df.insert(1, 'protocol', match['protocol'].upper() if match else None)
+        df.insert(2, 'seed', int(match['seed']) if match else -1)
+        frames.append(df)
+
+    if not frames:
+        return pd.DataFrame(columns=['run', 'protocol', 'seed', 't_s', *COUNTER_COLUMNS])
+    stacked = pd.concat(frames, ignore_index=True)
+    stacked['protocol'] = stacked['protocol'].astype('category')
+    return stacked
+
+
+def nrl_series(df: pd.DataFrame, window: int = 1, direction: str = 'tx') -> pd.DataFrame:
+    """Add NRL(t) = control bytes / data bytes over a rolling window of bins.
+
+    Summing bytes over the window before dividing keeps bins without data
+    traffic (before t=20s, between bursts) from producing inf/NaN spikes;
+    windows with no data bytes at all get NaN.
+
+    Args:
+        df: One run (load_timeseries) or many (load_timeseries_directory)
+        window: Bins per rolling window (1 = per-bin NRL)
+        direction: 'tx' or 'rx' counters
+
+    Returns:
+        Copy of df with an `nrl` column
+    """
+    control, data = f'control_bytes_{direction}', f'data_bytes_{direction}'
+    out = df.copy()
+    keys = ['run'] if 'run' in out.columns else None
+
+    def rolling_sum(column: str) -> pd.Series:
+        values = out[column].astype(float)
+        if keys is None:
+            return values.rolling(window, min_periods=1).sum()
+        return (values.groupby(out['run'], sort=False)
+                .rolling(window, min_periods=1).sum()
+                .reset_index(level=0, drop=True))
+
+    control_sum = rolling_sum(control)
+    data_sum = rolling_sum(data)
+    out['nrl'] = np.where(data_sum > 0, control_sum / data_sum.where(data_sum > 0), np.nan)
+    return out
+
+
+def mean_nrl_by_protocol(df: pd.DataFrame) -> pd.DataFrame:
+    """Across-seed mean and 2.5/97.5 percentiles of NRL(t) per protocol and bin."""
+    grouped = df.groupby(['protocol', 't_s'], observed=True)['nrl']
+    summary = grouped.agg(mean='mean',
+                          lower=lambda s: s.quantile(0.025),
+                          upper=lambda s: s.quantile(0.975))
+    return summary.reset_index()
+
+
+def plot_nrl(df: pd.DataFrame, output: Path, title: Optional[str] = None) -> None:
+    """Plot mean NRL(t) per protocol (band: 2.5-97.5 percentile across seeds)."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    summary = mean_nrl_by_protocol(df)
+    fig, ax = plt.subplots(figsize=(10, 5))
+    for protocol, group in summary.groupby('protocol', observed=True):
+        ax.plot(group['t_s'], group['mean'], label=protocol, linewidth=1.5)
+        ax.fill_between(group['t_s'], group['lower'], group['upper'], alpha=0.2)
+
+    ax.axvline(20.0, color='gray', linestyle='--', linewidth=1, label='Traffic start')
+    ax.set_xlabel('Simulation time (s)', fontsize=12)
+    ax.set_ylabel('NRL (control / data bytes)', fontsize=12)
+    ax.set_title(title or 'NRL over Time', fontsize=13, fontweight='bold')
+    ax.legend(fontsize=11)
+    ax.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    output.parent.mkdir(parents=True, exist_ok=True)
+    plt.savefig(output, dpi=300, bbox_inches='tight')
+    plt.close()
+    print(f"  ✓ Saved: {output}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point: plot NRL(t) for a results directory."""
+    parser = argparse.ArgumentParser(description="Plot NRL(t) from PacketTracer time bins")
+    parser.add_argument('results_dir', type=Path)
+    parser.add_argument('--window', type=int, default=10, help="Bins per rolling window")
+    parser.add_argument('--direction', choices=['tx', 'rx'], default='tx')
+    parser.add_argument('--output', type=Path, help="Plot path (default: <results_dir>/nrl_timeseries.png)")
+    args = parser.parse_args(argv)
+
+    df = load_timeseries_directory(args.results_dir)
+    if df.empty:
+        print(f"ERROR: No *{TIMESERIES_SUFFIX} files in {args.results_dir} (run with --nrl-bin-ms)")
+        return 1
+
+    df = nrl_series(df, window=args.window, direction=args.direction)
+    print(f"  ✓ Loaded {df['run'].nunique()} runs, {len(df)} bins")
+    plot_nrl(df, args.output or args.results_dir / 'nrl_timeseries.png')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -11,6 +11,7 @@
 BUILD_PATH="./build/unified-simulation"
 OUTPUT_DIR="./results/nc9_overhead_invariance/ground_only"
 SIM_TIME=60
+JOBS=${JOBS:-$(getconf _NPROCESSORS_ONLN)}  # Concurrent simulations
 
 # Colors
 GREEN='\033[0;32m'
@@ -38,63 +39,22 @@ echo "========================================================"
 echo ""
 
 START_TIME=$(date +%s)
-COMPLETED=0
-SKIPPED=0
-FAILED=0
 
-# Function to run a single simulation
-run_sim() {
-    local protocol=$1
-    local seed=$2
-    local output_file="$OUTPUT_DIR/${protocol}_seed${seed}.csv"
-
-    # Skip if exists
-    if [ -f "$output_file" ]; then
-        echo -e "[${YELLOW}SKIP${NC}] $protocol seed $seed (already exists)"
-        SKIPPED=$((SKIPPED + 1))
-        return
-    fi
-
-    # Run simulation
-    local start=$(date +%s)
-    printf "[RUN ] $protocol seed $seed ... "
-
-    if $BUILD_PATH \
-        --ground-only=true \
-        --ground-routing=$protocol \
-        --ground-nodes=20 \
-        --ground-mobility=manhattan \
-        --manhattan-blocks=5 \
-        --manhattan-block-size=100 \
-        --ground-speed=1.4 \
-        --ground-pause=2.0 \
-        --time=$SIM_TIME \
-        --seed=$seed \
-        --output=$output_file \
-        > /dev/null 2>&1; then
-
-        local end=$(date +%s)
-        local duration=$((end - start))
-        echo -e "${GREEN}PASS${NC} (${duration}s)"
-        COMPLETED=$((COMPLETED + 1))
-    else
-        echo -e "${RED}FAIL${NC}"
-        FAILED=$((FAILED + 1))
-    fi
-}
-
-# Run AODV seeds 2-15
-echo "Running AODV seeds 2-15..."
-for seed in {2..15}; do
-    run_sim "aodv" $seed
-done
-
-echo ""
-echo "Running OLSR seeds 2-15..."
-# Run OLSR seeds 2-15
-for seed in {2..15}; do
-    run_sim "olsr" $seed
-done
+# Run AODV/OLSR seeds 2-15 on the parallel sweep runner (skips existing outputs)
+COUNTS_FILE=$(mktemp)
+python3 scripts/run_sweep.py \
+    --preset nc9-ground \
+    --binary "$BUILD_PATH" \
+    --output-dir "$OUTPUT_DIR" \
+    --protocols aodv olsr \
+    --seeds 2-15 \
+    --param time=$SIM_TIME \
+    --jobs "$JOBS" \
+    --counts-file "$COUNTS_FILE"
+COMPLETED=$(grep '^COMPLETED=' "$COUNTS_FILE" | cut -d= -f2)
+SKIPPED=$(grep '^SKIPPED=' "$COUNTS_FILE" | cut -d= -f2)
+FAILED=$(grep '^FAILED=' "$COUNTS_FILE" | cut -d= -f2)
+rm -f "$COUNTS_FILE"
 
 # Summary
 TOTAL_TIME=$(($(date +%s) - START_TIME))
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Declarative experiment specs and content-addressed run identity.
+
+An experiment is a TOML file in experiments/ listing the unified-simulation
+flags, the protocols/seeds and any extra sweep axes:
+
+    [experiment]
+    name = "nc9_ground_only"
+    output_dir = "results/nc9_overhead_invariance/ground_only"
+    output_pattern = "{protocol}_seed{seed}.csv"
+    protocol_flag = "ground-routing"
+    protocols = ["aodv", "olsr", "dsdv"]
+    seeds = "1-15"
+
+    [params]
+    ground-only = true
+    time = 60
+
+    [sweep]
+    ground-nodes = [10, 20, 40]
+
+Every run is identified by a SHA-256 over (simulator binary hash, full
+argument set, seed). Arguments are normalized first: unset flags take the
+simulator defaults and numbers/booleans are rendered canonically, so
+`time=60`, `time=60.0` and an omitted --time hash alike. Results live once in a content-addressed store
+(results/runs/<id[:2]>/<id>.csv) and experiment outputs are relative
+symlinks into it, so experiments sharing a configuration (e.g. NC10's ground
+baseline and NC9 ground-only) reuse one stored result instead of
+re-simulating it.
+"""
+
+import hashlib
+import json
+import math
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import tomllib  # Python 3.11+
+except ModuleNotFoundError:  # pragma: no cover - older interpreters
+    import tomli as tomllib
+
+# Spec files (relative to repository root)
+SPEC_DIR = Path("experiments")
+
+# Content-addressed run store
+RUN_STORE = Path("results/runs")
+
+# Files the simulator writes next to <output>.csv, moved and linked together with it
+SIDECAR_SUFFIXES: Tuple[str, ...] = ('.timeseries.csv', '.control.csv', '.events.bin')
+
+# Flags that never change simulation results (excluded from the run identity)
+NON_IDENTITY_FLAGS = {'output', 'seed'}
+
+# unified-simulation defaults (SimConfig), filled in before hashing a run
+SIM_DEFAULTS: Dict[str, Any] = {
+    'isl-routing': 'static',
+    'ground-routing': 'aodv',
+    'satellites': 24,
+    'walker-planes': 3,
+    'walker-phasing': 0,
+    'walker-type': 'delta',
+    'inclination': 53.0,
+    'altitude': 550.0,
+    'ground-nodes': 20,
+    'ground-area': 10000.0,
+    'ground-speed': 1.4,
+    'ground-mobility': 'waypoint',
+    'ground-pause': 2.0,
+    'ground-bounds': 500.0,
+    'manhattan-blocks': 5,
+    'manhattan-block-size': 100.0,
+    'ground-rate': '1Mbps',
+    'ground-flows': 5,
+    'control-breakdown': False,
+    'packet-events': False,
+    'flow-stats': 'flowmon',
+    'topology-epoch': 0.0,
+    'polar-cutoff': 70.0,
+    'ephemeris-dir': '',
+    'ephemeris-step': 10.0,
+    'j2': False,
+    'nrl-bin-ms': 0.0,
+    'time': 60.0,
+    'seeds': '',
+    'satellite-only': False,
+    'ground-only': False,
+    'fork-server': False,
+    'fork-jobs': 1,
+    'fork-traffic': '',
+}
+
+# Spellings ns-3's BooleanValue accepts
+_TRUE = {'true', 't', '1'}
+_FALSE = {'false', 'f', '0'}
+
+_binary_hashes: Dict[Tuple[str, int, int], str] = {}
+
+
+def format_value(value: Any) -> str:
+    """Render a TOML value the way it is passed on the command line."""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def load_spec(path: Path) -> Dict[str, Any]:
+    """Load and normalize an experiment spec.
+
+    Returns:
+        Dict with name, output_dir (Path), output_pattern, protocol_flag,
+        protocols, seeds (str), params {flag: str}, sweep {flag: [str]}
+    """
+    with open(path, 'rb') as f:
+        raw = tomllib.load(f)
+
+    experiment = raw.get('experiment', {})
+    missing = [key for key in ('name', 'output_dir', 'protocol_flag', 'protocols')
+               if key not in experiment]
+    if missing:
+        raise ValueError(f"{path}: [experiment] is missing {', '.join(missing)}")
+
+    seeds = experiment.get('seeds', "1-15")
+    if isinstance(seeds, list):
+        seeds = ','.join(str(s) for s in seeds)
+
+    return {
+        'name': experiment['name'],
+        'output_dir': Path(experiment['output_dir']),
+        'output_pattern': experiment.get('output_pattern', "{protocol}_seed{seed}.csv"),
+        'protocol_flag': experiment['protocol_flag'],
+        'protocols': [str(p) for p in experiment['protocols']],
+        'seeds': str(seeds),
+        'params': {k: format_value(v) for k, v in raw.get('params', {}).items()},
+        'sweep': {k: [format_value(v) for v in values] for k, values in raw.get('sweep', {}).items()},
+    }
+
+
+def spec_path(name_or_path: str) -> Path:
+    """Resolve a preset name (experiments/<name>.toml) or an explicit path."""
+    path = Path(name_or_path)
+    if path.suffix == '.toml' or path.exists():
+        return path
+    return SPEC_DIR / f"{name_or_path}.toml"
+
+
+def list_presets() -> List[str]:
+    return sorted(p.stem for p in SPEC_DIR.glob("*.toml")) if SPEC_DIR.is_dir() else []
+
+
+def binary_hash(binary: Path) -> str:
+    """SHA-256 of the simulator binary (memoized on path/mtime/size)."""
+    st = os.stat(binary)
+    key = (str(Path(binary).resolve()), st.st_mtime_ns, st.st_size)
+    if key not in _binary_hashes:
+        digest = hashlib.sha256()
+        with open(binary, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        _binary_hashes[key] = digest.hexdigest()
+    return _binary_hashes[key]
+
+
+def canonical_value(flag: str, value: Any) -> str:
+    """Render a flag value canonically (typed by its simulator default)."""
+    default = SIM_DEFAULTS.get(flag)
+    text = format_value(value).strip()
+    if isinstance(default, bool) or isinstance(value, bool):
+        if text.lower() in _TRUE:
+            return 'true'
+        if text.lower() in _FALSE:
+            return 'false'
+        return text
+    try:
+        number = float(text)
+    except ValueError:
+        return text
+    if not math.isfinite(number):
+        return text
+    return str(int(number)) if number.is_integer() else repr(number)
+
+
+def canonical_args(args: Dict[str, str]) -> Dict[str, str]:
+    """Identity-relevant arguments with simulator defaults filled in, canonically rendered."""
+    merged = {**SIM_DEFAULTS, **{k.lstrip('-'): v for k, v in args.items()}}
+    return {k: canonical_value(k, v) for k, v in sorted(merged.items())
+            if k not in NON_IDENTITY_FLAGS}
+
+
+def run_id(binary_digest: str, args: Dict[str, str], seed: int) -> str:
+    """Canonical run identity: hash of binary, normalized arguments and seed."""
+    canonical = json.dumps({
+        'binary': binary_digest,
+        'args': canonical_args(args),
+        'seed': int(seed),
+    }, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def store_path(identity: str, store: Path = RUN_STORE) -> Path:
+    return store / identity[:2] / f"{identity}.csv"
+
+
+def sidecar_path(output: Path, suffix: str) -> Path:
+    """Sidecar of a run CSV: <stem>.csv -> <stem><suffix>."""
+    stem = output.name[:-4] if output.name.endswith('.csv') else output.name
+    return output.with_name(stem + suffix)
+
+
+def move_run(src: Path, dest: Path) -> None:
+    """Rename a finished run CSV and its sidecars into place."""
+    for suffix in SIDECAR_SUFFIXES:
+        sidecar = sidecar_path(src, suffix)
+        if sidecar.exists():
+            sidecar.replace(sidecar_path(dest, suffix))
+    src.replace(dest)
+
+
+def remove_run(output: Path) -> None:
+    """Delete a (partial) run CSV and its sidecars."""
+    for path in [output] + [sidecar_path(output, suffix) for suffix in SIDECAR_SUFFIXES]:
+        path.unlink(missing_ok=True)
+
+
+def _symlink(target: Path, link: Path) -> None:
+    tmp = link.with_name(f".{link.name}.link-{os.getpid()}")
+    tmp.unlink(missing_ok=True)
+    tmp.symlink_to(os.path.relpath(target, link.parent))
+    tmp.replace(link)
+
+
+def link_output(stored: Path, output: Path) -> None:
+    """Atomically point an experiment output (and its sidecars) at a stored run.
+
+    Sidecars are linked before the CSV, so an output that exists is complete.
+    """
+    output.parent.mkdir(parents=True, exist_ok=True)
+    for suffix in SIDECAR_SUFFIXES:
+        sidecar = sidecar_path(stored, suffix)
+        if sidecar.exists():
+            _symlink(sidecar, sidecar_path(output, suffix))
+    _symlink(stored, output)
+
+
+def write_manifest(identity: str, binary_digest: str, args: Dict[str, str], seed: int,
+                   store: Path = RUN_STORE) -> None:
+    """Record the exact configuration next to a stored run."""
+    manifest = store_path(identity, store).with_suffix('.json')
+    manifest.write_text(json.dumps({
+        'run_id': identity,
+        'binary_sha256': binary_digest,
+        'seed': int(seed),
+        'args': {k: v for k, v in sorted(args.items()) if k not in NON_IDENTITY_FLAGS},
+    }, indent=2) + "\n")
+
+
+def find_stored(identity: str, store: Path = RUN_STORE) -> Optional[Path]:
+    path = store_path(identity, store)
+    return path if path.exists() else None
@@ -23,6 +23,7 @@ PROTOCOLS=("aodv" "olsr" "dsdv")
 SEEDS=(1 2 3 4 5 6 7 8 9 10 11 12 13 14 15)
 GROUND_NODES=20
 SIM_TIME=60  # seconds (consistent with NC9 dual-layer)
+JOBS=${JOBS:-$(getconf _NPROCESSORS_ONLN)}  # Concurrent simulations
 
 # Colors for output (Mac compatible)
 GREEN='\033[0;32m'
@@ -35,6 +36,7 @@ NC='\033[0m' # No Color
 # Progress tracking
 TOTAL_SIMS=$((${#PROTOCOLS[@]} * ${#SEEDS[@]}))
 COMPLETED=0
+SKIPPED=0
 FAILED=0
 START_TIME=$(date +%s)
 
@@ -61,32 +63,6 @@ print_header() {
     echo ""
 }
 
-calculate_eta() {
-    local completed=$1
-    if [ $completed -eq 0 ]; then
-        echo "calculating..."
-        return
-    fi
-
-    local current_time=$(date +%s)
-    local elapsed=$((current_time - START_TIME))
-    local avg_time_per_sim=$((elapsed / completed))
-    local remaining=$((TOTAL_SIMS - completed))
-    local eta_seconds=$((avg_time_per_sim * remaining))
-
-    # Show minutes with decimal
-    if [ $eta_seconds -lt 60 ]; then
-        echo "${eta_seconds}s"
-    else
-        local eta_minutes=$(echo "scale=1; $eta_seconds / 60" | bc 2>/dev/null || echo "$((eta_seconds / 60))")
-        if [[ $eta_minutes == .* ]]; then
-            echo "0${eta_minutes} min"
-        else
-            echo "${eta_minutes} min"
-        fi
-    fi
-}
-
 format_time() {
     local seconds=$1
     if [ $seconds -lt 60 ]; then
@@ -98,43 +74,31 @@ format_time() {
     fi
 }
 
-run_simulation() {
-    local protocol=$1
-    local seed=$2
-    local output_file="${OUTPUT_DIR}/ground_only_${protocol}_seed${seed}.csv"
-
-    # Skip if already exists (resume capability)
-    if [ -f "$output_file" ]; then
-        echo -e "${YELLOW}[SKIP]${NC} $protocol seed=$seed (already exists)"
-        return 0
-    fi
-
-    # Run simulation
-    local sim_start=$(date +%s)
-
-    if ! $BUILD_PATH \
-        --ground-only=true \
-        --ground-routing=$protocol \
-        --ground-nodes=$GROUND_NODES \
-        --ground-mobility=manhattan \
-        --manhattan-blocks=5 \
-        --manhattan-block-size=100 \
-        --ground-speed=1.4 \
-        --ground-pause=2.0 \
-        --time=$SIM_TIME \
-        --seed=$seed \
-        --output=$output_file \
-        > /dev/null 2>&1; then
-        echo -e "${RED}[FAIL]${NC} $protocol seed=$seed"
-        FAILED=$((FAILED + 1))
-        return 1
+run_batch() {
+    # Run the seed list on the parallel sweep runner (scripts/run_sweep.py)
+    local counts
+    counts=$(mktemp)
+    python3 scripts/run_sweep.py \
+        --preset nc10-ground \
+        --binary "$BUILD_PATH" \
+        --output-dir "$OUTPUT_DIR" \
+        --protocols "${PROTOCOLS[@]}" \
+        --seeds "$@" \
+        --param ground-nodes=$GROUND_NODES \
+        --param time=$SIM_TIME \
+        --jobs "$JOBS" \
+        --counts-file "$counts" || true  # Failures are reported via the counts file
+
+    if [ -f "$counts" ]; then
+        local batch_completed batch_skipped batch_failed
+        batch_completed=$(grep '^COMPLETED=' "$counts" | cut -d= -f2)
+        batch_skipped=$(grep '^SKIPPED=' "$counts" | cut -d= -f2)
+        batch_failed=$(grep '^FAILED=' "$counts" | cut -d= -f2)
+        COMPLETED=$((COMPLETED + ${batch_completed:-0}))
+        SKIPPED=$((SKIPPED + ${batch_skipped:-0}))
+        FAILED=$((FAILED + ${batch_failed:-0}))
     fi
-
-    local sim_end=$(date +%s)
-    local sim_duration=$((sim_end - sim_start))
-
-    echo -e "${GREEN}[PASS]${NC} $(format_time $sim_duration)"
-    return 0
+    rm -f "$counts"
 }
 
 print_summary() {
@@ -195,27 +159,7 @@ fi
 echo ""
 
 # Run all simulations
-for protocol in "${PROTOCOLS[@]}"; do
-    for seed in "${SEEDS[@]}"; do
-        COMPLETED=$((COMPLETED + 1))
-
-        # Progress line
-        eta=$(calculate_eta $COMPLETED)
-        printf "[%2d/%2d] %-10s seed=%-2d ... " $COMPLETED $TOTAL_SIMS "$protocol" $seed
-
-        # Run simulation
-        if run_simulation "$protocol" "$seed"; then
-            # Success - print ETA
-            if [ $COMPLETED -lt $TOTAL_SIMS ]; then
-                echo -n " ETA: $eta"
-            fi
-            echo ""
-        else
-            # Failure - continue to next simulation (don't exit)
-            echo -e "${RED}FAILED - continuing${NC}"
-        fi
-    done
-done
+run_batch "${SEEDS[@]}"
 
 # Print summary
 print_summary
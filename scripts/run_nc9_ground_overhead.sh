@@ -4,8 +4,11 @@
 # NC9 GROUND OVERHEAD MEASUREMENT
 # ==============================================================================
 # Purpose: Run ground-only simulations to measure β and γ coefficients
-# Runtime: ~40 minutes (45 simulations: 3 protocols × 15 seeds)
+# Runtime: ~40 minutes serial (45 simulations: 3 protocols × 15 seeds),
+#          divided by JOBS when run in parallel via scripts/run_sweep.py
 # Output: results/nc9_overhead_invariance/ground_only/{protocol}_seed{1..15}.csv
+# Adaptive: ADAPTIVE=true runs seeds in batches and stops once
+#           analysis/sequential.py reports the verdict is settled
 # ==============================================================================
 
 # Note: Don't use 'set -e' - we want to continue on individual sim failures
@@ -15,6 +18,11 @@ BUILD_PATH="./build/unified-simulation"
 OUTPUT_DIR="./results/nc9_overhead_invariance/ground_only"
 PROTOCOLS=("aodv" "olsr" "dsdv")
 TEST_MODE=${TEST_MODE:-false}  # Set TEST_MODE=true for quick validation
+ADAPTIVE=${ADAPTIVE:-false}    # Set ADAPTIVE=true to stop early once the verdict is settled
+BATCH_SIZE=${BATCH_SIZE:-3}    # Adaptive mode: seeds per protocol between interim looks
+CI_HALF_WIDTH=${CI_HALF_WIDTH:-0.05}  # Adaptive mode: NRL CI precision target
+FUTILITY_POWER=${FUTILITY_POWER:-0.1}  # Adaptive mode: stop for "no difference" below this conditional power
+JOBS=${JOBS:-$(getconf _NPROCESSORS_ONLN)}  # Concurrent simulations
 
 if [ "$TEST_MODE" = "true" ]; then
     SEEDS=(1)  # Single seed for testing
@@ -39,14 +47,6 @@ SKIPPED=0
 FAILED=0
 START_TIME=$(date +%s)
 
-# Per-protocol tracking
-declare -A PROTOCOL_COMPLETED
-declare -A PROTOCOL_TOTAL
-for protocol in "${PROTOCOLS[@]}"; do
-    PROTOCOL_COMPLETED[$protocol]=0
-    PROTOCOL_TOTAL[$protocol]=${#SEEDS[@]}
-done
-
 # ==============================================================================
 # Helper Functions
 # ==============================================================================
@@ -63,33 +63,6 @@ print_header() {
     echo ""
 }
 
-calculate_eta() {
-    local completed=$1
-    if [ $completed -eq 0 ]; then
-        echo "calculating..."
-        return
-    fi
-
-    local current_time=$(date +%s)
-    local elapsed=$((current_time - START_TIME))
-    local avg_time_per_sim=$((elapsed / completed))
-    local remaining=$((TOTAL_SIMS - completed - SKIPPED))
-    local eta_seconds=$((avg_time_per_sim * remaining))
-
-    # Show seconds if < 60, otherwise show minutes
-    if [ $eta_seconds -lt 60 ]; then
-        echo "${eta_seconds}s"
-    else
-        local eta_minutes=$(echo "scale=1; $eta_seconds / 60" | bc)
-        # Handle leading zero for bc output like ".4"
-        if [[ $eta_minutes == .* ]]; then
-            echo "0${eta_minutes} min"
-        else
-            echo "${eta_minutes} min"
-        fi
-    fi
-}
-
 format_time() {
     local seconds=$1
     if [ $seconds -lt 60 ]; then
@@ -101,58 +74,30 @@ format_time() {
     fi
 }
 
-print_protocol_progress() {
-    # Print progress for each protocol on same line
-    local progress_str=""
-    for protocol in "${PROTOCOLS[@]}"; do
-        local completed=${PROTOCOL_COMPLETED[$protocol]}
-        local total=${PROTOCOL_TOTAL[$protocol]}
-        progress_str="${progress_str}${protocol}=${completed}/${total} "
-    done
-    echo -ne "\r${BOLD}[Progress: ${progress_str}]${NC}"
-}
-
-run_simulation() {
-    local protocol=$1
-    local seed=$2
-    local output_file="${OUTPUT_DIR}/${protocol}_seed${seed}.csv"
-
-    # Skip if already exists (resume capability)
-    if [ -f "$output_file" ]; then
-        echo -e "${YELLOW}[SKIP]${NC} ${protocol} seed=${seed} (already exists)"
-        SKIPPED=$((SKIPPED + 1))
-        PROTOCOL_COMPLETED[$protocol]=$((${PROTOCOL_COMPLETED[$protocol]} + 1))
-        return 2  # Return 2 for SKIP (different from success/fail)
-    fi
-
-    # Run simulation
-    local sim_start=$(date +%s)
-
-    if ! $BUILD_PATH \
-        --ground-only=true \
-        --ground-routing=$protocol \
-        --ground-nodes=20 \
-        --ground-mobility=manhattan \
-        --manhattan-blocks=5 \
-        --manhattan-block-size=100 \
-        --ground-speed=1.4 \
-        --ground-pause=2.0 \
-        --time=$SIM_TIME \
-        --seed=$seed \
-        --output=$output_file \
-        > /dev/null 2>&1; then
-        echo -e "${RED}[FAIL]${NC} ${protocol} seed=${seed}"
-        FAILED=$((FAILED + 1))
-        return 1
+run_batch() {
+    # Run one set of seeds for all protocols on the parallel sweep runner
+    local counts
+    counts=$(mktemp)
+    python3 scripts/run_sweep.py \
+        --preset nc9-ground \
+        --binary "$BUILD_PATH" \
+        --output-dir "$OUTPUT_DIR" \
+        --protocols "${PROTOCOLS[@]}" \
+        --seeds "$@" \
+        --param time=$SIM_TIME \
+        --jobs "$JOBS" \
+        --counts-file "$counts" || true  # Failures are reported via the counts file
+
+    if [ -f "$counts" ]; then
+        local batch_completed batch_skipped batch_failed
+        batch_completed=$(grep '^COMPLETED=' "$counts" | cut -d= -f2)
+        batch_skipped=$(grep '^SKIPPED=' "$counts" | cut -d= -f2)
+        batch_failed=$(grep '^FAILED=' "$counts" | cut -d= -f2)
+        COMPLETED=$((COMPLETED + ${batch_completed:-0}))
+        SKIPPED=$((SKIPPED + ${batch_skipped:-0}))
+        FAILED=$((FAILED + ${batch_failed:-0}))
     fi
-
-    local sim_end=$(date +%s)
-    local sim_duration=$((sim_end - sim_start))
-
-    echo -e "${GREEN}[PASS]${NC} $(format_time $sim_duration)"
-    COMPLETED=$((COMPLETED + 1))  # Increment here instead of in main loop
-    PROTOCOL_COMPLETED[$protocol]=$((${PROTOCOL_COMPLETED[$protocol]} + 1))
-    return 0
+    rm -f "$counts"
 }
 
 print_summary() {
@@ -172,9 +117,8 @@ print_summary() {
     # Per-protocol summary
     echo "Per-protocol results:"
     for protocol in "${PROTOCOLS[@]}"; do
-        local completed=${PROTOCOL_COMPLETED[$protocol]}
-        local total=${PROTOCOL_TOTAL[$protocol]}
-        echo "  ${protocol}: ${completed}/${total} completed"
+        local completed=$(ls "${OUTPUT_DIR}/${protocol}"_seed*.csv 2>/dev/null | wc -l | tr -d ' ')
+        echo "  ${protocol}: ${completed}/${#SEEDS[@]} completed"
     done
     echo ""
 
@@ -210,29 +154,29 @@ mkdir -p "$OUTPUT_DIR"
 # Print header
 print_header
 
-# Run all simulations
-sim_count=0
-for protocol in "${PROTOCOLS[@]}"; do
-    for seed in "${SEEDS[@]}"; do
-        sim_count=$((sim_count + 1))
-
-        # Progress line
-        eta=$(calculate_eta $((COMPLETED + SKIPPED)))
-        printf "[%2d/%2d] %-6s seed=%-2d ... " $sim_count $TOTAL_SIMS "$protocol" $seed
-
-        # Run simulation
-        run_simulation "$protocol" "$seed"
-
-        # Show ETA and protocol progress (for all outcomes except final sim)
-        if [ $sim_count -lt $TOTAL_SIMS ]; then
-            echo -n " ETA: $eta  "
-            print_protocol_progress
+if [ "$ADAPTIVE" = "true" ]; then
+    # Adaptive mode: run seeds in batches across all protocols and ask the
+    # group-sequential stopping rule (analysis/sequential.py) after each batch
+    for ((start = 0; start < ${#SEEDS[@]}; start += BATCH_SIZE)); do
+        batch=("${SEEDS[@]:start:BATCH_SIZE}")
+        run_batch "${batch[@]}"
+
+        look=$(python3 analysis/sequential.py "$OUTPUT_DIR" --batch "$BATCH_SIZE" \
+            --max-seeds "${#SEEDS[@]}" --ci-half-width "$CI_HALF_WIDTH" \
+            --futility-power "$FUTILITY_POWER")
+        status=$?
+        echo -e "${BLUE}[LOOK]${NC} ${look}"
+        if [ $status -eq 0 ]; then
+            echo -e "${GREEN}✓ Sequential rule stopped the sweep after $((start + ${#batch[@]})) seeds per protocol${NC}"
+            break
+        elif [ $status -ne 3 ]; then
+            echo -e "${YELLOW}⚠ Stopping rule failed (exit $status), continuing with next batch${NC}"
         fi
-        echo ""
-
-        # Continue on failure (don't exit)
     done
-done
+else
+    # Run all simulations
+    run_batch "${SEEDS[@]}"
+fi
 
 # Print summary
 print_summary
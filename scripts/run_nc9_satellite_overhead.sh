@@ -23,6 +23,7 @@ else
 fi
 
 SIM_TIME=60  # seconds
+JOBS=${JOBS:-$(getconf _NPROCESSORS_ONLN)}  # Concurrent simulations
 
 # Colors for output (Mac compatible)
 GREEN='\033[0;32m'
@@ -54,33 +55,6 @@ print_header() {
     echo ""
 }
 
-calculate_eta() {
-    local completed=$1
-    if [ $completed -eq 0 ]; then
-        echo "calculating..."
-        return
-    fi
-
-    local current_time=$(date +%s)
-    local elapsed=$((current_time - START_TIME))
-    local avg_time_per_sim=$((elapsed / completed))
-    local remaining=$((TOTAL_SIMS - completed - SKIPPED))
-    local eta_seconds=$((avg_time_per_sim * remaining))
-
-    # Show seconds if < 60, otherwise show minutes
-    if [ $eta_seconds -lt 60 ]; then
-        echo "${eta_seconds}s"
-    else
-        local eta_minutes=$(echo "scale=1; $eta_seconds / 60" | bc)
-        # Handle leading zero for bc output like ".4"
-        if [[ $eta_minutes == .* ]]; then
-            echo "0${eta_minutes} min"
-        else
-            echo "${eta_minutes} min"
-        fi
-    fi
-}
-
 format_time() {
     local seconds=$1
     if [ $seconds -lt 60 ]; then
@@ -92,38 +66,30 @@ format_time() {
     fi
 }
 
-run_simulation() {
-    local seed=$1
-    local output_file="${OUTPUT_DIR}/${PROTOCOL}_seed${seed}.csv"
-
-    # Skip if already exists (resume capability)
-    if [ -f "$output_file" ]; then
-        echo -e "${YELLOW}[SKIP]${NC} seed=${seed} (already exists)"
-        SKIPPED=$((SKIPPED + 1))
-        return 0
-    fi
-
-    # Run simulation
-    local sim_start=$(date +%s)
-
-    if ! $BUILD_PATH \
-        --satellite-only=true \
-        --isl-routing=$PROTOCOL \
-        --satellites=24 \
-        --time=$SIM_TIME \
-        --seed=$seed \
-        --output=$output_file \
-        > /dev/null 2>&1; then
-        echo -e "${RED}[FAIL]${NC} seed=${seed}"
-        FAILED=$((FAILED + 1))
-        return 1
+run_batch() {
+    # Run the seed list on the parallel sweep runner (scripts/run_sweep.py)
+    local counts
+    counts=$(mktemp)
+    python3 scripts/run_sweep.py \
+        --preset nc9-satellite \
+        --binary "$BUILD_PATH" \
+        --output-dir "$OUTPUT_DIR" \
+        --protocols "$PROTOCOL" \
+        --seeds "$@" \
+        --param time=$SIM_TIME \
+        --jobs "$JOBS" \
+        --counts-file "$counts" || true  # Failures are reported via the counts file
+
+    if [ -f "$counts" ]; then
+        local batch_completed batch_skipped batch_failed
+        batch_completed=$(grep '^COMPLETED=' "$counts" | cut -d= -f2)
+        batch_skipped=$(grep '^SKIPPED=' "$counts" | cut -d= -f2)
+        batch_failed=$(grep '^FAILED=' "$counts" | cut -d= -f2)
+        COMPLETED=$((COMPLETED + ${batch_completed:-0}))
+        SKIPPED=$((SKIPPED + ${batch_skipped:-0}))
+        FAILED=$((FAILED + ${batch_failed:-0}))
     fi
-
-    local sim_end=$(date +%s)
-    local sim_duration=$((sim_end - sim_start))
-
-    echo -e "${GREEN}[PASS]${NC} $(format_time $sim_duration)"
-    return 0
+    rm -f "$counts"
 }
 
 print_summary() {
@@ -171,33 +137,7 @@ mkdir -p "$OUTPUT_DIR"
 print_header
 
 # Run all simulations
-for seed in "${SEEDS[@]}"; do
-    # Calculate current index for progress display
-    idx=$((seed))
-
-    # Progress line
-    eta=$(calculate_eta $COMPLETED)
-    printf "[%2d/%2d] seed=%-2d ... " $idx $TOTAL_SIMS $seed
-
-    # Run simulation
-    if run_simulation "$seed"; then
-        if [ $SKIPPED -eq 0 ] || [ $seed -ne ${SEEDS[-1]} ]; then
-            # Only increment completed if not skipped
-            if [ -f "${OUTPUT_DIR}/${PROTOCOL}_seed${seed}.csv" ]; then
-                COMPLETED=$((COMPLETED + 1))
-            fi
-        fi
-
-        # Show ETA only if not last simulation
-        if [ $idx -lt $TOTAL_SIMS ]; then
-            echo -n " ETA: $eta"
-        fi
-        echo ""
-    else
-        echo ""
-        # Continue on failure (don't exit)
-    fi
-done
+run_batch "${SEEDS[@]}"
 
 # Print summary
 print_summary
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Parallel sweep runner for build/unified-simulation.
+
+Expands a (protocol × seed × params) grid and runs it on a pool of
+concurrent simulator processes:
+
+- skip-if-output-exists (resume an interrupted sweep by re-running it)
+- atomic outputs: the simulator writes to a temp file that is renamed into
+  place only after a clean exit, so partial CSVs never look complete
+  (sidecar files listed in experiment_spec.SIDECAR_SUFFIXES move with it)
+- per-run retries on non-zero exit / timeout
+- ETA from measured run durations and the number of parallel workers
+- longest-predicted-first scheduling from a runtime model fitted on past
+  `runtime_seconds` (runtime_model.py), with predicted vs actual makespan
+- experiment specs (experiments/*.toml, see experiment_spec.py) and
+  config-hash deduplication: results are stored once under results/runs/
+  and outputs are symlinks, so identical runs are never simulated twice
+
+Usage:
+    # NC9 ground-only suite on 16 cores
+    python3 scripts/run_sweep.py --preset nc9-ground --jobs 16
+
+    # Custom grid: node-count sweep, seeds 1-5
+    python3 scripts/run_sweep.py --preset nc9-ground --seeds 1-5 \\
+        --sweep ground-nodes=10,20,40 --output-dir results/node_sweep
+
+    # Any spec file
+    python3 scripts/run_sweep.py --spec experiments/nc10-ground.toml
+
+    # Fully manual
+    python3 scripts/run_sweep.py --protocols aodv olsr --protocol-flag ground-routing \\
+        --param ground-only=true --param time=60 --seeds 1-15 --output-dir results/custom
+"""
+
+import argparse
+import itertools
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from experiment_spec import (RUN_STORE, binary_hash, find_stored, link_output, list_presets,
+                             load_spec, move_run, remove_run, run_id, spec_path, store_path,
+                             write_manifest)
+from runtime_model import RuntimeModel, lpt_makespan
+
+BUILD_PATH = Path("./build/unified-simulation")
+
+# ANSI colors (match the shell scripts)
+GREEN = '\033[0;32m'
+YELLOW = '\033[1;33m'
+RED = '\033[0;31m'
+NC = '\033[0m'
+
+
+@dataclass
+class Job:
+    """One simulator invocation."""
+    protocol: str
+    seed: int
+    params: Dict[str, str]
+    output: Path
+    run_id: Optional[str] = None
+    predicted: Optional[float] = None  # Seconds, from RuntimeModel
+
+    def label(self) -> str:
+        extra = ' '.join(f"{k}={v}" for k, v in self.params.items())
+        return f"{self.protocol} seed={self.seed}" + (f" {extra}" if extra else "")
+
+
+@dataclass
+class SweepReport:
+    """Counts and timings for a finished sweep."""
+    total: int = 0
+    completed: int = 0
+    skipped: int = 0
+    reused: int = 0      # linked to an identical stored run
+    failed: List[Job] = field(default_factory=list)
+    durations: List[float] = field(default_factory=list)
+    wall_time: float = 0.0
+    predicted_makespan: Optional[float] = None
+    execution_time: float = 0.0
+    predictions: List[Tuple[float, float]] = field(default_factory=list)  # (predicted, actual)
+
+
+def parse_seeds(specs: Sequence[str]) -> List[int]:
+    """Parse seed lists like ['1-15'], ['1', '3', '5'] or ['1-5,8']."""
+    seeds: List[int] = []
+    for spec in specs:
+        for part in spec.split(','):
+            if '-' in part:
+                start, end = part.split('-', 1)
+                seeds.extend(range(int(start), int(end) + 1))
+            elif part:
+                seeds.append(int(part))
+    return seeds
+
+
+def parse_params(items: Sequence[str]) -> Dict[str, str]:
+    """Parse ['key=value', ...] into {key: value}; the value may contain commas."""
+    parsed: Dict[str, str] = {}
+    for item in items:
+        key, sep, value = item.partition('=')
+        if not sep:
+            raise ValueError(f"Expected key=value, got '{item}'")
+        parsed[key.lstrip('-')] = value
+    return parsed
+
+
+def parse_assignments(items: Sequence[str]) -> Dict[str, List[str]]:
+    """Parse ['key=v1,v2', ...] into {key: [v1, v2]}."""
+    return {key: values.split(',') for key, values in parse_params(items).items()}
+
+
+def expand_grid(protocols: Sequence[str], seeds: Sequence[int],
+                sweep: Dict[str, List[str]], output_dir: Path,
+                output_pattern: str) -> List[Job]:
+    """Cartesian product of sweep axes × protocols × seeds."""
+    axes = list(sweep)
+    jobs = []
+    for values in itertools.product(*(sweep[axis] for axis in axes)):
+        params = dict(zip(axes, values))
+        for protocol in protocols:
+            for seed in seeds:
+                name = output_pattern.format(protocol=protocol, seed=seed, **params)
+                jobs.append(Job(protocol, seed, params, output_dir / name))
+    return jobs
+
+
+def default_pattern(base: str, sweep_axes: Sequence[str]) -> str:
+    """Insert the sweep axes before `_seed{seed}` so grid points never collide."""
+    if not sweep_axes:
+        return base
+    tags = ''.join(f"_{axis.replace('-', '')}{{{axis}}}" for axis in sweep_axes)
+    return base.replace("_seed{seed}", f"{tags}_seed{{seed}}")
+
+
+def run_job(job: Job, binary: Path, protocol_flag: str, base_params: Dict[str, str],
+            retries: int, timeout: Optional[float]) -> Optional[float]:
+    """Run one job with retries; returns its duration or None on failure."""
+    # Hidden (loaders skip dotfiles) but keeps the .csv suffix
+    stem = job.output.name[:-4] if job.output.name.endswith('.csv') else job.output.name
+    tmp = job.output.with_name(f".{stem}.tmp-{os.getpid()}-{threading.get_ident()}.csv")
+    params = {**base_params, **job.params, protocol_flag: job.protocol, 'seed': str(job.seed)}
+    cmd = [str(binary)] + [f"--{k}={v}" for k, v in params.items()] + [f"--output={tmp}"]
+
+    for _ in range(retries + 1):
+        start = time.monotonic()
+        try:
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                    timeout=timeout)
+            ok = result.returncode == 0 and tmp.exists()
+        except subprocess.TimeoutExpired:
+            ok = False
+        if ok:
+            if job.run_id is None:
+                move_run(tmp, job.output)
+            else:
+                stored = store_path(job.run_id)
+                stored.parent.mkdir(parents=True, exist_ok=True)
+                move_run(tmp, stored)
+                write_manifest(job.run_id, binary_hash(binary), params, job.seed)
+                link_output(stored, job.output)
+            return time.monotonic() - start
+        remove_run(tmp)
+    return None
+
+
+def format_time(seconds: float) -> str:
+    seconds = int(round(seconds))
+    return f"{seconds}s" if seconds < 60 else f"{seconds // 60}m {seconds % 60}s"
+
+
+def estimate_eta(report: SweepReport, outstanding: Sequence[Job], jobs: int) -> str:
+    """Remaining work divided across the workers that will still be busy.
+
+    With runtime predictions the remaining predicted work is calibrated by the
+    actual/predicted ratio observed so far; otherwise the mean duration is used.
+    """
+    if not report.durations:
+        return "calculating..."
+    remaining = len(outstanding)
+    if remaining == 0:
+        return format_time(0)
+    busy = max(1, min(jobs, remaining))
+
+    if report.predictions and all(job.predicted is not None for job in outstanding):
+        scale = sum(a for _, a in report.predictions) / max(sum(p for p, _ in report.predictions), 1e-9)
+        work = [job.predicted * scale for job in outstanding]
+        return format_time(max(sum(work) / busy, max(work)))
+
+    mean = sum(report.durations) / len(report.durations)
+    waves = -(-remaining // busy)
+    return format_time(waves * mean)
+
+
+def predict_runtimes(jobs: List[Job], model: RuntimeModel, protocol_flag: str,
+                     base_params: Dict[str, str]) -> Dict[str, int]:
+    """Attach predicted durations; returns how many jobs matched each model level."""
+    levels: Dict[str, int] = {}
+    for job in jobs:
+        job.predicted, level = model.predict({**base_params, **job.params}, job.protocol)
+        levels[level] = levels.get(level, 0) + 1
+    return levels
+
+
+def assign_run_ids(jobs: List[Job], binary: Path, protocol_flag: str,
+                   base_params: Dict[str, str]) -> None:
+    """Attach the canonical (binary, arguments, seed) identity to every job."""
+    digest = binary_hash(binary)
+    for job in jobs:
+        args = {**base_params, **job.params, protocol_flag: job.protocol}
+        job.run_id = run_id(digest, args, job.seed)
+
+
+def run_sweep(jobs: List[Job], binary: Path, protocol_flag: str,
+              base_params: Dict[str, str], workers: int,
+              retries: int = 1, timeout: Optional[float] = None) -> SweepReport:
+    """Execute jobs concurrently, skipping existing outputs and reusing stored runs."""
+    report = SweepReport(total=len(jobs))
+    start = time.monotonic()
+
+    pending = []
+    claimed: Dict[str, Job] = {}
+    duplicates: List[Job] = []
+    for job in jobs:
+        if job.output.exists():
+            report.skipped += 1
+            continue
+        stored = find_stored(job.run_id) if job.run_id else None
+        if stored is not None:
+            link_output(stored, job.output)
+            report.reused += 1
+        elif job.run_id in claimed:
+            duplicates.append(job)  # Identical point within this sweep: simulate once
+        else:
+            job.output.parent.mkdir(parents=True, exist_ok=True)
+            if job.run_id:
+                claimed[job.run_id] = job
+            pending.append(job)
+    if report.skipped:
+        print(f"{YELLOW}[SKIP]{NC} {report.skipped} runs already exist")
+    if report.reused:
+        print(f"{YELLOW}[SKIP]{NC} {report.reused} runs reused from {RUN_STORE} (identical configuration)")
+
+    # Longest-predicted-first: the pool starts jobs in submission order
+    if pending and all(job.predicted is not None for job in pending):
+        pending.sort(key=lambda job: job.predicted, reverse=True)
+        report.predicted_makespan = lpt_makespan([job.predicted for job in pending], workers)
+        print(f"Schedule: longest-predicted-first, predicted makespan "
+              f"{format_time(report.predicted_makespan)} on {workers} workers")
+
+    execution_start = time.monotonic()
+    outstanding = {id(job): job for job in pending}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_job, job, binary, protocol_flag, base_params, retries, timeout): job
+                   for job in pending}
+        done = 0
+        for future in as_completed(futures):
+            job = futures[future]
+            duration = future.result()
+            done += 1
+            del outstanding[id(job)]
+            if duration is None:
+                report.failed.append(job)
+                status = f"{RED}[FAIL]{NC}"
+            else:
+                report.completed += 1
+                report.durations.append(duration)
+                if job.predicted is not None:
+                    report.predictions.append((job.predicted, duration))
+                status = f"{GREEN}[PASS]{NC} {format_time(duration)}"
+
+            eta = f"  ETA: {estimate_eta(report, list(outstanding.values()), workers)}" if outstanding else ""
+            print(f"[{done + report.skipped + report.reused:3d}/{report.total}] {job.label():<28s} {status}{eta}",
+                  flush=True)
+
+    report.execution_time = time.monotonic() - execution_start
+
+    for job in duplicates:
+        stored = find_stored(job.run_id)
+        if stored is None:
+            report.failed.append(job)
+        else:
+            link_output(stored, job.output)
+            report.reused += 1
+
+    report.wall_time = time.monotonic() - start
+    return report
+
+
+def print_report(report: SweepReport) -> None:
+    print("")
+    print(f"Completed: {report.completed}  Skipped: {report.skipped}  Reused: {report.reused}  "
+          f"Failed: {len(report.failed)}  Wall time: {format_time(report.wall_time)}")
+    for job in report.failed:
+        print(f"  {RED}✗{NC} {job.label()} -> {job.output}")
+
+    if report.predicted_makespan is not None and report.predictions:
+        error = report.execution_time / report.predicted_makespan - 1 if report.predicted_makespan else 0.0
+        run_error = sum(abs(a - p) / p for p, a in report.predictions if p > 0) / len(report.predictions)
+        print(f"Makespan: predicted {format_time(report.predicted_makespan)}, "
+              f"actual {format_time(report.execution_time)} ({error:+.0%}); "
+              f"mean per-run prediction error {run_error:.0%}")
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Parallel unified-simulation sweep runner")
+    parser.add_argument('--preset', help=f"Experiment spec in experiments/ ({', '.join(list_presets())})")
+    parser.add_argument('--spec', type=Path, help="Experiment spec file (TOML)")
+    parser.add_argument('--binary', type=Path, default=BUILD_PATH)
+    parser.add_argument('--protocols', nargs='+')
+    parser.add_argument('--protocol-flag', help="Simulator flag receiving the protocol (ground-routing|isl-routing)")
+    parser.add_argument('--seeds', nargs='+', help="Seed list, e.g. 1-15 or 1,3,5 (default: spec or 1-15)")
+    parser.add_argument('--param', action='append', default=[], help="Fixed simulator flag key=value")
+    parser.add_argument('--sweep', action='append', default=[], help="Sweep axis key=v1,v2,...")
+    parser.add_argument('--output-dir', type=Path)
+    parser.add_argument('--output-pattern', help="Output file name, e.g. {protocol}_seed{seed}.csv")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="Concurrent simulations")
+    parser.add_argument('--retries', type=int, default=1, help="Extra attempts per failed run")
+    parser.add_argument('--timeout', type=float, help="Per-run timeout in seconds")
+    parser.add_argument('--schedule', choices=['lpt', 'fifo'], default='lpt',
+                        help="lpt: longest predicted runtime first (default); fifo: grid order")
+    parser.add_argument('--history', type=Path, default=Path("results"),
+                        help="Result CSVs used to fit the runtime model")
+    parser.add_argument('--no-dedup', action='store_true',
+                        help=f"Write outputs directly instead of through the {RUN_STORE} run store")
+    parser.add_argument('--counts-file', type=Path,
+                        help="Write COMPLETED/SKIPPED/FAILED as shell assignments (for the bash wrappers)")
+    args = parser.parse_args()
+
+    spec = {}
+    if args.spec or args.preset:
+        spec = load_spec(args.spec or spec_path(args.preset))
+
+    protocols = args.protocols or spec.get('protocols')
+    protocol_flag = args.protocol_flag or spec.get('protocol_flag')
+    output_dir = args.output_dir or spec.get('output_dir')
+    if not (protocols and protocol_flag and output_dir):
+        parser.error("--protocols, --protocol-flag and --output-dir are required without --preset/--spec")
+
+    base_params = dict(spec.get('params', {}))
+    base_params.update(parse_params(args.param))
+    sweep = dict(spec.get('sweep', {}))
+    sweep.update(parse_assignments(args.sweep))
+    pattern = args.output_pattern or default_pattern(
+        spec.get('output_pattern', "{protocol}_seed{seed}.csv"), list(sweep))
+    seeds = parse_seeds(args.seeds or [spec.get('seeds', "1-15")])
+
+    if not args.binary.exists():
+        print(f"{RED}ERROR: Build not found at {args.binary}{NC}")
+        print("Run 'make all' first")
+        sys.exit(1)
+
+    jobs = expand_grid(protocols, seeds, sweep, output_dir, pattern)
+    if not args.no_dedup:
+        assign_run_ids(jobs, args.binary, protocol_flag, base_params)
+    if args.schedule == 'lpt':
+        model = RuntimeModel.from_results(args.history)
+        levels = predict_runtimes(jobs, model, protocol_flag, base_params)
+        print(f"Runtime model: {model.n_runs} past runs; matches "
+              + ', '.join(f"{level}={count}" for level, count in sorted(levels.items())))
+    print(f"Sweep: {len(jobs)} runs, {args.jobs} parallel, output {output_dir}")
+
+    report = run_sweep(jobs, args.binary, protocol_flag, base_params,
+                       args.jobs, args.retries, args.timeout)
+    print_report(report)
+
+    if args.counts_file:
+        args.counts_file.write_text(f"COMPLETED={report.completed}\n"
+                                    f"SKIPPED={report.skipped + report.reused}\n"
+                                    f"REUSED={report.reused}\n"
+                                    f"FAILED={len(report.failed)}\n")
+
+    sys.exit(1 if report.failed else 0)
+
+
+if __name__ == '__main__':
+    main()
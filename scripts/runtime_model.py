@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Runtime model for sweep scheduling, learned from past `runtime_seconds`.
+
+Every result CSV records how long its simulation took. Runtime scales with
+simulated time, so the model stores seconds of wall time per simulated
+second and averages them per configuration, backing off to coarser keys
+when a configuration has no history:
+
+    (mode, protocol, ground nodes, satellites, mobility)
+    (mode, protocol, ground nodes, satellites)     legacy CSVs lack mobility
+    (mode, protocol)
+    (mode,)
+    ()
+
+Usage:
+    model = RuntimeModel.from_results(Path("results"))
+    seconds, level = model.predict({'ground-only': 'true', 'time': '60'}, 'aodv')
+    makespan = lpt_makespan([...predictions...], workers=16)
+"""
+
+import heapq
+import os
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Reuse the analysis tokenizer for result CSVs
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'analysis'))
+from fast_loader import SIDECAR_SUFFIXES, parse_run_csv  # noqa: E402
+from experiment_spec import SIM_DEFAULTS  # noqa: E402
+
+# Wall seconds per simulated second when there is no history at all
+DEFAULT_RATE = 1.0
+
+Key = Tuple[Any, ...]
+
+
+def _keys(mode: str, protocol: str, nodes: int, satellites: int,
+          mobility: Optional[str]) -> List[Key]:
+    """Lookup keys from most to least specific (mobility-less key when unknown)."""
+    keys = [(mode, protocol, nodes, satellites, mobility)] if mobility else []
+    return keys + [(mode, protocol, nodes, satellites), (mode, protocol), (mode,), ()]
+
+
+def record_features(record: Dict[str, Any]) -> Tuple[str, str, int, int, Optional[str]]:
+    """Configuration features of a parsed result CSV."""
+    ground = 'ground_routing' in record
+    satellites = int(record.get('satellites', 0))
+    if ground and satellites == 0:
+        mode = 'ground'
+    elif ground:
+        mode = 'dual'
+    else:
+        mode = 'satellite'
+    protocol = str(record.get('ground_routing') or record.get('isl_routing')).lower()
+    nodes = int(record.get('ground_nodes', 0))
+    return mode, protocol, nodes, satellites, record.get('ground_mobility')
+
+
+def job_features(params: Dict[str, str], protocol: str) -> Tuple[Tuple[str, str, int, int, Optional[str]], float]:
+    """Configuration features and simulated time of a sweep job's arguments."""
+    if params.get('ground-only') == 'true':
+        mode = 'ground'
+    elif params.get('satellite-only') == 'true':
+        mode = 'satellite'
+    else:
+        mode = 'dual'
+    nodes = 0 if mode == 'satellite' else int(params.get('ground-nodes', SIM_DEFAULTS['ground-nodes']))
+    satellites = 0 if mode == 'ground' else int(params.get('satellites', SIM_DEFAULTS['satellites']))
+    mobility = None if mode == 'satellite' else params.get('ground-mobility', SIM_DEFAULTS['ground-mobility'])
+    sim_time = float(params.get('time', SIM_DEFAULTS['time']))
+    return (mode, protocol.lower(), nodes, satellites, mobility), sim_time
+
+
+class RuntimeModel:
+    """Hierarchical mean of wall seconds per simulated second."""
+
+    LEVELS = ['exact', 'no-mobility', 'protocol', 'mode', 'global']
+
+    def __init__(self):
+        self._sum: Dict[Key, float] = defaultdict(float)
+        self._count: Dict[Key, int] = defaultdict(int)
+        self.n_runs = 0
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """Learn from one parsed result CSV (ignored without runtime or sim time)."""
+        runtime = record.get('runtime_seconds')
+        sim_time = record.get('sim_time')
+        if runtime is None or not sim_time:
+            return
+        rate = float(runtime) / float(sim_time)
+        for key in _keys(*record_features(record)):
+            self._sum[key] += rate
+            self._count[key] += 1
+        self.n_runs += 1
+
+    @classmethod
+    def from_results(cls, results_dir: Path) -> 'RuntimeModel':
+        """Fit on every result CSV below results_dir (each file counted once)."""
+        model = cls()
+        seen = set()
+        for root, _, files in os.walk(results_dir):
+            for name in files:
+                if (not name.endswith('.csv') or name.startswith('.')
+                        or name.endswith(SIDECAR_SUFFIXES)):
+                    continue
+                path = os.path.realpath(os.path.join(root, name))
+                if path in seen:
+                    continue
+                seen.add(path)
+                try:
+                    model.add(parse_run_csv(Path(path)))
+                except Exception:
+                    continue  # Not a run CSV (summaries, partial files)
+        return model
+
+    def predict(self, params: Dict[str, str], protocol: str) -> Tuple[float, str]:
+        """Predicted wall seconds for a job, and the key level that matched."""
+        features, sim_time = job_features(params, protocol)
+        keys = _keys(*features)
+        levels = self.LEVELS if len(keys) == 5 else self.LEVELS[1:]
+        for key, level in zip(keys, levels):
+            if self._count.get(key):
+                return self._sum[key] / self._count[key] * sim_time, level
+        return DEFAULT_RATE * sim_time, 'default'
+
+
+def lpt_makespan(durations: Iterable[float], workers: int) -> float:
+    """Makespan of longest-processing-time-first list scheduling on `workers` slots."""
+    finish = [0.0] * max(1, workers)
+    for duration in sorted(durations, reverse=True):
+        earliest = heapq.heappop(finish)
+        heapq.heappush(finish, earliest + duration)
+    return max(finish)
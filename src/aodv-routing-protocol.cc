@@ -20,6 +20,7 @@ void AodvRoutingProtocol::Install(NodeContainer islNodes, NodeContainer groundNo
         InternetStackHelper internet;
         internet.SetRoutingHelper(m_aodvHelper);
         internet.Install(islNodes);
+        TraceControlPort(islNodes, aodv::RoutingProtocol::AODV_PORT);
     }
 
     // Install internet stack with AODV routing on ground nodes
@@ -27,13 +28,13 @@ void AodvRoutingProtocol::Install(NodeContainer islNodes, NodeContainer groundNo
         InternetStackHelper internet;
         internet.SetRoutingHelper(m_aodvHelper);
         internet.Install(groundNodes);
+        TraceControlPort(groundNodes, aodv::RoutingProtocol::AODV_PORT);
     }
 }
 
 uint64_t AodvRoutingProtocol::GetControlBytes() const {
-    // TODO: Will track control bytes in Day 4
-    // For now, return 0
-    return 0;
+    // Counted by TraceControlPort() hooks connected in Install()
+    return m_controlBytes;
 }
 
 void AodvRoutingProtocol::SetParameter(std::string key, std::string value) {
@@ -51,4 +52,8 @@ std::string AodvRoutingProtocol::GetConfig() const {
     return oss.str();
 }
 
+int64_t AodvRoutingProtocol::AssignStreams(NodeContainer nodes, int64_t stream) {
+    return m_aodvHelper.AssignStreams(nodes, stream);
+}
+
 } // namespace ns3
@@ -35,6 +35,7 @@ public:
     uint64_t GetControlBytes() const override;
     void SetParameter(std::string key, std::string value) override;
     std::string GetConfig() const override;
+    int64_t AssignStreams(NodeContainer nodes, int64_t stream) override;
 
 private:
     AodvHelper m_aodvHelper;
@@ -28,6 +28,7 @@ void DsdvRoutingProtocol::Install(NodeContainer islNodes, NodeContainer groundNo
         InternetStackHelper internet;
         internet.SetRoutingHelper(m_dsdvHelper);
         internet.Install(islNodes);
+        TraceControlPort(islNodes, dsdv::RoutingProtocol::DSDV_PORT);
     }
 
     // Install internet stack with DSDV routing on ground nodes
@@ -35,13 +36,13 @@ void DsdvRoutingProtocol::Install(NodeContainer islNodes, NodeContainer groundNo
         InternetStackHelper internet;
         internet.SetRoutingHelper(m_dsdvHelper);
         internet.Install(groundNodes);
+        TraceControlPort(groundNodes, dsdv::RoutingProtocol::DSDV_PORT);
     }
 }
 
 uint64_t DsdvRoutingProtocol::GetControlBytes() const {
-    // TODO: Will track control bytes in future work
-    // For now, return 0 (consistent with other protocols)
-    return 0;
+    // Counted by TraceControlPort() hooks connected in Install()
+    return m_controlBytes;
 }
 
 void DsdvRoutingProtocol::SetParameter(std::string key, std::string value) {
@@ -60,4 +61,28 @@ std::string DsdvRoutingProtocol::GetConfig() const {
     return oss.str();
 }
 
+int64_t DsdvRoutingProtocol::AssignStreams(NodeContainer nodes, int64_t stream) {
+    // DsdvHelper has no AssignStreams; reach the installed instances directly
+    int64_t currentStream = stream;
+    for (uint32_t i = 0; i < nodes.GetN(); ++i) {
+        Ptr<Ipv4> ipv4 = nodes.Get(i)->GetObject<Ipv4>();
+        if (!ipv4) {
+            continue;
+        }
+        Ptr<Ipv4RoutingProtocol> routing = ipv4->GetRoutingProtocol();
+        Ptr<dsdv::RoutingProtocol> dsdv = DynamicCast<dsdv::RoutingProtocol>(routing);
+        if (!dsdv) {
+            Ptr<Ipv4ListRouting> list = DynamicCast<Ipv4ListRouting>(routing);
+            for (uint32_t j = 0; list && !dsdv && j < list->GetNRoutingProtocols(); ++j) {
+                int16_t priority;
+                dsdv = DynamicCast<dsdv::RoutingProtocol>(list->GetRoutingProtocol(j, priority));
+            }
+        }
+        if (dsdv) {
+            currentStream += dsdv->AssignStreams(currentStream);
+        }
+    }
+    return currentStream - stream;
+}
+
 } // namespace ns3
@@ -11,8 +11,8 @@
  * - Algorithm: Distance-vector with sequence numbers
  */
 
-#ifndef DSDV_ROUTING_PROTOCOL_H
-#define DSDV_ROUTING_PROTOCOL_H
+#ifndef DSDV_ROUTING_PROTOCOL_WRAPPER_H
+#define DSDV_ROUTING_PROTOCOL_WRAPPER_H
 
 #include "routing-protocol.h"
 #include "ns3/dsdv-module.h"
@@ -35,6 +35,7 @@ public:
     uint64_t GetControlBytes() const override;
     void SetParameter(std::string key, std::string value) override;
     std::string GetConfig() const override;
+    int64_t AssignStreams(NodeContainer nodes, int64_t stream) override;
 
 private:
     DsdvHelper m_dsdvHelper;
@@ -46,4 +47,4 @@ private:
 
 } // namespace ns3
 
-#endif // DSDV_ROUTING_PROTOCOL_H
+#endif // DSDV_ROUTING_PROTOCOL_WRAPPER_H
@@ -0,0 +1,58 @@
+/**
+ * Ephemeris Mobility Model Implementation
+ */
+
+#include "ephemeris-mobility-model.h"
+#include "ns3/simulator.h"
+#include "ns3/log.h"
+
+namespace ns3 {
+
+NS_LOG_COMPONENT_DEFINE("EphemerisMobilityModel");
+
+NS_OBJECT_ENSURE_REGISTERED(EphemerisMobilityModel);
+
+TypeId EphemerisMobilityModel::GetTypeId() {
+    static TypeId tid = TypeId("ns3::EphemerisMobilityModel")
+        .SetParent<MobilityModel>()
+        .SetGroupName("Mobility")
+        .AddConstructor<EphemerisMobilityModel>();
+    return tid;
+}
+
+EphemerisMobilityModel::EphemerisMobilityModel()
+    : m_satId(0) {
+}
+
+void EphemerisMobilityModel::SetEphemeris(std::shared_ptr<const OrbitalEphemeris> ephemeris, uint32_t satId) {
+    NS_ASSERT_MSG(ephemeris && ephemeris->IsOpen(), "Ephemeris not open");
+    NS_ASSERT_MSG(satId < ephemeris->GetNumSatellites(), "Satellite " << satId << " not in ephemeris");
+    m_ephemeris = ephemeris;
+    m_satId = satId;
+    NotifyCourseChange();
+}
+
+Vector EphemerisMobilityModel::DoGetPosition() const {
+    if (!m_ephemeris) {
+        return Vector(0.0, 0.0, 0.0);
+    }
+    double position[3];
+    m_ephemeris->GetState(m_satId, Simulator::Now().GetSeconds(), position, nullptr);
+    return Vector(position[0], position[1], position[2]);
+}
+
+void EphemerisMobilityModel::DoSetPosition(const Vector& position) {
+    NS_LOG_WARN("SetPosition ignored on satellite " << m_satId << " (ephemeris trajectory)");
+}
+
+Vector EphemerisMobilityModel::DoGetVelocity() const {
+    if (!m_ephemeris) {
+        return Vector(0.0, 0.0, 0.0);
+    }
+    double position[3];
+    double velocity[3];
+    m_ephemeris->GetState(m_satId, Simulator::Now().GetSeconds(), position, velocity);
+    return Vector(velocity[0], velocity[1], velocity[2]);
+}
+
+} // namespace ns3
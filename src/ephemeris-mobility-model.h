@@ -0,0 +1,63 @@
+/**
+ * Ephemeris Mobility Model
+ *
+ * Purpose: Satellite mobility read from a shared OrbitalEphemeris
+ * Position and velocity at Simulator::Now() are interpolated from the
+ * memory-mapped table (cubic Hermite between grid samples), so satellites
+ * follow their orbits continuously without per-epoch SetPosition calls.
+ * All satellites of a scenario share one ephemeris.
+ *
+ * Usage:
+ *   Ptr<EphemerisMobilityModel> mobility = CreateObject<EphemerisMobilityModel>();
+ *   mobility->SetEphemeris(ephemeris, satId);
+ *   node->AggregateObject(mobility);
+ */
+
+#ifndef EPHEMERIS_MOBILITY_MODEL_H
+#define EPHEMERIS_MOBILITY_MODEL_H
+
+#include "ns3/mobility-model.h"
+#include "orbital-ephemeris.h"
+#include <memory>
+
+namespace ns3 {
+
+/**
+ * Mobility model interpolating one satellite's track from an ephemeris.
+ */
+class EphemerisMobilityModel : public MobilityModel {
+public:
+    static TypeId GetTypeId();
+
+    /**
+     * Constructor.
+     */
+    EphemerisMobilityModel();
+
+    /**
+     * Set the ephemeris and the satellite whose track this model follows.
+     */
+    void SetEphemeris(std::shared_ptr<const OrbitalEphemeris> ephemeris, uint32_t satId);
+
+    /**
+     * Get the satellite index in the ephemeris.
+     */
+    uint32_t GetSatelliteId() const { return m_satId; }
+
+private:
+    Vector DoGetPosition() const override;
+
+    /**
+     * Ignored: the trajectory is fixed by the ephemeris.
+     */
+    void DoSetPosition(const Vector& position) override;
+
+    Vector DoGetVelocity() const override;
+
+    std::shared_ptr<const OrbitalEphemeris> m_ephemeris;
+    uint32_t m_satId;
+};
+
+} // namespace ns3
+
+#endif // EPHEMERIS_MOBILITY_MODEL_H
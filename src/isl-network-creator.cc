@@ -38,25 +38,30 @@ NetDeviceContainer IslNetworkCreator::CreateIslMesh(NodeContainer satellites, co
     islHelper.SetDeviceAttribute("DataRate", StringValue("10Gbps"));
     islHelper.SetQueue("ns3::DropTailQueue", "MaxSize", StringValue("100p"));
 
-    // Create ISL links
-    std::set<std::pair<uint32_t, uint32_t>> createdLinks; // Track created links
+    // Create ISL links (each link appears once per endpoint's CSR row)
+    uint32_t createdLinks = 0;
 
-    for (uint32_t sat = 0; sat < topology.numSatellites; ++sat) {
-        const auto& neighbors = topology.neighbors.at(sat);
+    // Reuse precomputed link delays (AssignLinkDelays) when available
+    bool haveLinkDelays = topology.linkDelay.size() == topology.adjacency.size();
 
-        for (uint32_t neighbor : neighbors) {
+    for (uint32_t sat = 0; sat < topology.numSatellites; ++sat) {
+        for (uint32_t e = topology.offsets[sat]; e < topology.offsets[sat + 1]; ++e) {
+            uint32_t neighbor = topology.adjacency[e];
             // Avoid duplicate links (only create sat < neighbor)
             if (sat >= neighbor) continue;
 
-            // Check if link already created
-            std::pair<uint32_t, uint32_t> linkPair = {sat, neighbor};
-            if (createdLinks.count(linkPair)) continue;
-
-            // Compute distance-based delay
+            // Distance-based delay
             Ptr<Node> node1 = satellites.Get(sat);
             Ptr<Node> node2 = satellites.Get(neighbor);
-            double distance = ComputeSatelliteDistance(node1, node2);
-            Time delay = ComputePropagationDelay(distance);
+            double distance;
+            Time delay;
+            if (haveLinkDelays) {
+                delay = Seconds(topology.linkDelay[e]);
+                distance = topology.linkDelay[e] * 299792458.0;
+            } else {
+                distance = ComputeSatelliteDistance(node1, node2);
+                delay = ComputePropagationDelay(distance);
+            }
 
             // Set channel delay
             islHelper.SetChannelAttribute("Delay", TimeValue(delay));
@@ -65,7 +70,7 @@ NetDeviceContainer IslNetworkCreator::CreateIslMesh(NodeContainer satellites, co
             NetDeviceContainer linkDevices = islHelper.Install(node1, node2);
             allIslDevices.Add(linkDevices);
 
-            createdLinks.insert(linkPair);
+            ++createdLinks;
 
             NS_LOG_INFO("Created ISL: Sat " << sat << " ↔ Sat " << neighbor
                 << " (distance: " << distance / 1000.0 << " km, delay: "
@@ -73,7 +78,7 @@ NetDeviceContainer IslNetworkCreator::CreateIslMesh(NodeContainer satellites, co
         }
     }
 
-    NS_LOG_INFO("Created " << createdLinks.size() << " ISL links ("
+    NS_LOG_INFO("Created " << createdLinks << " ISL links ("
         << allIslDevices.GetN() << " devices)");
 
     return allIslDevices;
@@ -90,11 +95,18 @@ Ipv4InterfaceContainer IslNetworkCreator::AssignIslAddresses(const NetDeviceCont
     // Each link gets its own /30 subnet (4 addresses: network, 2 hosts, broadcast)
     uint32_t linkCount = islDevices.GetN() / 2; // Each link has 2 devices
 
+    // 64 subnets per third-octet sweep, 64 sweeps per second octet; the
+    // second octet skips 1 (10.1.0.0/16 is the ground mesh)
+    NS_ABORT_MSG_IF(linkCount > 255 * 4096, "Too many ISL links for 10.0.0.0/8: " << linkCount);
+
     for (uint32_t i = 0; i < linkCount; ++i) {
         // Each link gets its own /30 subnet
-        // Example: 10.0.0.0/30, 10.0.0.4/30, 10.0.0.8/30, etc.
+        // Example: 10.0.0.0/30, 10.0.4.0/30, ..., 10.0.252.0/30, 10.0.0.4/30, ...
+        // (links 0-63 are 10.0.(4i).0/30)
+        uint32_t second = i / 4096;
         std::ostringstream subnet;
-        subnet << "10." << (i / 64) << "." << ((i % 64) * 4) << ".0";
+        subnet << "10." << (second == 0 ? 0 : second + 1) << "." << ((i % 64) * 4)
+               << "." << (((i / 64) % 64) * 4);
         address.SetBase(subnet.str().c_str(), "255.255.255.252");
 
         // Assign addresses to this link's 2 devices
@@ -45,8 +45,9 @@ public:
     /**
      * Assign IP addresses to ISL links
      *
-     * Uses 10.x.x.x/30 subnets (one per ISL link)
-     * Example: Link 0 = 10.0.0.0/30, Link 1 = 10.0.0.4/30, etc.
+     * Uses 10.x.x.x/30 subnets (one per ISL link), skipping 10.1.0.0/16
+     * (ground mesh); supports up to ~1M links
+     * Example: Link 0 = 10.0.0.0/30, Link 1 = 10.0.4.0/30, Link 64 = 10.0.0.4/30
      *
      * @param islDevices ISL device container (from CreateIslMesh)
      * @return ISL interface container (96 interfaces)
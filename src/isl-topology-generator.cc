@@ -1,7 +1,8 @@
 /**
  * ISL Topology Generator Implementation
  *
- * Algorithm: Walker-Delta 53:24/3/1 with 4-neighbor ISL topology
+ * Algorithm: Walker T/P/F (Delta or Star) with 4-neighbor ISL topology, built
+ * directly into CSR arrays in one O(T) pass
  * - 2 intra-plane neighbors: Previous and next satellite in same orbital plane
  * - 2 inter-plane neighbors: Satellites in adjacent planes (fixed index approach)
  *
@@ -14,91 +15,110 @@
 #include <queue>
 #include <limits>
 #include <algorithm>
-#include <set>
+#include <cmath>
 
 namespace ns3 {
 
-IslTopology GenerateWalkerDeltaTopology(uint32_t numSatellites, uint32_t neighborsPerSat) {
+IslTopology GenerateWalkerTopology(const WalkerConstellation& walker, uint32_t neighborsPerSat) {
     IslTopology topology;
-    topology.numSatellites = numSatellites;
-
-    // Walker-Delta 53:24/3/1: 3 planes, 8 satellites per plane
-    const uint32_t NUM_PLANES = 3;
-    const uint32_t SATS_PER_PLANE = 8;
 
     // Validate input
-    if (numSatellites != 24) {
-        // For now, only support 24-satellite constellation
-        // Future: generalize to other Walker-Delta configurations
+    if (!walker.IsValid() || (neighborsPerSat != 4 && neighborsPerSat != 2)) {
+        // Only "+Grid" (4) and ring-only (2) topologies are supported
         return topology;
     }
 
-    if (neighborsPerSat != 4) {
-        // Only 4-neighbor topology supported (industry standard)
-        return topology;
-    }
+    const uint32_t numPlanes = walker.planes;
+    const uint32_t satsPerPlane = walker.SatsPerPlane();
+    const uint32_t numSatellites = walker.totalSatellites;
 
-    // Generate neighbor relationships for each satellite
-    for (uint32_t plane = 0; plane < NUM_PLANES; ++plane) {
-        for (uint32_t idx = 0; idx < SATS_PER_PLANE; ++idx) {
-            uint32_t satId = plane * SATS_PER_PLANE + idx;
+    topology.numSatellites = numSatellites;
+    topology.offsets.resize(numSatellites + 1);
+    topology.adjacency.reserve(static_cast<size_t>(numSatellites) * neighborsPerSat);
+
+    // Generate neighbor relationships for each satellite, row by row
+    for (uint32_t plane = 0; plane < numPlanes; ++plane) {
+        for (uint32_t idx = 0; idx < satsPerPlane; ++idx) {
+            uint32_t satId = plane * satsPerPlane + idx;
+            topology.offsets[satId] = topology.adjacency.size();
 
-            std::vector<uint32_t> neighbors;
+            uint32_t candidates[4];
+            uint32_t count = 0;
 
             // === INTRA-PLANE NEIGHBORS (2) ===
             // Forward neighbor (next in same plane)
-            uint32_t forward = plane * SATS_PER_PLANE + ((idx + 1) % SATS_PER_PLANE);
-            neighbors.push_back(forward);
+            candidates[count++] = plane * satsPerPlane + ((idx + 1) % satsPerPlane);
 
             // Backward neighbor (previous in same plane)
-            uint32_t backward = plane * SATS_PER_PLANE + ((idx + SATS_PER_PLANE - 1) % SATS_PER_PLANE);
-            neighbors.push_back(backward);
+            candidates[count++] = plane * satsPerPlane + ((idx + satsPerPlane - 1) % satsPerPlane);
 
             // === INTER-PLANE NEIGHBORS (2) ===
-            // Use fixed index approach (Option A from research):
-            // Connect to same index in adjacent planes
-            //
-            // Rationale:
-            // - Simple and deterministic
-            // - Stable links (no dynamic recomputation needed)
-            // - Validated by Starlink and Iridium architectures
-
-            uint32_t nextPlane = (plane + 1) % NUM_PLANES;
-            uint32_t prevPlane = (plane + NUM_PLANES - 1) % NUM_PLANES;
-
-            // Same index in next plane
-            uint32_t rightNeighbor = nextPlane * SATS_PER_PLANE + idx;
-            neighbors.push_back(rightNeighbor);
-
-            // Same index in previous plane
-            uint32_t leftNeighbor = prevPlane * SATS_PER_PLANE + idx;
-            neighbors.push_back(leftNeighbor);
-
-            // Store neighbors for this satellite
-            topology.neighbors[satId] = neighbors;
-        }
-    }
+            // Same slot in adjacent planes ("+Grid", as Starlink and Iridium).
+            // Walker-Delta wraps from the last plane to the first; plane P would
+            // be plane 0 shifted by F slots, so the seam link is offset by F.
+            // Walker-Star planes 0 and P-1 counter-rotate: no seam links.
+            if (neighborsPerSat == 4 && numPlanes > 1) {
+                if (plane + 1 < numPlanes) {
+                    candidates[count++] = (plane + 1) * satsPerPlane + idx;
+                } else if (!walker.star) {
+                    candidates[count++] = (idx + walker.phasing) % satsPerPlane;
+                }
+
+                if (plane > 0) {
+                    candidates[count++] = (plane - 1) * satsPerPlane + idx;
+                } else if (!walker.star) {
+                    uint32_t slot = (idx + satsPerPlane - walker.phasing % satsPerPlane) % satsPerPlane;
+                    candidates[count++] = (numPlanes - 1) * satsPerPlane + slot;
+                }
+            }
 
-    // Count unique bidirectional links
-    // Each link counted once (not twice for both directions)
-    std::set<std::pair<uint32_t, uint32_t>> uniqueLinks;
-    for (const auto& [satId, neighbors] : topology.neighbors) {
-        for (uint32_t neighbor : neighbors) {
-            // Normalize link direction (always store smaller ID first)
-            auto link = (satId < neighbor) ? std::make_pair(satId, neighbor)
-                                            : std::make_pair(neighbor, satId);
-            uniqueLinks.insert(link);
+            // Store neighbors, dropping self-links and duplicates (degenerate shapes)
+            for (uint32_t c = 0; c < count; ++c) {
+                uint32_t neighbor = candidates[c];
+                if (neighbor == satId || std::find(candidates, candidates + c, neighbor) != candidates + c) {
+                    continue;
+                }
+                topology.adjacency.push_back(neighbor);
+            }
         }
     }
+    topology.offsets[numSatellites] = topology.adjacency.size();
 
-    topology.numLinks = uniqueLinks.size();
+    // Every link is stored once in each endpoint's row
+    topology.numLinks = topology.adjacency.size() / 2;
 
     return topology;
 }
 
+IslTopology GenerateWalkerDeltaTopology(uint32_t numSatellites, uint32_t neighborsPerSat) {
+    WalkerConstellation walker;
+    walker.totalSatellites = numSatellites;
+    return GenerateWalkerTopology(walker, neighborsPerSat);
+}
+
+void AssignLinkDelays(IslTopology& topology, const std::vector<double>& x,
+                      const std::vector<double>& y, const std::vector<double>& z) {
+    const double SPEED_OF_LIGHT = 299792458.0; // m/s
+    topology.linkDelay.resize(topology.adjacency.size());
+
+    // Flat loop over all CSR edges (row owner from offsets)
+    for (uint32_t sat = 0; sat < topology.numSatellites; ++sat) {
+        const double sx = x[sat];
+        const double sy = y[sat];
+        const double sz = z[sat];
+        for (uint32_t e = topology.offsets[sat]; e < topology.offsets[sat + 1]; ++e) {
+            uint32_t neighbor = topology.adjacency[e];
+            double dx = x[neighbor] - sx;
+            double dy = y[neighbor] - sy;
+            double dz = z[neighbor] - sz;
+            topology.linkDelay[e] = std::sqrt(dx*dx + dy*dy + dz*dz) / SPEED_OF_LIGHT;
+        }
+    }
+}
+
 double ComputeMeshConnectivity(const IslTopology& topology) {
-    uint32_t reachablePairs = 0;
-    uint32_t totalPairs = topology.numSatellites * (topology.numSatellites - 1);
+    uint64_t reachablePairs = 0;
+    uint64_t totalPairs = static_cast<uint64_t>(topology.numSatellites) * (topology.numSatellites - 1);
 
     if (totalPairs == 0) {
         return 0.0; // Edge case: 0 or 1 satellites
@@ -128,13 +148,10 @@ std::vector<bool> BFS(const IslTopology& topology, uint32_t src) {
         q.pop();
 
         // Get neighbors of current satellite
-        auto it = topology.neighbors.find(current);
-        if (it != topology.neighbors.end()) {
-            for (uint32_t neighbor : it->second) {
-                if (neighbor < topology.numSatellites && !visited[neighbor]) {
-                    visited[neighbor] = true;
-                    q.push(neighbor);
-                }
+        for (uint32_t neighbor : topology.Neighbors(current)) {
+            if (!visited[neighbor]) {
+                visited[neighbor] = true;
+                q.push(neighbor);
             }
         }
     }
@@ -169,14 +186,11 @@ std::vector<uint32_t> Dijkstra(const IslTopology& topology, uint32_t src) {
         visited[u] = true;
 
         // Update distances to neighbors
-        auto it = topology.neighbors.find(u);
-        if (it != topology.neighbors.end()) {
-            for (uint32_t neighbor : it->second) {
-                if (neighbor < topology.numSatellites && !visited[neighbor]) {
-                    uint32_t newDist = dist[u] + 1; // Each ISL hop = cost 1
-                    if (newDist < dist[neighbor]) {
-                        dist[neighbor] = newDist;
-                    }
+        for (uint32_t neighbor : topology.Neighbors(u)) {
+            if (!visited[neighbor]) {
+                uint32_t newDist = dist[u] + 1; // Each ISL hop = cost 1
+                if (newDist < dist[neighbor]) {
+                    dist[neighbor] = newDist;
                 }
             }
         }
@@ -185,4 +199,37 @@ std::vector<uint32_t> Dijkstra(const IslTopology& topology, uint32_t src) {
     return dist;
 }
 
+std::vector<double> DijkstraDelay(const IslTopology& topology, uint32_t src) {
+    const double INF = std::numeric_limits<double>::infinity();
+    std::vector<double> dist(topology.numSatellites, INF);
+
+    if (src >= topology.numSatellites || topology.linkDelay.empty()) {
+        return dist; // Invalid source or no weights
+    }
+
+    // Binary min-heap of (delay, satellite); stale entries are skipped on pop
+    using HeapNode = std::pair<double, uint32_t>;
+    std::priority_queue<HeapNode, std::vector<HeapNode>, std::greater<HeapNode>> heap;
+    dist[src] = 0.0;
+    heap.push({0.0, src});
+
+    while (!heap.empty()) {
+        auto [d, u] = heap.top();
+        heap.pop();
+        if (d > dist[u]) continue;
+
+        for (uint32_t e = topology.offsets[u]; e < topology.offsets[u + 1]; ++e) {
+            if (!topology.IsLinkUp(e)) continue;
+            uint32_t neighbor = topology.adjacency[e];
+            double newDist = d + topology.linkDelay[e];
+            if (newDist < dist[neighbor]) {
+                dist[neighbor] = newDist;
+                heap.push({newDist, neighbor});
+            }
+        }
+    }
+
+    return dist;
+}
+
 } // namespace ns3
@@ -1,7 +1,7 @@
 /**
  * ISL Topology Generator
  *
- * Purpose: Generate Inter-Satellite Link (ISL) topology for Walker-Delta constellation
+ * Purpose: Generate Inter-Satellite Link (ISL) topology for Walker-Delta/Star constellations
  * Design: 4 neighbors per satellite (2 intra-plane, 2 inter-plane)
  * Based on: Real-world Starlink and Iridium ISL patterns
  *
@@ -15,40 +15,134 @@
 #define ISL_TOPOLOGY_GENERATOR_H
 
 #include <vector>
-#include <map>
+#include <span>
 #include <cstdint>
 
 namespace ns3 {
 
+/**
+ * Walker constellation parameters (i:T/P/F notation)
+ *
+ * Satellite s lies in plane s / (T/P) at in-plane slot s % (T/P).
+ * - Walker-Delta: plane RAANs spread over 360°, adjacent planes co-rotating
+ * - Walker-Star: plane RAANs spread over 180° (polar); the first and last
+ *   planes counter-rotate across the seam and are not cross-linked
+ *
+ * Phasing F shifts each plane's satellites by F × 360°/T in anomaly.
+ */
+struct WalkerConstellation {
+    uint32_t totalSatellites = 24;  // T
+    uint32_t planes = 3;            // P (must divide T)
+    uint32_t phasing = 0;           // F (0 to P-1)
+    double inclinationDeg = 53.0;
+    double altitudeKm = 550.0;
+    bool star = false;              // Walker-Star instead of Walker-Delta
+
+    uint32_t SatsPerPlane() const { return planes > 0 ? totalSatellites / planes : 0; }
+
+    /**
+     * Check T/P/F consistency (P divides T, F < P).
+     */
+    bool IsValid() const {
+        return planes > 0 && totalSatellites > 0 && totalSatellites % planes == 0 && phasing < planes;
+    }
+};
+
 /**
  * ISL Topology Data Structure
  *
- * Represents the Inter-Satellite Link mesh topology for a Walker-Delta constellation.
+ * Represents the Inter-Satellite Link mesh topology for a Walker constellation.
+ * Neighbors are stored in compressed sparse row (CSR) form: the neighbors of
+ * satellite s are adjacency[offsets[s] .. offsets[s + 1]), every
+ * bidirectional link appearing once in each endpoint's row. Optional
+ * per-edge propagation delays (AssignLinkDelays) and link states
+ * (IslTopologyUpdater) are stored in the same order.
  */
 struct IslTopology {
-    uint32_t numSatellites;                              // Total number of satellites
-    uint32_t numLinks;                                    // Number of bidirectional ISL links
-    std::map<uint32_t, std::vector<uint32_t>> neighbors; // satId → list of neighbor satIds
+    uint32_t numSatellites;          // Total number of satellites
+    uint32_t numLinks;               // Number of bidirectional ISL links
+    std::vector<uint32_t> offsets;   // CSR row offsets (numSatellites + 1 entries)
+    std::vector<uint32_t> adjacency; // CSR neighbor satIds (2 × numLinks entries)
+    std::vector<double> linkDelay;   // CSR-parallel propagation delay (s), empty until assigned
+    std::vector<uint8_t> linkUp;     // CSR-parallel link state (1 = up), empty = all links up
 
     IslTopology() : numSatellites(0), numLinks(0) {}
+
+    /**
+     * Neighbors of one satellite (empty for an out-of-range id).
+     */
+    std::span<const uint32_t> Neighbors(uint32_t sat) const {
+        if (sat >= numSatellites) {
+            return {};
+        }
+        return std::span<const uint32_t>(adjacency.data() + offsets[sat], offsets[sat + 1] - offsets[sat]);
+    }
+
+    /**
+     * Propagation delays (s) of one satellite's links, parallel to Neighbors(sat).
+     */
+    std::span<const double> NeighborDelays(uint32_t sat) const {
+        if (sat >= numSatellites || linkDelay.empty()) {
+            return {};
+        }
+        return std::span<const double>(linkDelay.data() + offsets[sat], offsets[sat + 1] - offsets[sat]);
+    }
+
+    /**
+     * Check whether CSR edge e (index into adjacency) is up.
+     */
+    bool IsLinkUp(uint32_t e) const {
+        return linkUp.empty() || linkUp[e] != 0;
+    }
 };
 
 /**
- * Generate ISL topology for Walker-Delta 53:24/3/1 constellation
+ * Generate the "+Grid" ISL topology of a Walker constellation
+ *
+ * Algorithm (single pass, written directly into the CSR arrays):
+ * 1. Intra-plane neighbors (2): Next and previous satellite in the same plane (ring)
+ * 2. Inter-plane neighbors (2): Same slot in the next and previous plane. Across
+ *    the Walker-Delta wrap-around (last plane → first plane) the slot is shifted
+ *    by F, the satellite at the same anomaly; Walker-Star has no seam links.
  *
- * Algorithm:
- * 1. Intra-plane neighbors (2): Previous and next satellite in same orbital plane (ring topology)
- * 2. Inter-plane neighbors (2): Satellites in adjacent planes (fixed index or distance-based)
+ * Duplicate neighbors of degenerate shapes (2 satellites per plane, 2 planes,
+ * 1 plane) are dropped, so every link appears exactly once per endpoint.
  *
- * @param numSatellites Total number of satellites (24 for Walker-Delta 53:24/3/1)
+ * @param walker Constellation parameters (T/P/F)
+ * @param neighborsPerSat 4 ("+Grid") or 2 (intra-plane rings only)
+ * @return ISL topology, or an empty topology for invalid parameters
+ *
+ * Complexity: O(T)
+ * Memory: O(T × neighborsPerSat)
+ */
+IslTopology GenerateWalkerTopology(const WalkerConstellation& walker, uint32_t neighborsPerSat = 4);
+
+/**
+ * Generate ISL topology for a 3-plane Walker-Delta constellation (53:T/3/0)
+ *
+ * Shorthand for GenerateWalkerTopology with the default parameters and
+ * numSatellites total satellites.
+ *
+ * @param numSatellites Total number of satellites (24 for Walker-Delta 53:24/3/0)
  * @param neighborsPerSat Number of ISL neighbors per satellite (4 recommended)
  * @return ISL topology structure with neighbor relationships
- *
- * Complexity: O(V) where V = numSatellites
- * Memory: O(V × neighborsPerSat)
  */
 IslTopology GenerateWalkerDeltaTopology(uint32_t numSatellites, uint32_t neighborsPerSat);
 
+/**
+ * Assign per-link propagation delays from satellite positions
+ *
+ * One flat pass over the CSR edge array: delay = |pos(neighbor) - pos(sat)| / c,
+ * with positions given as separate x/y/z arrays (meters, indexed by satId).
+ * Uses the same arithmetic as IslNetworkCreator::ComputeSatelliteDistance and
+ * ComputePropagationDelay, so channel delays and routing weights agree exactly.
+ *
+ * @param topology ISL topology (linkDelay is overwritten)
+ * @param x, y, z Satellite positions (numSatellites entries each)
+ */
+void AssignLinkDelays(IslTopology& topology, const std::vector<double>& x,
+                      const std::vector<double>& y, const std::vector<double>& z);
+
 /**
  * Compute mesh connectivity (percentage of satellite pairs that can reach each other)
  *
@@ -79,6 +173,15 @@ std::vector<bool> BFS(const IslTopology& topology, uint32_t src);
  */
 std::vector<uint32_t> Dijkstra(const IslTopology& topology, uint32_t src);
 
+/**
+ * Delay-weighted Dijkstra from source satellite (binary heap)
+ *
+ * @param topology ISL topology with link delays (AssignLinkDelays); down links are skipped
+ * @param src Source satellite ID
+ * @return Vector of end-to-end propagation delays (s), infinity if unreachable
+ */
+std::vector<double> DijkstraDelay(const IslTopology& topology, uint32_t src);
+
 } // namespace ns3
 
 #endif // ISL_TOPOLOGY_GENERATOR_H
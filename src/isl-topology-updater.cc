@@ -0,0 +1,362 @@
+/**
+ * ISL Topology Updater Implementation
+ *
+ * Per epoch: positions → link delays/states (one pass over the links) →
+ * changed channel delays and error models → affected route rows only.
+ */
+
+#include "isl-topology-updater.h"
+#include "ns3/core-module.h"
+#include "ns3/network-module.h"
+#include "ns3/internet-module.h"
+#include "ns3/mobility-model.h"
+#include "ns3/ipv4-static-routing-helper.h"
+#include "ns3/ipv4-static-routing.h"
+#include "ns3/log.h"
+#include <cmath>
+#include <limits>
+#include <unordered_set>
+
+namespace ns3 {
+
+NS_LOG_COMPONENT_DEFINE("IslTopologyUpdater");
+
+NS_OBJECT_ENSURE_REGISTERED(IslLinkDownErrorModel);
+
+TypeId IslLinkDownErrorModel::GetTypeId() {
+    static TypeId tid = TypeId("ns3::IslLinkDownErrorModel")
+        .SetParent<ErrorModel>()
+        .SetGroupName("Network")
+        .AddConstructor<IslLinkDownErrorModel>();
+    return tid;
+}
+
+IslTopologyUpdater::IslTopologyUpdater(const WalkerConstellation& walker, NodeContainer satellites,
+                                       IslTopology& topology, NetDeviceContainer islDevices)
+    : m_walker(walker),
+      m_satellites(satellites),
+      m_topology(topology),
+      m_islDevices(islDevices),
+      m_polarCutoffDeg(70.0),
+      m_j2(false),
+      m_epoch(Seconds(1.0)),
+      m_repairRoutes(false),
+      m_metric(RouteMetric::HOPS),
+      m_updates(0),
+      m_delayChanges(0),
+      m_linkStateChanges(0),
+      m_repairedSources(0),
+      m_routeChanges(0) {
+    NS_ASSERT_MSG(islDevices.GetN() == 2 * topology.numLinks,
+        "ISL device count mismatch: " << islDevices.GetN() << " vs " << 2 * topology.numLinks);
+
+    // Number links in CreateIslMesh order (CSR order of sat < neighbor edges)
+    m_edgeLink.assign(topology.adjacency.size(), 0);
+    m_reverseEdge.assign(topology.adjacency.size(), 0);
+    uint32_t link = 0;
+    for (uint32_t sat = 0; sat < topology.numSatellites; ++sat) {
+        for (uint32_t e = topology.offsets[sat]; e < topology.offsets[sat + 1]; ++e) {
+            uint32_t neighbor = topology.adjacency[e];
+            if (sat < neighbor) {
+                m_edgeLink[e] = link++;
+                continue;
+            }
+            // neighbor < sat: its row is already numbered
+            for (uint32_t r = topology.offsets[neighbor]; r < topology.offsets[neighbor + 1]; ++r) {
+                if (topology.adjacency[r] == sat) {
+                    m_edgeLink[e] = m_edgeLink[r];
+                    m_reverseEdge[e] = r;
+                    m_reverseEdge[r] = e;
+                    break;
+                }
+            }
+        }
+    }
+
+    m_channelDelayNs.assign(topology.numLinks, 0);
+    m_downModels.resize(islDevices.GetN());
+}
+
+void IslTopologyUpdater::SetPolarCutoff(double latitudeDeg) {
+    m_polarCutoffDeg = latitudeDeg;
+}
+
+void IslTopologyUpdater::SetJ2(bool j2) {
+    m_j2 = j2;
+}
+
+void IslTopologyUpdater::SetEphemeris(std::shared_ptr<const OrbitalEphemeris> ephemeris) {
+    NS_ASSERT_MSG(!ephemeris || ephemeris->GetNumSatellites() == m_topology.numSatellites,
+        "Ephemeris satellite count mismatch: " << ephemeris->GetNumSatellites());
+    m_ephemeris = ephemeris;
+}
+
+void IslTopologyUpdater::Initialize() {
+    NS_LOG_FUNCTION(this);
+
+    // Current channel delays (as set by CreateIslMesh)
+    for (uint32_t link = 0; link < m_topology.numLinks; ++link) {
+        TimeValue delay;
+        m_islDevices.Get(2 * link)->GetChannel()->GetAttribute("Delay", delay);
+        m_channelDelayNs[link] = delay.Get().GetNanoSeconds();
+    }
+    ApplyEpoch();
+
+    NS_LOG_INFO("Initial ISL state: " << m_linkStateChanges << " links down (polar cutoff "
+        << m_polarCutoffDeg << "°)");
+
+    // Statistics count changes after t=0 only
+    m_delayChanges = 0;
+    m_linkStateChanges = 0;
+}
+
+void IslTopologyUpdater::EnableRouteRepair(RouteMetric metric, const Ipv4InterfaceContainer& islInterfaces) {
+    NS_LOG_FUNCTION(this);
+    const uint32_t numSatellites = m_topology.numSatellites;
+
+    // Host route destination: first non-loopback address (as InstallStaticRoutes)
+    m_satAddress.assign(numSatellites, Ipv4Address());
+    for (uint32_t sat = 0; sat < numSatellites; ++sat) {
+        Ptr<Ipv4> ipv4 = m_satellites.Get(sat)->GetObject<Ipv4>();
+        if (ipv4->GetNInterfaces() > 1) {
+            m_satAddress[sat] = ipv4->GetAddress(1, 0).GetLocal();
+        }
+    }
+
+    // Local interface and gateway of every edge (interfaces 2l / 2l + 1 are link l's devices)
+    m_edgeInterface.assign(m_topology.adjacency.size(), 0);
+    m_edgeGateway.assign(m_topology.adjacency.size(), Ipv4Address());
+    for (uint32_t sat = 0; sat < numSatellites; ++sat) {
+        for (uint32_t e = m_topology.offsets[sat]; e < m_topology.offsets[sat + 1]; ++e) {
+            uint32_t link = m_edgeLink[e];
+            uint32_t self = (sat < m_topology.adjacency[e]) ? 2 * link : 2 * link + 1;
+            uint32_t other = (self == 2 * link) ? 2 * link + 1 : 2 * link;
+            m_edgeInterface[e] = islInterfaces.Get(self).second;
+            m_edgeGateway[e] = islInterfaces.GetAddress(other);
+        }
+    }
+
+    // Full computation once, with the distance and predecessor matrices needed for repair
+    m_metric = metric;
+    m_repairRoutes = true;
+    std::vector<uint32_t> sources(numSatellites);
+    for (uint32_t src = 0; src < numSatellites; ++src) {
+        sources[src] = src;
+    }
+    RecomputeRoutes(m_topology, m_metric, sources, m_routes, &m_distances, &m_parents);
+}
+
+void IslTopologyUpdater::Start(Time epoch) {
+    NS_LOG_FUNCTION(this << epoch);
+    m_epoch = epoch;
+    Simulator::Schedule(m_epoch, &IslTopologyUpdater::Update, this);
+}
+
+void IslTopologyUpdater::Update() {
+    NS_LOG_FUNCTION(this);
+    uint64_t delayChanges = m_delayChanges;
+    uint64_t linkStateChanges = m_linkStateChanges;
+    uint64_t repairedSources = m_repairedSources;
+
+    std::vector<LinkCostChange> changes = ApplyEpoch();
+    if (m_repairRoutes && !changes.empty()) {
+        RepairRoutes(changes);
+    }
+    ++m_updates;
+
+    NS_LOG_INFO("t=" << Simulator::Now().GetSeconds() << "s: "
+        << (m_delayChanges - delayChanges) << " delay changes, "
+        << (m_linkStateChanges - linkStateChanges) << " link up/down, "
+        << (m_repairedSources - repairedSources) << " sources repaired");
+
+    Simulator::Schedule(m_epoch, &IslTopologyUpdater::Update, this);
+}
+
+std::vector<LinkCostChange> IslTopologyUpdater::ApplyEpoch() {
+    const uint32_t numSatellites = m_topology.numSatellites;
+    const uint32_t satsPerPlane = m_walker.SatsPerPlane();
+
+    // Routing costs before the update (only needed for repair)
+    std::vector<double> oldCost;
+    if (m_repairRoutes) {
+        oldCost.resize(m_topology.adjacency.size());
+        for (uint32_t e = 0; e < oldCost.size(); ++e) {
+            oldCost[e] = EdgeCost(e);
+        }
+    }
+
+    // Step 1: Satellite positions at the current time
+    const double now = Simulator::Now().GetSeconds();
+    if (m_ephemeris) {
+        // EphemerisMobilityModel follows the same table on its own
+        double position[3];
+        m_x.resize(numSatellites);
+        m_y.resize(numSatellites);
+        m_z.resize(numSatellites);
+        for (uint32_t sat = 0; sat < numSatellites; ++sat) {
+            m_ephemeris->GetState(sat, now, position, nullptr);
+            m_x[sat] = position[0];
+            m_y[sat] = position[1];
+            m_z[sat] = position[2];
+        }
+    } else {
+        ComputeWalkerPositions(m_walker, now, m_x, m_y, m_z, m_j2);
+        for (uint32_t sat = 0; sat < numSatellites; ++sat) {
+            Ptr<MobilityModel> mobility = m_satellites.Get(sat)->GetObject<MobilityModel>();
+            mobility->SetPosition(Vector(m_x[sat], m_y[sat], m_z[sat]));
+        }
+    }
+
+    // Step 2: Link delays and polar link states (|latitude| > cutoff ⇔ |z| > r·sin(cutoff))
+    AssignLinkDelays(m_topology, m_x, m_y, m_z);
+    if (m_topology.linkUp.empty()) {
+        m_topology.linkUp.assign(m_topology.adjacency.size(), 1);
+    }
+    const double sinCutoff = std::sin(m_polarCutoffDeg * M_PI / 180.0);
+    std::vector<uint8_t> polar(numSatellites);
+    for (uint32_t sat = 0; sat < numSatellites; ++sat) {
+        double radius = std::sqrt(m_x[sat] * m_x[sat] + m_y[sat] * m_y[sat] + m_z[sat] * m_z[sat]);
+        polar[sat] = std::fabs(m_z[sat]) > sinCutoff * radius;
+    }
+
+    // Step 3: Write changed link states and channel delays (once per link)
+    std::vector<LinkCostChange> changes;
+    for (uint32_t sat = 0; sat < numSatellites; ++sat) {
+        for (uint32_t e = m_topology.offsets[sat]; e < m_topology.offsets[sat + 1]; ++e) {
+            uint32_t neighbor = m_topology.adjacency[e];
+            if (sat >= neighbor) continue;
+            uint32_t link = m_edgeLink[e];
+
+            // Intra-plane links are always up
+            bool interPlane = (sat / satsPerPlane) != (neighbor / satsPerPlane);
+            bool up = !interPlane || (!polar[sat] && !polar[neighbor]);
+            if (up != m_topology.IsLinkUp(e)) {
+                m_topology.linkUp[e] = up;
+                m_topology.linkUp[m_reverseEdge[e]] = up;
+                SetLinkUp(link, up);
+                ++m_linkStateChanges;
+            }
+
+            Time delay = Seconds(m_topology.linkDelay[e]);
+            if (delay.GetNanoSeconds() != m_channelDelayNs[link]) {
+                m_islDevices.Get(2 * link)->GetChannel()->SetAttribute("Delay", TimeValue(delay));
+                m_channelDelayNs[link] = delay.GetNanoSeconds();
+                ++m_delayChanges;
+            }
+
+            if (m_repairRoutes) {
+                double newCost = EdgeCost(e);
+                if (newCost != oldCost[e]) {
+                    changes.push_back({sat, neighbor, oldCost[e], newCost});
+                }
+            }
+        }
+    }
+    return changes;
+}
+
+void IslTopologyUpdater::SetLinkUp(uint32_t link, bool up) {
+    for (uint32_t device = 2 * link; device <= 2 * link + 1; ++device) {
+        Ptr<ErrorModel>& model = m_downModels[device];
+        if (!model) {
+            if (up) continue;  // Never been down
+            model = CreateObject<IslLinkDownErrorModel>();
+            m_islDevices.Get(device)->SetAttribute("ReceiveErrorModel", PointerValue(model));
+        }
+        if (up) {
+            model->Disable();
+        } else {
+            model->Enable();
+        }
+    }
+}
+
+double IslTopologyUpdater::EdgeCost(uint32_t e) const {
+    if (!m_topology.IsLinkUp(e)) {
+        return std::numeric_limits<double>::infinity();
+    }
+    return (m_metric == RouteMetric::DELAY) ? m_topology.linkDelay[e] : 1.0;
+}
+
+void IslTopologyUpdater::RepairRoutes(const std::vector<LinkCostChange>& changes) {
+    const uint32_t numSatellites = m_topology.numSatellites;
+    std::vector<uint32_t> affected = FindAffectedSources(m_distances, m_parents, numSatellites, changes);
+    if (affected.empty()) {
+        return;
+    }
+
+    // Keep the old rows to rewrite only the next hops that changed
+    std::vector<uint32_t> oldHops(affected.size() * static_cast<size_t>(numSatellites));
+    for (size_t i = 0; i < affected.size(); ++i) {
+        for (uint32_t dst = 0; dst < numSatellites; ++dst) {
+            oldHops[i * numSatellites + dst] = m_routes.GetNextHop(affected[i], dst);
+        }
+    }
+
+    RecomputeRoutes(m_topology, m_metric, affected, m_routes, &m_distances, &m_parents);
+    m_repairedSources += affected.size();
+
+    std::vector<uint32_t> changedDsts;
+    for (size_t i = 0; i < affected.size(); ++i) {
+        changedDsts.clear();
+        for (uint32_t dst = 0; dst < numSatellites; ++dst) {
+            if (m_routes.GetNextHop(affected[i], dst) != oldHops[i * numSatellites + dst]) {
+                changedDsts.push_back(dst);
+            }
+        }
+        if (!changedDsts.empty()) {
+            RewriteHostRoutes(affected[i], changedDsts);
+            m_routeChanges += changedDsts.size();
+        }
+    }
+}
+
+void IslTopologyUpdater::RewriteHostRoutes(uint32_t src, const std::vector<uint32_t>& dsts) {
+    Ptr<Ipv4> ipv4 = m_satellites.Get(src)->GetObject<Ipv4>();
+    Ipv4StaticRoutingHelper staticRoutingHelper;
+    Ptr<Ipv4StaticRouting> staticRouting = staticRoutingHelper.GetStaticRouting(ipv4);
+
+    std::unordered_set<uint32_t> dstAddresses;
+    for (uint32_t dst : dsts) {
+        dstAddresses.insert(m_satAddress[dst].Get());
+    }
+
+    // One pass over the table: GetRoute/RemoveRoute walk a list, so take
+    // entries from the front (O(1) each) and put back all but the old host
+    // routes, in their original order
+    std::vector<std::pair<Ipv4RoutingTableEntry, uint32_t>> kept;
+    kept.reserve(staticRouting->GetNRoutes());
+    while (staticRouting->GetNRoutes() > 0) {
+        Ipv4RoutingTableEntry entry = staticRouting->GetRoute(0);
+        uint32_t metric = staticRouting->GetMetric(0);
+        staticRouting->RemoveRoute(0);
+        if (!(entry.IsHost() && entry.IsGateway() && dstAddresses.count(entry.GetDest().Get()))) {
+            kept.emplace_back(entry, metric);
+        }
+    }
+    for (const auto& [entry, metric] : kept) {
+        if (entry.IsGateway()) {
+            staticRouting->AddNetworkRouteTo(entry.GetDestNetwork(), entry.GetDestNetworkMask(),
+                                             entry.GetGateway(), entry.GetInterface(), metric);
+        } else {
+            staticRouting->AddNetworkRouteTo(entry.GetDestNetwork(), entry.GetDestNetworkMask(),
+                                             entry.GetInterface(), metric);
+        }
+    }
+
+    // Add the new host routes (unreachable destinations get no route)
+    for (uint32_t dst : dsts) {
+        uint32_t nextHop = m_routes.GetNextHop(src, dst);
+        if (nextHop == UINT32_MAX) {
+            continue;
+        }
+        for (uint32_t e = m_topology.offsets[src]; e < m_topology.offsets[src + 1]; ++e) {
+            if (m_topology.adjacency[e] == nextHop) {
+                staticRouting->AddHostRouteTo(m_satAddress[dst], m_edgeGateway[e], m_edgeInterface[e]);
+                break;
+            }
+        }
+    }
+}
+
+} // namespace ns3
@@ -0,0 +1,219 @@
+/**
+ * ISL Topology Updater
+ *
+ * Purpose: Time-varying ISL topology (--topology-epoch)
+ * Without it, satellites keep their t=0 positions and the ISL graph, its
+ * delays and the static routes are computed once. Every epoch the updater:
+ * 1. Recomputes satellite positions (circular Walker orbits,
+ *    ComputeWalkerPositions) and moves the satellites' mobility models,
+ *    or reads them from a shared ephemeris (SetEphemeris) whose
+ *    EphemerisMobilityModel already follows the orbit
+ * 2. Recomputes link states and delays: inter-plane links are down while
+ *    either endpoint is above the polar cutoff latitude (intra-plane links
+ *    are always up)
+ * 3. Writes only what changed to the simulation: PointToPointChannel
+ *    delays (at ns resolution) and up/down state, the latter through a
+ *    drop-all receive error model on both devices of the link
+ * 4. Repairs static routes incrementally (EnableRouteRepair): only the
+ *    sources whose shortest-path tree uses a link that got more expensive,
+ *    or that a cheaper link newly improves, are recomputed
+ *    (FindAffectedSources + RecomputeRoutes), and only their changed next
+ *    hops are rewritten in the Ipv4StaticRouting tables
+ *
+ * Dynamic ISL protocols (OLSR/AODV) see the link changes and reroute on
+ * their own; EnableRouteRepair is only for static routes.
+ *
+ * Usage:
+ *   IslTopologyUpdater updater(walker, satellites, topology, islDevices);
+ *   updater.SetPolarCutoff(70.0);
+ *   updater.Initialize();                                   // Link states at t=0
+ *   updater.EnableRouteRepair(RouteMetric::HOPS, islInterfaces);
+ *   creator.InstallStaticRoutes(satellites, updater.GetRoutes(), islInterfaces);
+ *   updater.Start(Seconds(1.0));
+ */
+
+#ifndef ISL_TOPOLOGY_UPDATER_H
+#define ISL_TOPOLOGY_UPDATER_H
+
+#include "ns3/node-container.h"
+#include "ns3/net-device-container.h"
+#include "ns3/ipv4-interface-container.h"
+#include "ns3/error-model.h"
+#include "ns3/nstime.h"
+#include "isl-topology-generator.h"
+#include "static-isl-routing.h"
+#include "orbital-ephemeris.h"
+#include <memory>
+#include <vector>
+
+namespace ns3 {
+
+/**
+ * Receive error model that drops every packet while enabled (ISL down).
+ */
+class IslLinkDownErrorModel : public ErrorModel {
+public:
+    static TypeId GetTypeId();
+
+private:
+    bool DoCorrupt(Ptr<Packet> p) override { return true; }
+    void DoReset() override {}
+};
+
+/**
+ * Scheduled position, link-state and route updates for the ISL mesh.
+ */
+class IslTopologyUpdater {
+public:
+    /**
+     * Constructor.
+     *
+     * @param walker Constellation parameters (positions are propagated from t=0)
+     * @param satellites Satellite nodes (ConstantPositionMobilityModel, or
+     *        EphemerisMobilityModel with SetEphemeris)
+     * @param topology ISL topology; linkDelay and linkUp are kept current
+     * @param islDevices ISL devices (from IslNetworkCreator::CreateIslMesh)
+     */
+    IslTopologyUpdater(const WalkerConstellation& walker, NodeContainer satellites,
+                       IslTopology& topology, NetDeviceContainer islDevices);
+
+    /**
+     * Set the polar cutoff latitude for inter-plane links (default 70°).
+     */
+    void SetPolarCutoff(double latitudeDeg);
+
+    /**
+     * Include J2 secular perturbations in the propagated positions (default off).
+     */
+    void SetJ2(bool j2);
+
+    /**
+     * Read positions from an ephemeris instead of propagating them
+     * (satellites use EphemerisMobilityModel on the same ephemeris).
+     */
+    void SetEphemeris(std::shared_ptr<const OrbitalEphemeris> ephemeris);
+
+    /**
+     * Apply positions, link delays and link states at the current time
+     * (call once after the ISL mesh is created, before route computation).
+     */
+    void Initialize();
+
+    /**
+     * Compute the static routes under the current link states and repair
+     * them incrementally on every update.
+     *
+     * Routes must be installed from GetRoutes() by the caller
+     * (IslNetworkCreator::InstallStaticRoutes).
+     *
+     * @param metric Path metric (HOPS for static, DELAY for static-delay)
+     * @param islInterfaces ISL interfaces (from AssignIslAddresses)
+     */
+    void EnableRouteRepair(RouteMetric metric, const Ipv4InterfaceContainer& islInterfaces);
+
+    /**
+     * Get the current static routes (valid after EnableRouteRepair).
+     */
+    const RoutingTables& GetRoutes() const { return m_routes; }
+
+    /**
+     * Schedule an update every epoch, starting one epoch from now.
+     */
+    void Start(Time epoch);
+
+    /**
+     * Recompute the topology now and apply the changes.
+     */
+    void Update();
+
+    /**
+     * Get number of updates applied.
+     */
+    uint64_t GetNUpdates() const { return m_updates; }
+
+    /**
+     * Get number of channel delay changes written.
+     */
+    uint64_t GetNDelayChanges() const { return m_delayChanges; }
+
+    /**
+     * Get number of link up/down transitions.
+     */
+    uint64_t GetNLinkStateChanges() const { return m_linkStateChanges; }
+
+    /**
+     * Get number of source rows recomputed by route repair.
+     */
+    uint64_t GetNRepairedSources() const { return m_repairedSources; }
+
+    /**
+     * Get number of (src, dst) next hops rewritten by route repair.
+     */
+    uint64_t GetNRouteChanges() const { return m_routeChanges; }
+
+private:
+    /**
+     * Recompute positions, delays and link states; write changed channel
+     * delays and link states.
+     *
+     * @return Changed link costs under the route repair metric
+     */
+    std::vector<LinkCostChange> ApplyEpoch();
+
+    /**
+     * Take one link up or down (both devices).
+     */
+    void SetLinkUp(uint32_t link, bool up);
+
+    /**
+     * Recompute affected sources and rewrite their changed host routes.
+     */
+    void RepairRoutes(const std::vector<LinkCostChange>& changes);
+
+    /**
+     * Replace src's host routes to the given destinations with the current next hops.
+     */
+    void RewriteHostRoutes(uint32_t src, const std::vector<uint32_t>& dsts);
+
+    /**
+     * Routing cost of CSR edge e under the repair metric (infinity if down).
+     */
+    double EdgeCost(uint32_t e) const;
+
+    WalkerConstellation m_walker;
+    NodeContainer m_satellites;
+    IslTopology& m_topology;
+    NetDeviceContainer m_islDevices;
+    double m_polarCutoffDeg;
+    bool m_j2;
+    std::shared_ptr<const OrbitalEphemeris> m_ephemeris;  // Position source if set
+    Time m_epoch;
+
+    // Link l is devices 2l (lower satellite id) and 2l + 1 (CreateIslMesh order)
+    std::vector<uint32_t> m_edgeLink;           // CSR edge → link index
+    std::vector<uint32_t> m_reverseEdge;        // CSR edge → same link in the neighbor's row
+    std::vector<int64_t> m_channelDelayNs;      // Current channel delay per link
+    std::vector<Ptr<ErrorModel>> m_downModels;  // Per device, created on first link-down
+    std::vector<double> m_x, m_y, m_z;          // Satellite positions (m)
+
+    // Route repair
+    bool m_repairRoutes;
+    RouteMetric m_metric;
+    RoutingTables m_routes;
+    std::vector<double> m_distances;            // V×V path costs of m_routes
+    std::vector<uint32_t> m_parents;            // V×V tree predecessors of m_routes
+    std::vector<Ipv4Address> m_satAddress;      // Host route destination per satellite
+    std::vector<uint32_t> m_edgeInterface;      // CSR edge → local interface on its owner
+    std::vector<Ipv4Address> m_edgeGateway;     // CSR edge → neighbor's address on the link
+
+    // Statistics
+    uint64_t m_updates;
+    uint64_t m_delayChanges;
+    uint64_t m_linkStateChanges;
+    uint64_t m_repairedSources;
+    uint64_t m_routeChanges;
+};
+
+} // namespace ns3
+
+#endif // ISL_TOPOLOGY_UPDATER_H
@@ -8,6 +8,9 @@
 
 namespace ns3 {
 
+// UDP port of OLSR routing sockets (RFC 3626; not exported by ns-3's olsr module)
+static const uint16_t OLSR_PORT = 698;
+
 OlsrRoutingProtocol::OlsrRoutingProtocol()
     : m_helloInterval(2.0),
       m_tcInterval(5.0),
@@ -28,6 +31,7 @@ void OlsrRoutingProtocol::Install(NodeContainer islNodes, NodeContainer groundNo
         InternetStackHelper internet;
         internet.SetRoutingHelper(m_olsrHelper);
         internet.Install(islNodes);
+        TraceControlPort(islNodes, OLSR_PORT);
     }
 
     // Install internet stack with OLSR routing on ground nodes
@@ -35,13 +39,13 @@ void OlsrRoutingProtocol::Install(NodeContainer islNodes, NodeContainer groundNo
         InternetStackHelper internet;
         internet.SetRoutingHelper(m_olsrHelper);
         internet.Install(groundNodes);
+        TraceControlPort(groundNodes, OLSR_PORT);
     }
 }
 
 uint64_t OlsrRoutingProtocol::GetControlBytes() const {
-    // TODO: Will track control bytes in Day 3
-    // For now, return 0
-    return 0;
+    // Counted by TraceControlPort() hooks connected in Install()
+    return m_controlBytes;
 }
 
 void OlsrRoutingProtocol::SetParameter(std::string key, std::string value) {
@@ -62,4 +66,8 @@ std::string OlsrRoutingProtocol::GetConfig() const {
     return oss.str();
 }
 
+int64_t OlsrRoutingProtocol::AssignStreams(NodeContainer nodes, int64_t stream) {
+    return m_olsrHelper.AssignStreams(nodes, stream);
+}
+
 } // namespace ns3
@@ -37,6 +37,7 @@ public:
     uint64_t GetControlBytes() const override;
     void SetParameter(std::string key, std::string value) override;
     std::string GetConfig() const override;
+    int64_t AssignStreams(NodeContainer nodes, int64_t stream) override;
 
 private:
     OlsrHelper m_olsrHelper;
@@ -0,0 +1,313 @@
+/**
+ * Orbital Ephemeris Implementation
+ *
+ * J2 secular rates for a circular orbit of radius a (e = 0, p = a):
+ *   dΩ/dt = -3/2 n J2 (Re/a)² cos i
+ *   du/dt = n [1 + 3/4 J2 (Re/a)² (8 cos² i - 2)]   (dω/dt + dM/dt)
+ */
+
+#include "orbital-ephemeris.h"
+#include <algorithm>
+#include <cerrno>
+#include <cmath>
+#include <cstdio>
+#include <cstring>
+#include <iomanip>
+#include <sstream>
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
+namespace ns3 {
+
+// File header: magic, format version
+static const char EPHEMERIS_MAGIC[8] = {'O', 'R', 'B', 'E', 'P', 'H', 'M', '1'};
+static const uint32_t EPHEMERIS_VERSION = 1;
+static const uint32_t EPHEMERIS_FLAG_J2 = 1;
+static const uint32_t EPHEMERIS_FLAG_STAR = 2;
+
+// Doubles per sample: position (m) + velocity (m/s)
+static const uint32_t SAMPLE_DOUBLES = 6;
+
+/**
+ * Orbit geometry and angular rates shared by all satellites of a constellation.
+ */
+struct WalkerOrbit {
+    uint32_t satsPerPlane;
+    double orbitRadius;   // m
+    double inclination;   // rad
+    double raanSpread;    // degrees covered by the plane RAANs
+    double raanRate;      // dΩ/dt (rad/s)
+    double latitudeRate;  // du/dt (rad/s)
+};
+
+static WalkerOrbit MakeWalkerOrbit(const WalkerConstellation& walker, bool j2) {
+    const double EARTH_RADIUS = 6371000.0;      // meters (mean radius, altitude reference)
+    const double EARTH_MU = 3.986004418e14;     // Gravitational parameter (m³/s²)
+    const double J2 = 1.08262668e-3;            // Earth oblateness coefficient
+    const double J2_RADIUS = 6378137.0;         // Equatorial radius of the J2 model (m)
+
+    WalkerOrbit orbit;
+    orbit.satsPerPlane = walker.SatsPerPlane();
+    orbit.orbitRadius = EARTH_RADIUS + walker.altitudeKm * 1000.0;
+    orbit.inclination = walker.inclinationDeg * M_PI / 180.0;
+    orbit.raanSpread = walker.star ? 180.0 : 360.0;  // Star: planes over a half circle
+
+    const double a = orbit.orbitRadius;
+    const double meanMotion = std::sqrt(EARTH_MU / (a * a * a));
+    orbit.raanRate = 0.0;
+    orbit.latitudeRate = meanMotion;
+    if (j2) {
+        const double k = J2 * (J2_RADIUS / a) * (J2_RADIUS / a);
+        const double cosI = std::cos(orbit.inclination);
+        orbit.raanRate = -1.5 * meanMotion * k * cosI;
+        orbit.latitudeRate = meanMotion * (1.0 + 0.75 * k * (8.0 * cosI * cosI - 2.0));
+    }
+    return orbit;
+}
+
+/**
+ * Position (and optionally velocity) of satellite i at time t.
+ */
+static void ComputeWalkerState(const WalkerConstellation& walker, const WalkerOrbit& orbit, uint32_t i,
+                               double timeS, double position[3], double velocity[3]) {
+    uint32_t plane = i / orbit.satsPerPlane;
+    uint32_t idx = i % orbit.satsPerPlane;
+
+    // Right Ascension of Ascending Node (RAAN)
+    double raan = plane * (orbit.raanSpread / walker.planes) * M_PI / 180.0 + orbit.raanRate * timeS;
+
+    // Argument of latitude (phasing: plane p is shifted by p × F × 360°/T)
+    double anomaly = (idx * (360.0 / orbit.satsPerPlane) +
+        plane * walker.phasing * (360.0 / walker.totalSatellites)) * M_PI / 180.0 + orbit.latitudeRate * timeS;
+
+    const double r = orbit.orbitRadius;
+    const double cosRaan = std::cos(raan), sinRaan = std::sin(raan);
+    const double cosU = std::cos(anomaly), sinU = std::sin(anomaly);
+    const double cosI = std::cos(orbit.inclination), sinI = std::sin(orbit.inclination);
+
+    position[0] = r * (cosRaan * cosU - sinRaan * sinU * cosI);
+    position[1] = r * (sinRaan * cosU + cosRaan * sinU * cosI);
+    position[2] = r * sinU * sinI;
+
+    if (velocity) {
+        const double dRaan = orbit.raanRate;
+        const double dU = orbit.latitudeRate;
+        velocity[0] = r * ((-sinRaan * cosU - cosRaan * sinU * cosI) * dRaan +
+                           (-cosRaan * sinU - sinRaan * cosU * cosI) * dU);
+        velocity[1] = r * ((cosRaan * cosU - sinRaan * sinU * cosI) * dRaan +
+                           (-sinRaan * sinU + cosRaan * cosU * cosI) * dU);
+        velocity[2] = r * cosU * sinI * dU;
+    }
+}
+
+void ComputeWalkerPositions(const WalkerConstellation& walker, double timeS, std::vector<double>& x,
+                            std::vector<double>& y, std::vector<double>& z, bool j2) {
+    const WalkerOrbit orbit = MakeWalkerOrbit(walker, j2);
+    x.resize(walker.totalSatellites);
+    y.resize(walker.totalSatellites);
+    z.resize(walker.totalSatellites);
+    if (orbit.satsPerPlane == 0) {
+        return;
+    }
+
+    double position[3];
+    for (uint32_t i = 0; i < walker.totalSatellites; ++i) {
+        ComputeWalkerState(walker, orbit, i, timeS, position, nullptr);
+        x[i] = position[0];
+        y[i] = position[1];
+        z[i] = position[2];
+    }
+}
+
+uint32_t EphemerisParams::NumSamples() const {
+    uint32_t intervals = stepS > 0.0 ? static_cast<uint32_t>(std::ceil(durationS / stepS)) : 0;
+    return std::max(intervals, 1u) + 1;
+}
+
+/**
+ * Header a file generated with these parameters must have.
+ */
+static EphemerisFileHeader MakeHeader(const EphemerisParams& params) {
+    EphemerisFileHeader header;
+    std::memset(&header, 0, sizeof(header));
+    std::memcpy(header.magic, EPHEMERIS_MAGIC, sizeof(header.magic));
+    header.version = EPHEMERIS_VERSION;
+    header.numSatellites = params.walker.totalSatellites;
+    header.numSamples = params.NumSamples();
+    header.flags = (params.j2 ? EPHEMERIS_FLAG_J2 : 0) | (params.walker.star ? EPHEMERIS_FLAG_STAR : 0);
+    header.planes = params.walker.planes;
+    header.phasing = params.walker.phasing;
+    header.stepS = params.stepS;
+    header.inclinationDeg = params.walker.inclinationDeg;
+    header.altitudeKm = params.walker.altitudeKm;
+    return header;
+}
+
+std::string EphemerisFileName(const EphemerisParams& params) {
+    const WalkerConstellation& walker = params.walker;
+    std::ostringstream name;
+    name << std::setprecision(10) << "ephemeris_" << (walker.star ? "star_" : "delta_")
+         << walker.inclinationDeg << "-" << walker.totalSatellites << "-" << walker.planes << "-"
+         << walker.phasing << "_h" << walker.altitudeKm << (params.j2 ? "_j2" : "_kepler")
+         << "_dt" << params.stepS << "_n" << params.NumSamples() << ".bin";
+    return name.str();
+}
+
+OrbitalEphemeris::OrbitalEphemeris()
+    : m_map(nullptr),
+      m_mapSize(0),
+      m_samples(nullptr),
+      m_numSatellites(0),
+      m_numSamples(0),
+      m_stepS(0.0) {
+}
+
+OrbitalEphemeris::~OrbitalEphemeris() {
+    Close();
+}
+
+bool OrbitalEphemeris::Generate(const std::string& path, const EphemerisParams& params) {
+    const WalkerOrbit orbit = MakeWalkerOrbit(params.walker, params.j2);
+    const EphemerisFileHeader header = MakeHeader(params);
+    if (orbit.satsPerPlane == 0 || params.stepS <= 0.0) {
+        return false;
+    }
+
+    // Write next to the target and rename: readers see the old file or the complete new one
+    const std::string tmpPath = path + ".tmp." + std::to_string(getpid());
+    FILE* file = std::fopen(tmpPath.c_str(), "wb");
+    if (file == nullptr) {
+        return false;
+    }
+    bool ok = std::fwrite(&header, sizeof(header), 1, file) == 1;
+
+    // One satellite's track at a time (file order)
+    std::vector<double> track(static_cast<size_t>(header.numSamples) * SAMPLE_DOUBLES);
+    for (uint32_t sat = 0; ok && sat < header.numSatellites; ++sat) {
+        for (uint32_t k = 0; k < header.numSamples; ++k) {
+            double* sample = track.data() + static_cast<size_t>(k) * SAMPLE_DOUBLES;
+            ComputeWalkerState(params.walker, orbit, sat, k * params.stepS, sample, sample + 3);
+        }
+        ok = std::fwrite(track.data(), sizeof(double), track.size(), file) == track.size();
+    }
+
+    ok = (std::fclose(file) == 0) && ok;
+    if (!ok || std::rename(tmpPath.c_str(), path.c_str()) != 0) {
+        std::remove(tmpPath.c_str());
+        return false;
+    }
+    return true;
+}
+
+bool OrbitalEphemeris::Open(const std::string& path, const EphemerisParams& params) {
+    Close();
+
+    int fd = open(path.c_str(), O_RDONLY);
+    if (fd < 0) {
+        return false;
+    }
+    struct stat info;
+    if (fstat(fd, &info) != 0 || static_cast<size_t>(info.st_size) < sizeof(EphemerisFileHeader)) {
+        close(fd);
+        return false;
+    }
+    void* map = mmap(nullptr, info.st_size, PROT_READ, MAP_SHARED, fd, 0);
+    close(fd);  // The mapping stays valid
+    if (map == MAP_FAILED) {
+        return false;
+    }
+
+    // The header must match the requested parameters exactly (cache key collision or stale file)
+    const EphemerisFileHeader expected = MakeHeader(params);
+    const EphemerisFileHeader* header = static_cast<const EphemerisFileHeader*>(map);
+    size_t expectedSize = sizeof(EphemerisFileHeader) + static_cast<size_t>(expected.numSatellites) *
+        expected.numSamples * SAMPLE_DOUBLES * sizeof(double);
+    if (std::memcmp(header, &expected, sizeof(expected)) != 0 ||
+        static_cast<size_t>(info.st_size) != expectedSize) {
+        munmap(map, info.st_size);
+        return false;
+    }
+
+    m_map = map;
+    m_mapSize = info.st_size;
+    m_samples = reinterpret_cast<const double*>(static_cast<const char*>(map) + sizeof(EphemerisFileHeader));
+    m_numSatellites = header->numSatellites;
+    m_numSamples = header->numSamples;
+    m_stepS = header->stepS;
+    return true;
+}
+
+std::string OrbitalEphemeris::OpenOrGenerate(const std::string& directory, const EphemerisParams& params,
+                                             bool* generated) {
+    if (generated) *generated = false;
+    if (mkdir(directory.c_str(), 0755) != 0 && errno != EEXIST) {
+        return "";
+    }
+
+    std::string path = directory + "/" + EphemerisFileName(params);
+    if (Open(path, params)) {
+        return path;
+    }
+    if (!Generate(path, params) || !Open(path, params)) {
+        return "";
+    }
+    if (generated) *generated = true;
+    return path;
+}
+
+void OrbitalEphemeris::Close() {
+    if (m_map == nullptr) {
+        return;
+    }
+    munmap(m_map, m_mapSize);
+    m_map = nullptr;
+    m_mapSize = 0;
+    m_samples = nullptr;
+    m_numSatellites = 0;
+    m_numSamples = 0;
+}
+
+void OrbitalEphemeris::GetState(uint32_t sat, double timeS, double position[3], double velocity[3]) const {
+    const double* track = m_samples + static_cast<size_t>(sat) * m_numSamples * SAMPLE_DOUBLES;
+
+    // Clamp to the grid; exact grid times return the stored sample
+    double u = std::clamp(timeS / m_stepS, 0.0, static_cast<double>(m_numSamples - 1));
+    uint32_t k = static_cast<uint32_t>(u);
+    double s = u - k;
+    if (s == 0.0) {
+        const double* sample = track + static_cast<size_t>(k) * SAMPLE_DOUBLES;
+        std::copy(sample, sample + 3, position);
+        if (velocity) std::copy(sample + 3, sample + 6, velocity);
+        return;
+    }
+
+    // Cubic Hermite between samples k and k + 1
+    const double* p0 = track + static_cast<size_t>(k) * SAMPLE_DOUBLES;
+    const double* p1 = p0 + SAMPLE_DOUBLES;
+    const double* v0 = p0 + 3;
+    const double* v1 = p1 + 3;
+    const double h = m_stepS;
+    const double s2 = s * s;
+    const double s3 = s2 * s;
+    const double h00 = 2.0 * s3 - 3.0 * s2 + 1.0;
+    const double h10 = s3 - 2.0 * s2 + s;
+    const double h01 = -2.0 * s3 + 3.0 * s2;
+    const double h11 = s3 - s2;
+    for (int d = 0; d < 3; ++d) {
+        position[d] = h00 * p0[d] + h10 * h * v0[d] + h01 * p1[d] + h11 * h * v1[d];
+    }
+
+    if (velocity) {
+        const double d00 = 6.0 * s2 - 6.0 * s;
+        const double d10 = 3.0 * s2 - 4.0 * s + 1.0;
+        const double d01 = -6.0 * s2 + 6.0 * s;
+        const double d11 = 3.0 * s2 - 2.0 * s;
+        for (int d = 0; d < 3; ++d) {
+            velocity[d] = (d00 * p0[d] + d01 * p1[d]) / h + d10 * v0[d] + d11 * v1[d];
+        }
+    }
+}
+
+} // namespace ns3
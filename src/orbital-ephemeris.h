@@ -0,0 +1,188 @@
+/**
+ * Orbital Ephemeris - Walker orbit propagation and a shared ephemeris cache
+ *
+ * Propagator: circular Keplerian orbits with optional J2 secular
+ * perturbations (RAAN regression and argument-of-latitude drift), evaluated
+ * analytically at any time.
+ *
+ * Ephemeris cache: positions and velocities of every satellite on a fixed
+ * time grid covering the whole simulation, stored in a binary file whose
+ * name is derived from the constellation and grid parameters. The file is
+ * generated once and memory-mapped read-only by every later run (each seed
+ * and protocol of a sweep, forked children), so orbits are not recomputed
+ * per run. Positions between grid points are interpolated with cubic
+ * Hermite splines (position + velocity at both ends).
+ *
+ * File layout (little-endian, native x86_64/arm64 byte order):
+ *   Header (64 bytes): EphemerisFileHeader
+ *   Samples: double[numSatellites][numSamples][6] = x, y, z (m), vx, vy, vz (m/s)
+ *
+ * Usage:
+ *   EphemerisParams params;
+ *   params.walker = walker;
+ *   params.durationS = 60.0;
+ *   auto ephemeris = std::make_shared<OrbitalEphemeris>();
+ *   ephemeris->OpenOrGenerate("results/ephemeris", params);
+ *   ephemeris->GetState(sat, t, pos, vel);
+ */
+
+#ifndef ORBITAL_EPHEMERIS_H
+#define ORBITAL_EPHEMERIS_H
+
+#include "isl-topology-generator.h"
+#include <cstddef>
+#include <cstdint>
+#include <string>
+#include <vector>
+
+namespace ns3 {
+
+/**
+ * Compute satellite positions of a Walker constellation at time t
+ *
+ * Circular orbits in an Earth-centered inertial frame: satellite s of
+ * plane p has RAAN p × 360°/P (180°/P for Walker-Star) and argument of
+ * latitude slot × 360°/(T/P) + p × F × 360°/T at t=0, advancing at the
+ * mean motion n = sqrt(μ / r³) with r = Earth radius + altitude. With J2,
+ * the RAAN regresses and the argument of latitude drifts at the secular
+ * J2 rates.
+ *
+ * @param walker Constellation parameters
+ * @param timeS Time since epoch (s)
+ * @param x, y, z Output positions (meters, resized to T entries)
+ * @param j2 Include J2 secular perturbations
+ */
+void ComputeWalkerPositions(const WalkerConstellation& walker, double timeS, std::vector<double>& x,
+                            std::vector<double>& y, std::vector<double>& z, bool j2 = false);
+
+/**
+ * Parameters that identify one ephemeris (the cache key).
+ */
+struct EphemerisParams {
+    WalkerConstellation walker;
+    bool j2 = false;         // J2 secular perturbations
+    double stepS = 10.0;     // Grid step (s)
+    double durationS = 0.0;  // Covered time span [0, durationS] (s)
+
+    /**
+     * Number of grid samples (covers durationS, at least 2).
+     */
+    uint32_t NumSamples() const;
+};
+
+/**
+ * Ephemeris file header (64 bytes, no padding).
+ */
+struct EphemerisFileHeader {
+    char magic[8];           ///< "ORBEPHM1"
+    uint32_t version;        ///< Format version (1)
+    uint32_t numSatellites;  ///< T
+    uint32_t numSamples;     ///< Grid samples per satellite
+    uint32_t flags;          ///< Bit 0: J2, bit 1: Walker-Star
+    uint32_t planes;         ///< P
+    uint32_t phasing;        ///< F
+    double stepS;            ///< Grid step (s)
+    double inclinationDeg;   ///< Orbit inclination
+    double altitudeKm;       ///< Orbit altitude
+    uint64_t reserved;       ///< 0
+};
+
+static_assert(sizeof(EphemerisFileHeader) == 64, "EphemerisFileHeader must be 64 bytes");
+
+/**
+ * Cache file name for an ephemeris (constellation, J2, grid step and sample count).
+ */
+std::string EphemerisFileName(const EphemerisParams& params);
+
+/**
+ * Read-only, memory-mapped satellite ephemeris.
+ */
+class OrbitalEphemeris {
+public:
+    /**
+     * Constructor.
+     */
+    OrbitalEphemeris();
+
+    /**
+     * Destructor - unmaps the file.
+     */
+    ~OrbitalEphemeris();
+
+    OrbitalEphemeris(const OrbitalEphemeris&) = delete;
+    OrbitalEphemeris& operator=(const OrbitalEphemeris&) = delete;
+
+    /**
+     * Propagate all satellites over the grid and write an ephemeris file.
+     *
+     * The file is written under a temporary name and renamed into place,
+     * so concurrent runs never map a partial file.
+     *
+     * @return false if the file could not be written
+     */
+    static bool Generate(const std::string& path, const EphemerisParams& params);
+
+    /**
+     * Map an existing ephemeris file.
+     *
+     * @return false if the file is missing, truncated, or was generated
+     *         with different parameters
+     */
+    bool Open(const std::string& path, const EphemerisParams& params);
+
+    /**
+     * Map <directory>/EphemerisFileName(params), generating it first if needed.
+     *
+     * @param generated Set to true if the file had to be generated (optional)
+     * @return Path of the mapped file, or an empty string on failure
+     */
+    std::string OpenOrGenerate(const std::string& directory, const EphemerisParams& params,
+                               bool* generated = nullptr);
+
+    /**
+     * Unmap the file (idempotent).
+     */
+    void Close();
+
+    /**
+     * Check if a file is mapped.
+     */
+    bool IsOpen() const { return m_samples != nullptr; }
+
+    /**
+     * Get number of satellites.
+     */
+    uint32_t GetNumSatellites() const { return m_numSatellites; }
+
+    /**
+     * Get number of grid samples per satellite.
+     */
+    uint32_t GetNumSamples() const { return m_numSamples; }
+
+    /**
+     * Get grid step (s).
+     */
+    double GetStep() const { return m_stepS; }
+
+    /**
+     * Interpolated position (m) and velocity (m/s) of one satellite.
+     *
+     * Times outside the grid are clamped to its first/last sample.
+     *
+     * @param position Output x, y, z
+     * @param velocity Output vx, vy, vz (may be nullptr)
+     */
+    void GetState(uint32_t sat, double timeS, double position[3], double velocity[3]) const;
+
+private:
+    void* m_map;              ///< mmap base (header + samples), nullptr when closed
+    size_t m_mapSize;         ///< Mapped bytes
+    const double* m_samples;  ///< First sample (after the header)
+    uint32_t m_numSatellites;
+    uint32_t m_numSamples;
+    double m_stepS;
+};
+
+} // namespace ns3
+
+#endif // ORBITAL_EPHEMERIS_H
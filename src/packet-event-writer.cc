@@ -0,0 +1,63 @@
+/**
+ * PacketEventWriter Implementation
+ */
+
+#include "packet-event-writer.h"
+
+namespace ns3 {
+
+// File header: magic, record size, format version
+static const char PACKET_EVENT_MAGIC[8] = {'P', 'K', 'T', 'E', 'V', 'N', 'T', '1'};
+static const uint32_t PACKET_EVENT_VERSION = 1;
+
+PacketEventWriter::PacketEventWriter(size_t chunkRecords)
+    : m_file(nullptr),
+      m_chunkRecords(chunkRecords > 0 ? chunkRecords : 1),
+      m_written(0) {
+    m_buffer.reserve(m_chunkRecords);
+}
+
+PacketEventWriter::~PacketEventWriter() {
+    Close();
+}
+
+bool PacketEventWriter::Open(const std::string& path) {
+    Close();
+    m_file = std::fopen(path.c_str(), "wb");
+    if (m_file == nullptr) {
+        return false;
+    }
+
+    uint32_t recordSize = sizeof(PacketEvent);
+    std::fwrite(PACKET_EVENT_MAGIC, 1, sizeof(PACKET_EVENT_MAGIC), m_file);
+    std::fwrite(&recordSize, sizeof(recordSize), 1, m_file);
+    std::fwrite(&PACKET_EVENT_VERSION, sizeof(PACKET_EVENT_VERSION), 1, m_file);
+    m_written = 0;
+    return true;
+}
+
+void PacketEventWriter::Flush() {
+    if (m_file != nullptr && !m_buffer.empty()) {
+        m_written += std::fwrite(m_buffer.data(), sizeof(PacketEvent), m_buffer.size(), m_file);
+    }
+    m_buffer.clear();
+}
+
+void PacketEventWriter::Close() {
+    if (m_file == nullptr) {
+        return;
+    }
+    Flush();
+    std::fclose(m_file);
+    m_file = nullptr;
+}
+
+bool PacketEventWriter::IsOpen() const {
+    return m_file != nullptr;
+}
+
+uint64_t PacketEventWriter::GetEventCount() const {
+    return m_written + m_buffer.size();
+}
+
+} // namespace ns3
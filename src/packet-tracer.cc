@@ -3,20 +3,40 @@
  */
 
 #include "packet-tracer.h"
-#include "ns3/udp-header.h"
-#include "ns3/ipv4-header.h"
 #include "ns3/ipv4-l3-protocol.h"
+#include "ns3/loopback-net-device.h"
 #include "ns3/wifi-net-device.h"
 #include "ns3/wifi-mac.h"
+#include <algorithm>
+#include <sstream>
 
 namespace ns3 {
 
+// Well-known routing protocol UDP ports
+static const uint16_t AODV_PORT = 654;
+static const uint16_t OLSR_PORT = 698;
+static const uint16_t DSDV_PORT = 269;
+
+// Column names, in ControlMessageType order
+static const char* const CONTROL_MESSAGE_NAMES[CONTROL_MESSAGE_TYPES] = {
+    "aodv_rreq", "aodv_rrep", "aodv_rerr", "aodv_rrep_ack", "aodv_hello",
+    "olsr_hello", "olsr_tc", "olsr_mid", "olsr_hna",
+    "dsdv_periodic", "dsdv_triggered", "control_other",
+};
+
 PacketTracer::PacketTracer()
     : m_controlBytesTx(0),
       m_controlBytesRx(0),
       m_dataBytesTx(0),
-      m_dataBytesRx(0) {
+      m_dataBytesRx(0),
+      m_binWidthNs(0),
+      m_nodeSlots(0),
+      m_txClassUid(),
+      m_txClass() {
     // Constructor - counters initialized to 0
+    // Data packets: UDP port ∈ [9, 14]
+    // (Application traffic from unified-simulation.cc uses ports 9-14)
+    SetDataPortRange(9, 14);
 }
 
 void PacketTracer::Install(NetDeviceContainer devices) {
@@ -25,30 +45,64 @@ void PacketTracer::Install(NetDeviceContainer devices) {
     // Strategy: Connect to Ipv4L3Protocol Send/Receive traces
     // This gives us packets at IP layer, making classification much simpler
     //
-    // Note: This requires access to the node's Ipv4 object
+    // The traces are per node, not per device: connect once per node and
+    // record which of its interfaces belong to the installed devices, so a
+    // multi-homed node (e.g. WiFi + ISL) fires exactly one callback per
+    // packet and only the selected interfaces are counted. The node's
+    // loopback stays traced, as in the per-node hookup the NRL results
+    // were produced with (AODV defers packets awaiting a route via lo).
     for (uint32_t i = 0; i < devices.GetN(); ++i) {
         Ptr<NetDevice> dev = devices.Get(i);
         Ptr<Node> node = dev->GetNode();
+        uint32_t nodeId = node->GetId();
 
         // Get Ipv4 protocol object from node
-        Ptr<Ipv4> ipv4 = node->GetObject<Ipv4>();
-        if (ipv4) {
-            Ptr<Ipv4L3Protocol> ipv4L3 = DynamicCast<Ipv4L3Protocol>(ipv4);
-            if (ipv4L3) {
-                // TX trace: Connect to Send (packet being sent from IP layer)
-                ipv4L3->TraceConnectWithoutContext(
-                    "Tx",
-                    MakeCallback(&PacketTracer::TxCallback, this));
-
-                // RX trace: Connect to Rx (packet received at IP layer)
-                ipv4L3->TraceConnectWithoutContext(
-                    "Rx",
-                    MakeCallback(&PacketTracer::RxCallback, this));
+        Ptr<Ipv4L3Protocol> ipv4L3 = DynamicCast<Ipv4L3Protocol>(node->GetObject<Ipv4>());
+        if (!ipv4L3) {
+            continue;
+        }
+        int32_t interface = ipv4L3->GetInterfaceForDevice(dev);
+        if (interface < 0) {
+            continue;  // Device has no IPv4 interface (nothing to trace)
+        }
+        NS_ABORT_MSG_IF(interface >= 64, "PacketTracer supports interface indices < 64");
+
+        // Grow the per-node arrays to cover this node id
+        if (nodeId >= m_nodeSlots) {
+            m_nodeSlots = nodeId + 1;
+            m_controlBytesByNode.resize(m_nodeSlots * CONTROL_MESSAGE_TYPES, 0);
+            m_controlMessagesByNode.resize(m_nodeSlots * CONTROL_MESSAGE_TYPES, 0);
+            m_dsdvOwnSeqno.resize(m_nodeSlots, 0);
+            m_tracedInterfaces.resize(m_nodeSlots, 0);
+        }
+
+        // First device of this node: connect the node's traces
+        if (m_tracedInterfaces[nodeId] == 0) {
+            // TX trace: Connect to Send (packet being sent from IP layer)
+            // The node id is bound into the callback (no per-packet lookup)
+            ipv4L3->TraceConnectWithoutContext(
+                "Tx",
+                MakeCallback(&PacketTracer::TxCallback, this).Bind(nodeId));
+
+            // RX trace: Connect to Rx (packet received at IP layer)
+            ipv4L3->TraceConnectWithoutContext(
+                "Rx",
+                MakeCallback(&PacketTracer::RxCallback, this).Bind(nodeId));
+
+            for (uint32_t j = 0; j < ipv4L3->GetNInterfaces() && j < 64; ++j) {
+                if (DynamicCast<LoopbackNetDevice>(ipv4L3->GetNetDevice(j))) {
+                    m_tracedInterfaces[nodeId] |= (uint64_t(1) << j);
+                }
             }
         }
+        m_tracedInterfaces[nodeId] |= (uint64_t(1) << interface);
     }
 }
 
+bool PacketTracer::IsTraced(uint32_t nodeId, uint32_t interface) const {
+    return interface < 64 && ((m_tracedInterfaces[nodeId] >> interface) & 1);
+}
+
 uint64_t PacketTracer::GetControlBytesTx() const {
     return m_controlBytesTx;
 }
@@ -70,63 +124,370 @@ void PacketTracer::Reset() {
     m_controlBytesRx = 0;
     m_dataBytesTx = 0;
     m_dataBytesRx = 0;
+    std::fill(m_bins.begin(), m_bins.end(), TimeBin());
+    std::fill(m_controlBytesByNode.begin(), m_controlBytesByNode.end(), 0);
+    std::fill(m_controlMessagesByNode.begin(), m_controlMessagesByNode.end(), 0);
+    std::fill(m_dsdvOwnSeqno.begin(), m_dsdvOwnSeqno.end(), 0);
 }
 
-bool PacketTracer::IsDataPacket(Ptr<const Packet> packet) const {
-    // At IP layer, packet structure is: [IPv4 Header][Payload (UDP/TCP/ICMP/etc)]
-    // We need to extract IPv4 + UDP headers to check destination port
+uint64_t PacketTracer::GetControlBytesTx(uint32_t nodeId, ControlMessageType type) const {
+    if (nodeId >= m_nodeSlots || type >= CONTROL_MESSAGE_TYPES) {
+        return 0;
+    }
+    return m_controlBytesByNode[nodeId * CONTROL_MESSAGE_TYPES + type];
+}
+
+uint64_t PacketTracer::GetControlMessagesTx(uint32_t nodeId, ControlMessageType type) const {
+    if (nodeId >= m_nodeSlots || type >= CONTROL_MESSAGE_TYPES) {
+        return 0;
+    }
+    return m_controlMessagesByNode[nodeId * CONTROL_MESSAGE_TYPES + type];
+}
+
+uint64_t PacketTracer::GetControlBytesTxByType(ControlMessageType type) const {
+    uint64_t total = 0;
+    for (uint32_t node = 0; node < m_nodeSlots; ++node) {
+        total += m_controlBytesByNode[node * CONTROL_MESSAGE_TYPES + type];
+    }
+    return total;
+}
+
+const char* PacketTracer::GetControlMessageName(ControlMessageType type) {
+    return type < CONTROL_MESSAGE_TYPES ? CONTROL_MESSAGE_NAMES[type] : "unknown";
+}
+
+std::string PacketTracer::FormatControlBreakdown() const {
+    std::ostringstream csv;
+    csv << "node";
+    for (uint32_t t = 0; t < CONTROL_MESSAGE_TYPES; ++t) {
+        csv << "," << CONTROL_MESSAGE_NAMES[t] << "_bytes";
+    }
+    for (uint32_t t = 0; t < CONTROL_MESSAGE_TYPES; ++t) {
+        csv << "," << CONTROL_MESSAGE_NAMES[t] << "_msgs";
+    }
+    csv << "\n";
+
+    for (uint32_t node = 0; node < m_nodeSlots; ++node) {
+        const uint64_t* bytes = &m_controlBytesByNode[node * CONTROL_MESSAGE_TYPES];
+        const uint64_t* messages = &m_controlMessagesByNode[node * CONTROL_MESSAGE_TYPES];
+        if (std::all_of(messages, messages + CONTROL_MESSAGE_TYPES, [](uint64_t n) { return n == 0; })) {
+            continue;
+        }
+        csv << node;
+        for (uint32_t t = 0; t < CONTROL_MESSAGE_TYPES; ++t) {
+            csv << "," << bytes[t];
+        }
+        for (uint32_t t = 0; t < CONTROL_MESSAGE_TYPES; ++t) {
+            csv << "," << messages[t];
+        }
+        csv << "\n";
+    }
+    return csv.str();
+}
+
+void PacketTracer::AddControl(uint32_t nodeId, ControlMessageType type, uint64_t bytes, uint64_t messages) {
+    uint32_t index = nodeId * CONTROL_MESSAGE_TYPES + type;
+    m_controlBytesByNode[index] += bytes;
+    m_controlMessagesByNode[index] += messages;
+}
+
+ControlMessageType PacketTracer::ClassifyControl(uint32_t nodeId, Ptr<const Packet> packet, Ptr<Ipv4> ipv4,
+                                                 uint32_t interface, bool account) {
+    uint32_t size = packet->GetSize();
+    ControlMessageType type = CONTROL_OTHER;
+
+    // IPv4 + UDP headers first (28 bytes without options): only the routing
+    // protocols' ports need the payload
+    uint8_t header[60 + 8];  // Largest IPv4 header (IHL=15) + UDP header
+    uint32_t copied = packet->CopyData(header, 28);
+    uint32_t udpOffset = (copied >= 20) ? (header[0] & 0x0f) * 4u : 0;
+    if (udpOffset > 20 && udpOffset + 8 > copied) {
+        copied = packet->CopyData(header, udpOffset + 8);
+    }
+    uint16_t destPort = 0;
+    if (udpOffset >= 20 && header[9] == 17 && udpOffset + 8 <= copied) {
+        destPort = static_cast<uint16_t>((header[udpOffset + 2] << 8) | header[udpOffset + 3]);
+    }
+    if (destPort != AODV_PORT && destPort != OLSR_PORT && destPort != DSDV_PORT) {
+        // Not UDP (ICMP etc.), truncated, or UDP outside the routing ports
+        if (account) {
+            AddControl(nodeId, CONTROL_OTHER, size, 1);
+        }
+        return CONTROL_OTHER;
+    }
+
+    // Routing messages are small; 1536 bytes covers any WiFi-MTU control packet
+    uint8_t buffer[1536];
+    copied = packet->CopyData(buffer, std::min<uint32_t>(size, sizeof(buffer)));
+    uint32_t payload = udpOffset + 8;  // Start of the routing message
+
+    if (destPort == AODV_PORT && payload < copied) {
+        // AODV: 1-byte message type (RFC 3561 §5)
+        switch (buffer[payload]) {
+            case 1: type = AODV_RREQ; break;
+            case 3: type = AODV_RERR; break;
+            case 4: type = AODV_RREP_ACK; break;
+            case 2: {
+                // HELLO = RREP sent to the broadcast address; replies are unicast
+                Ipv4Address dst(static_cast<uint32_t>((buffer[16] << 24) | (buffer[17] << 16) |
+                                                      (buffer[18] << 8) | buffer[19]));
+                Ipv4Mask mask = ipv4->GetAddress(interface, 0).GetMask();
+                bool broadcast = dst.IsBroadcast() || dst.IsSubnetDirectedBroadcast(mask);
+                type = broadcast ? AODV_HELLO : AODV_RREP;
+                break;
+            }
+            default: break;
+        }
+    } else if (destPort == OLSR_PORT && payload + 4 <= copied) {
+        // OLSR: 4-byte packet header, then messages [type, vtime, size(2), ...]
+        // (RFC 3626 §3.3); packet headers are charged to the first message
+        uint32_t offset = payload + 4;
+        uint64_t overhead = offset;
+        bool first = true;
+        while (offset + 4 <= copied) {
+            uint16_t messageSize = static_cast<uint16_t>((buffer[offset + 2] << 8) | buffer[offset + 3]);
+            if (messageSize < 4) {
+                break;
+            }
+            ControlMessageType messageType;
+            switch (buffer[offset]) {
+                case 1: messageType = OLSR_HELLO; break;
+                case 2: messageType = OLSR_TC; break;
+                case 3: messageType = OLSR_MID; break;
+                case 4: messageType = OLSR_HNA; break;
+                default: messageType = CONTROL_OTHER; break;
+            }
+            if (account) {
+                uint32_t messageBytes = std::min<uint32_t>(messageSize, size - offset);
+                AddControl(nodeId, messageType, messageBytes + (first ? overhead : 0), 1);
+            }
+            if (first) {
+                type = messageType;
+                first = false;
+            }
+            offset += messageSize;
+        }
+        if (!first) {
+            // Bytes past the copied prefix (or after a malformed message)
+            // still count, so the per-type totals add up to control_bytes_tx
+            if (account && offset < size) {
+                AddControl(nodeId, CONTROL_OTHER, size - offset, 0);
+            }
+            return type;  // Already accounted per message
+        }
+    } else if (destPort == DSDV_PORT) {
+        // DSDV: 12-byte entries [dst, hop count, seqno]. Periodic updates
+        // advance the sender's own sequence number; triggered updates don't.
+        type = DSDV_TRIGGERED;
+        if (account) {
+            uint32_t src = (buffer[12] << 24) | (buffer[13] << 16) | (buffer[14] << 8) | buffer[15];
+            for (uint32_t offset = payload; offset + 12 <= copied; offset += 12) {
+                uint32_t dst = (buffer[offset] << 24) | (buffer[offset + 1] << 16) |
+                               (buffer[offset + 2] << 8) | buffer[offset + 3];
+                if (dst != src) {
+                    continue;
+                }
+                uint32_t seqno = (buffer[offset + 8] << 24) | (buffer[offset + 9] << 16) |
+                                 (buffer[offset + 10] << 8) | buffer[offset + 11];
+                if (seqno > m_dsdvOwnSeqno[nodeId]) {
+                    m_dsdvOwnSeqno[nodeId] = seqno;
+                    type = DSDV_PERIODIC;
+                }
+                break;
+            }
+        } else {
+            // Receivers can't see the sender's history: reuse its TX class
+            uint64_t uid = packet->GetUid();
+            uint32_t slot = uid % TX_CLASS_CACHE;
+            if (m_txClassUid[slot] == uid + 1) {
+                type = static_cast<ControlMessageType>(m_txClass[slot]);
+            }
+        }
+    }
+
+    if (account) {
+        AddControl(nodeId, type, size, 1);
+    }
+    return type;
+}
 
-    // Create a copy for peeking (const packet cannot be modified)
-    Ptr<Packet> copy = packet->Copy();
+bool PacketTracer::EnableEventTrace(const std::string& path) {
+    m_events = std::make_unique<PacketEventWriter>();
+    if (!m_events->Open(path)) {
+        m_events.reset();
+        return false;
+    }
+    return true;
+}
+
+uint64_t PacketTracer::CloseEventTrace() {
+    if (!m_events) {
+        return 0;
+    }
+    uint64_t count = m_events->GetEventCount();
+    m_events->Close();
+    m_events.reset();
+    return count;
+}
+
+void PacketTracer::RecordEvent(uint32_t nodeId, uint32_t interface, uint8_t direction, uint8_t cls,
+                               Ptr<const Packet> packet) {
+    PacketEvent event;
+    event.timeNs = Simulator::Now().GetNanoSeconds();
+    event.node = nodeId;
+    event.iface = static_cast<uint16_t>(interface);
+    event.dir = direction;
+    event.cls = cls;
+    event.size = packet->GetSize();
+    event.flow = 0;
+    if (cls == PACKET_EVENT_DATA) {
+        // Data flows are told apart by destination port (one per application)
+        uint8_t header[60 + 4];
+        uint32_t copied = packet->CopyData(header, 28);
+        uint32_t udpOffset = (header[0] & 0x0f) * 4u;
+        if (udpOffset > 20 && udpOffset + 4 > copied) {
+            copied = packet->CopyData(header, udpOffset + 4);
+        }
+        if (udpOffset + 4 <= copied) {
+            event.flow = static_cast<uint32_t>((header[udpOffset + 2] << 8) | header[udpOffset + 3]);
+        }
+    }
+    m_events->Append(event);
+}
+
+void PacketTracer::SetDataPortRange(uint16_t first, uint16_t last) {
+    m_dataPorts.reset();
+    for (uint32_t port = first; port <= last; ++port) {
+        m_dataPorts.set(port);
+    }
+}
 
-    // Extract IPv4 header
-    Ipv4Header ipv4Header;
-    if (copy->RemoveHeader(ipv4Header) == 0) {
+bool PacketTracer::IsDataPacket(Ptr<const Packet> packet) const {
+    // At IP layer, packet structure is: [IPv4 Header][Payload (UDP/TCP/ICMP/etc)]
+    // Only the protocol byte (offset 9) and the UDP destination port (bytes
+    // 2-3 after the IPv4 header) are needed, so read them from a stack copy
+    // of the first bytes instead of copying the packet and removing headers.
+    //
+    // Fast path: 20-byte IPv4 header without options + 8-byte UDP header
+    uint8_t buffer[60 + 8];  // Largest IPv4 header (IHL=15) + UDP header
+    uint32_t copied = packet->CopyData(buffer, 28);
+    if (copied < 20 || (buffer[0] >> 4) != 4) {
         // No IPv4 header found (shouldn't happen at IP layer)
         return false;
     }
 
     // Check if it's UDP protocol
-    if (ipv4Header.GetProtocol() != 17) {  // 17 = UDP
+    if (buffer[9] != 17) {  // 17 = UDP
         // Not UDP -> control packet (could be ICMP, AODV, OLSR, etc.)
         return false;
     }
 
-    // Extract UDP header
-    UdpHeader udpHeader;
-    if (copy->RemoveHeader(udpHeader) == 0) {
+    // IPv4 options push the UDP header back (IHL counts 32-bit words)
+    uint32_t udpOffset = (buffer[0] & 0x0f) * 4u;
+    if (udpOffset > 20 && udpOffset + 4 > copied) {
+        copied = packet->CopyData(buffer, udpOffset + 4);
+    }
+    if (udpOffset < 20 || udpOffset + 4 > copied) {
         // No UDP header found (malformed packet?)
         return false;
     }
 
-    // Check destination port
-    uint16_t destPort = udpHeader.GetDestinationPort();
+    // Destination port (network byte order)
+    uint16_t destPort = static_cast<uint16_t>((buffer[udpOffset + 2] << 8) | buffer[udpOffset + 3]);
+    return m_dataPorts.test(destPort);
+}
 
-    // Data packets: UDP port ∈ [9, 14]
-    // (Application traffic from unified-simulation.cc uses ports 9-14)
-    return (destPort >= 9 && destPort <= 14);
+void PacketTracer::EnableTimeBins(Time binWidth, Time duration) {
+    NS_ABORT_MSG_IF(binWidth.IsStrictlyNegative() || binWidth.IsZero(), "Time bin width must be positive");
+    m_binWidthNs = binWidth.GetNanoSeconds();
+    int64_t durationNs = std::max<int64_t>(duration.GetNanoSeconds(), 1);
+    m_bins.assign((durationNs + m_binWidthNs - 1) / m_binWidthNs, TimeBin());
+}
+
+bool PacketTracer::HasTimeBins() const {
+    return !m_bins.empty();
+}
+
+void PacketTracer::CountInBin(uint32_t direction, bool isData, uint32_t size) {
+    size_t index = static_cast<size_t>(Simulator::Now().GetNanoSeconds() / m_binWidthNs);
+    TimeBin& bin = m_bins[std::min(index, m_bins.size() - 1)];
+    if (isData) {
+        bin.dataBytes[direction] += size;
+        bin.dataPackets[direction] += 1;
+    } else {
+        bin.controlBytes[direction] += size;
+        bin.controlPackets[direction] += 1;
+    }
 }
 
-void PacketTracer::TxCallback(Ptr<const Packet> packet, Ptr<Ipv4> ipv4, uint32_t interface) {
-    // Note: We ignore ipv4 and interface parameters - only interested in packet
+std::string PacketTracer::FormatTimeSeries() const {
+    if (m_bins.empty()) {
+        return "";
+    }
+
+    std::ostringstream csv;
+    csv << "t_s,control_bytes_tx,data_bytes_tx,control_bytes_rx,data_bytes_rx,"
+        << "control_packets_tx,data_packets_tx,control_packets_rx,data_packets_rx\n";
+    for (size_t i = 0; i < m_bins.size(); ++i) {
+        const TimeBin& bin = m_bins[i];
+        csv << (static_cast<double>(i) * m_binWidthNs / 1e9) << ","
+            << bin.controlBytes[0] << "," << bin.dataBytes[0] << ","
+            << bin.controlBytes[1] << "," << bin.dataBytes[1] << ","
+            << bin.controlPackets[0] << "," << bin.dataPackets[0] << ","
+            << bin.controlPackets[1] << "," << bin.dataPackets[1] << "\n";
+    }
+    return csv.str();
+}
+
+void PacketTracer::TxCallback(uint32_t nodeId, Ptr<const Packet> packet, Ptr<Ipv4> ipv4, uint32_t interface) {
+    if (!IsTraced(nodeId, interface)) {
+        return;
+    }
     uint32_t size = packet->GetSize();
+    bool isData = IsDataPacket(packet);
 
-    if (IsDataPacket(packet)) {
+    uint8_t cls = PACKET_EVENT_DATA;
+    if (isData) {
         m_dataBytesTx += size;
     } else {
         m_controlBytesTx += size;
+        cls = ClassifyControl(nodeId, packet, ipv4, interface, true);
+    }
+    if (m_binWidthNs > 0) {
+        CountInBin(0, isData, size);
+    }
+    if (m_events) {
+        if (!isData) {
+            // Remember the class so receivers of this packet can reuse it
+            uint64_t uid = packet->GetUid();
+            m_txClassUid[uid % TX_CLASS_CACHE] = uid + 1;
+            m_txClass[uid % TX_CLASS_CACHE] = cls;
+        }
+        RecordEvent(nodeId, interface, 0, cls, packet);
     }
 }
 
-void PacketTracer::RxCallback(Ptr<const Packet> packet, Ptr<Ipv4> ipv4, uint32_t interface) {
-    // Note: We ignore ipv4 and interface parameters - only interested in packet
+void PacketTracer::RxCallback(uint32_t nodeId, Ptr<const Packet> packet, Ptr<Ipv4> ipv4, uint32_t interface) {
+    if (!IsTraced(nodeId, interface)) {
+        return;
+    }
     uint32_t size = packet->GetSize();
+    bool isData = IsDataPacket(packet);
 
-    if (IsDataPacket(packet)) {
+    if (isData) {
         m_dataBytesRx += size;
     } else {
         m_controlBytesRx += size;
     }
+    if (m_binWidthNs > 0) {
+        CountInBin(1, isData, size);
+    }
+    if (m_events) {
+        // Received packets are only classified when the event trace needs it
+        uint8_t cls = isData ? PACKET_EVENT_DATA
+                             : static_cast<uint8_t>(ClassifyControl(nodeId, packet, ipv4, interface, false));
+        RecordEvent(nodeId, interface, 1, cls, packet);
+    }
 }
 
 } // namespace ns3
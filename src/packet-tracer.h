@@ -8,6 +8,21 @@
  * - Data packets: UDP destination port ∈ [9, 14] (application traffic)
  * - Control packets: All other IP traffic (routing protocols AODV/OLSR/DSDV)
  *
+ * Classification reads the IPv4 protocol byte and UDP destination port from
+ * the first bytes of the packet buffer (no Packet::Copy) and looks the port
+ * up in a precomputed bitset.
+ *
+ * Transmitted control bytes are also attributed per node and per routing
+ * message type (AODV RREQ/RREP/RERR/RREP-ACK/HELLO, OLSR HELLO/TC/MID/HNA,
+ * DSDV periodic/triggered updates) in flat node × type arrays.
+ *
+ * An optional binary event trace (EnableEventTrace) records every packet
+ * event as a fixed-width record for offline analysis.
+ *
+ * Optional time bins (EnableTimeBins) additionally accumulate control/data
+ * bytes and packets per direction in fixed-width bins, preallocated for the
+ * whole run, so NRL(t) can be plotted without packet captures.
+ *
  * Usage:
  *   PacketTracer tracer;
  *   tracer.Install(groundDevices);  // Hook into WiFi device trace sources
@@ -23,9 +38,33 @@
 #include "ns3/core-module.h"
 #include "ns3/network-module.h"
 #include "ns3/internet-module.h"
+#include "packet-event-writer.h"
+#include <bitset>
+#include <memory>
+#include <string>
+#include <vector>
 
 namespace ns3 {
 
+/**
+ * Routing control message classes distinguished by PacketTracer.
+ */
+enum ControlMessageType : uint32_t {
+    AODV_RREQ = 0,
+    AODV_RREP,
+    AODV_RERR,
+    AODV_RREP_ACK,
+    AODV_HELLO,        ///< RREP broadcast with TTL 1 (RFC 3561 §6.9)
+    OLSR_HELLO,
+    OLSR_TC,
+    OLSR_MID,
+    OLSR_HNA,
+    DSDV_PERIODIC,     ///< Full dump: sender's own sequence number advanced
+    DSDV_TRIGGERED,    ///< Changed entries only: own sequence number unchanged
+    CONTROL_OTHER,     ///< Any other non-data IP packet (ICMP, unknown UDP ports)
+    CONTROL_MESSAGE_TYPES
+};
+
 /**
  * Packet tracer for NRL (Normalized Routing Load) computation.
  *
@@ -41,8 +80,12 @@ public:
     /**
      * Install packet tracer on devices.
      *
-     * Hooks into PromiscSniffer trace source to capture all packets
-     * (both TX and RX) on the specified devices.
+     * Hooks into the Ipv4L3Protocol Tx/Rx trace sources of each device's
+     * node, once per node, and counts only packets on the IPv4 interfaces
+     * of the given devices. Nodes with several devices (e.g. WiFi + ISL)
+     * are counted once per packet; devices left out (e.g. ISL links of a
+     * gateway) are ignored. The node's loopback interface is always
+     * counted. May be called repeatedly to add devices.
      *
      * @param devices NetDeviceContainer to monitor
      */
@@ -65,6 +108,66 @@ public:
      */
     uint64_t GetControlBytesRx() const;
 
+    /**
+     * Get control bytes transmitted by one node for one message type.
+     *
+     * OLSR packets bundling several messages are split by message size;
+     * the IP/UDP/OLSR packet headers are charged to the first message.
+     *
+     * @param nodeId Node id (NodeList index)
+     * @param type Message type
+     * @return Control bytes TX (0 for nodes that were not installed)
+     */
+    uint64_t GetControlBytesTx(uint32_t nodeId, ControlMessageType type) const;
+
+    /**
+     * Get control messages transmitted by one node for one message type.
+     *
+     * @param nodeId Node id (NodeList index)
+     * @param type Message type
+     * @return Control messages TX
+     */
+    uint64_t GetControlMessagesTx(uint32_t nodeId, ControlMessageType type) const;
+
+    /**
+     * Get control bytes transmitted for one message type, summed over nodes.
+     *
+     * @param type Message type
+     * @return Control bytes TX
+     */
+    uint64_t GetControlBytesTxByType(ControlMessageType type) const;
+
+    /**
+     * Short name of a message type, e.g. "aodv_rreq" (used as CSV column).
+     */
+    static const char* GetControlMessageName(ControlMessageType type);
+
+    /**
+     * Render the per-node breakdown as CSV, one row per node that sent
+     * control traffic: node,<type>_bytes...,<type>_msgs...
+     *
+     * @return CSV text
+     */
+    std::string FormatControlBreakdown() const;
+
+    /**
+     * Write one binary record per IP-layer packet event to a file.
+     *
+     * See packet-event-writer.h for the record layout. Call before the
+     * simulation runs and CloseEventTrace() after it.
+     *
+     * @param path Output path (e.g. "<output>.events.bin")
+     * @return false if the file could not be created
+     */
+    bool EnableEventTrace(const std::string& path);
+
+    /**
+     * Flush and close the event trace (no-op if disabled).
+     *
+     * @return Number of events written
+     */
+    uint64_t CloseEventTrace();
+
     /**
      * Get total data packet bytes transmitted.
      *
@@ -89,43 +192,162 @@ public:
      */
     void Reset();
 
-private:
+    /**
+     * Set the UDP destination ports counted as data traffic.
+     *
+     * Replaces the default range [9, 14]. Call before the simulation runs.
+     *
+     * @param first First data port (inclusive)
+     * @param last Last data port (inclusive)
+     */
+    void SetDataPortRange(uint16_t first, uint16_t last);
+
     /**
      * Check if packet is a data packet (application traffic).
      *
      * Classification logic:
-     * 1. Extract UDP header from packet
-     * 2. Check if destination port ∈ [9, 14]
-     * 3. If yes -> data packet, else -> control packet
+     * 1. Copy the IPv4 header and first 4 payload bytes into a stack buffer
+     * 2. Protocol byte must be UDP (17)
+     * 3. Destination port must be in the data-port set
      *
-     * @param packet Packet to classify
+     * Public so tests and benchmarks can classify packets directly.
+     *
+     * @param packet IP-layer packet (starting with the IPv4 header)
      * @return true if data packet, false if control packet
      */
     bool IsDataPacket(Ptr<const Packet> packet) const;
 
+    /**
+     * Enable per-bin counters.
+     *
+     * Bins cover [0, duration) and are allocated up front; packets after the
+     * last bin are counted in the last bin. Call before the simulation runs.
+     *
+     * @param binWidth Bin width (e.g. MilliSeconds(100))
+     * @param duration Simulated time to cover (normally the run's stop time)
+     */
+    void EnableTimeBins(Time binWidth, Time duration);
+
+    /**
+     * Whether time bins are enabled.
+     */
+    bool HasTimeBins() const;
+
+    /**
+     * Render the time bins as columnar CSV, one row per bin:
+     * t_s,control_bytes_tx,data_bytes_tx,control_bytes_rx,data_bytes_rx,
+     * control_packets_tx,data_packets_tx,control_packets_rx,data_packets_rx
+     *
+     * @return CSV text (empty if time bins are disabled)
+     */
+    std::string FormatTimeSeries() const;
+
+private:
+    /**
+     * Counters for one time bin.
+     */
+    struct TimeBin {
+        uint64_t controlBytes[2] = {0, 0};    ///< [TX, RX]
+        uint64_t dataBytes[2] = {0, 0};       ///< [TX, RX]
+        uint32_t controlPackets[2] = {0, 0};  ///< [TX, RX]
+        uint32_t dataPackets[2] = {0, 0};     ///< [TX, RX]
+    };
+
+    /**
+     * Add one packet to the current time bin.
+     *
+     * @param direction 0 = TX, 1 = RX
+     * @param isData Data (true) or control (false) packet
+     * @param size Packet size in bytes
+     */
+    void CountInBin(uint32_t direction, bool isData, uint32_t size);
+
+    /**
+     * Check if an interface of a node belongs to an installed device.
+     */
+    bool IsTraced(uint32_t nodeId, uint32_t interface) const;
+
+    /**
+     * Classify a control packet and, for transmissions, attribute it to
+     * its message type(s).
+     *
+     * Received DSDV updates cannot be told apart on the wire; they take the
+     * class the sender's transmission was given (looked up by packet uid)
+     * and fall back to DSDV_TRIGGERED.
+     *
+     * OLSR packets are accounted per message; bytes the parser cannot
+     * attribute to a message go to CONTROL_OTHER. The returned class (used
+     * for the event trace) is the packet's first message.
+     *
+     * Only the IPv4/UDP headers are copied first; the payload is read only
+     * for the AODV, OLSR and DSDV ports.
+     *
+     * @param nodeId Sending/receiving node
+     * @param packet IP-layer packet
+     * @param ipv4 Node's IPv4 (for the interface broadcast address)
+     * @param interface Interface index
+     * @param account Add to the node × type arrays (TX) or only classify (RX)
+     * @return Type of the (first) message in the packet
+     */
+    ControlMessageType ClassifyControl(uint32_t nodeId, Ptr<const Packet> packet, Ptr<Ipv4> ipv4,
+                                       uint32_t interface, bool account);
+
+    /**
+     * Append one record to the event trace.
+     */
+    void RecordEvent(uint32_t nodeId, uint32_t interface, uint8_t direction, uint8_t cls,
+                     Ptr<const Packet> packet);
+
+    /**
+     * Add bytes/messages to the node × type arrays.
+     */
+    void AddControl(uint32_t nodeId, ControlMessageType type, uint64_t bytes, uint64_t messages);
+
+
     /**
      * TX callback - called when packet is transmitted at IP layer.
      *
+     * @param nodeId Node id (bound at Install)
      * @param packet Transmitted packet
      * @param ipv4 IPv4 protocol instance
      * @param interface Interface index
      */
-    void TxCallback(Ptr<const Packet> packet, Ptr<Ipv4> ipv4, uint32_t interface);
+    void TxCallback(uint32_t nodeId, Ptr<const Packet> packet, Ptr<Ipv4> ipv4, uint32_t interface);
 
     /**
      * RX callback - called when packet is received at IP layer.
      *
+     * @param nodeId Node id (bound at Install)
      * @param packet Received packet
      * @param ipv4 IPv4 protocol instance
      * @param interface Interface index
      */
-    void RxCallback(Ptr<const Packet> packet, Ptr<Ipv4> ipv4, uint32_t interface);
+    void RxCallback(uint32_t nodeId, Ptr<const Packet> packet, Ptr<Ipv4> ipv4, uint32_t interface);
 
     // Byte counters
     uint64_t m_controlBytesTx;  ///< Control packet bytes transmitted
     uint64_t m_controlBytesRx;  ///< Control packet bytes received
     uint64_t m_dataBytesTx;     ///< Data packet bytes transmitted
     uint64_t m_dataBytesRx;     ///< Data packet bytes received
+
+    std::bitset<65536> m_dataPorts;  ///< UDP destination ports counted as data
+
+    // Time-binned counters (empty unless EnableTimeBins was called)
+    int64_t m_binWidthNs;            ///< Bin width in nanoseconds (0 = disabled)
+    std::vector<TimeBin> m_bins;     ///< Preallocated bins covering the run
+
+    // Control breakdown, flat [nodeId * CONTROL_MESSAGE_TYPES + type] arrays
+    uint32_t m_nodeSlots;                      ///< Largest installed node id + 1
+    std::vector<uint64_t> m_controlBytesByNode;     ///< Control bytes TX
+    std::vector<uint64_t> m_controlMessagesByNode;  ///< Control messages TX
+    std::vector<uint32_t> m_dsdvOwnSeqno;      ///< Last own DSDV seqno sent, per node
+    std::vector<uint64_t> m_tracedInterfaces;  ///< Per node: bit i = interface i traced (0 = not connected)
+
+    // Binary event trace (null unless EnableEventTrace was called)
+    std::unique_ptr<PacketEventWriter> m_events;
+    static const uint32_t TX_CLASS_CACHE = 1024;     ///< Direct-mapped, indexed by uid
+    uint64_t m_txClassUid[TX_CLASS_CACHE];           ///< Uid + 1 of the cached TX packet (0 = empty)
+    uint8_t m_txClass[TX_CLASS_CACHE];               ///< Its ControlMessageType
 };
 
 } // namespace ns3
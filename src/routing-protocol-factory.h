@@ -38,6 +38,7 @@ public:
      *
      * Supported protocols:
      * - "static" -> StaticRoutingProtocol (ISL only)
+     * - "static-delay" -> StaticRoutingProtocol, metric=delay (ISL only)
      * - "olsr" -> OlsrRoutingProtocol (ISL or ground)
      * - "aodv" -> AodvRoutingProtocol (ground only)
      * - "dsdv" -> DsdvRoutingProtocol (ground only)
@@ -52,6 +53,10 @@ public:
 
         if (name == "static") {
             return std::make_unique<StaticRoutingProtocol>();
+        } else if (name == "static-delay") {
+            auto protocol = std::make_unique<StaticRoutingProtocol>();
+            protocol->SetParameter("metric", "delay");
+            return protocol;
         } else if (name == "olsr") {
             return std::make_unique<OlsrRoutingProtocol>();
         } else if (name == "aodv") {
@@ -69,7 +74,7 @@ public:
      * @return Vector of protocol names (lowercase)
      */
     static std::vector<std::string> GetSupportedProtocols() {
-        return {"static", "olsr", "aodv", "dsdv"};
+        return {"static", "static-delay", "olsr", "aodv", "dsdv"};
     }
 };
 
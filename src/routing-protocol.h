@@ -71,7 +71,9 @@ public:
      *
      * Used to compute Normalized Routing Load (NRL).
      * Static routing returns 0 (no control packets).
-     * Dynamic protocols (OLSR, AODV) return sum of control packet bytes.
+     * Dynamic protocols (OLSR, AODV, DSDV) count their own transmissions
+     * (IP bytes) on the installed nodes via TraceControlPort(), independent
+     * of PacketTracer.
      *
      * @return Control packet bytes
      */
@@ -101,6 +103,68 @@ public:
      * @return Configuration string
      */
     virtual std::string GetConfig() const = 0;
+
+    /**
+     * Assign fixed random variable streams to the installed protocol instances.
+     *
+     * Random variables draw their seed when created, so objects built before
+     * RngSeedManager::SetSeed() keep the old seed until their streams are
+     * reassigned (used by the fork server after each child re-seeds).
+     * Protocols without randomness (static) use no streams.
+     *
+     * @param nodes Nodes the protocol was installed on
+     * @param stream First stream index to use
+     * @return Number of stream indices used
+     */
+    virtual int64_t AssignStreams(NodeContainer nodes, int64_t stream) {
+        return 0;
+    }
+
+protected:
+    /**
+     * Count control packets this protocol sends from `nodes`.
+     *
+     * Hooks each node's Ipv4L3Protocol "SendOutgoing" trace, which fires once
+     * per locally originated packet and outgoing interface (forwarded packets
+     * never reach it), and counts packets whose UDP source port is the
+     * protocol's routing socket port. Works on any node with an internet
+     * stack (ground or ISL); call after the stack is installed.
+     *
+     * @param nodes Nodes the protocol was installed on
+     * @param port UDP port of the protocol's routing sockets
+     */
+    void TraceControlPort(NodeContainer nodes, uint16_t port) {
+        m_controlPort = port;
+        for (uint32_t i = 0; i < nodes.GetN(); ++i) {
+            Ptr<Ipv4L3Protocol> ipv4 = nodes.Get(i)->GetObject<Ipv4L3Protocol>();
+            if (ipv4) {
+                ipv4->TraceConnectWithoutContext(
+                    "SendOutgoing", MakeCallback(&RoutingProtocol::ControlSendCallback, this));
+            }
+        }
+    }
+
+    uint64_t m_controlBytes = 0;    ///< IP bytes of control packets sent
+    uint64_t m_controlPackets = 0;  ///< Control packets sent
+
+private:
+    /**
+     * SendOutgoing trace sink: only the UDP source port is read.
+     */
+    void ControlSendCallback(const Ipv4Header& header, Ptr<const Packet> packet, uint32_t interface) {
+        if (header.GetProtocol() != UdpL4Protocol::PROT_NUMBER) {
+            return;
+        }
+        uint8_t ports[2];
+        if (packet->CopyData(ports, sizeof(ports)) < sizeof(ports) ||
+            ((ports[0] << 8) | ports[1]) != m_controlPort) {
+            return;
+        }
+        m_controlBytes += header.GetSerializedSize() + header.GetPayloadSize();
+        ++m_controlPackets;
+    }
+
+    uint16_t m_controlPort = 0;  ///< Routing socket port (0 = not traced)
 };
 
 } // namespace ns3
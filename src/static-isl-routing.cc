@@ -1,133 +1,348 @@
 /**
  * Static ISL Routing Implementation
  *
- * Algorithm: Dijkstra's all-pairs shortest path
- * - Run Dijkstra from each source satellite
- * - Extract next-hop from predecessor array
- * - Store in O(1) lookup table
+ * Algorithm: All-pairs shortest path by breadth-first search (unit ISL cost)
+ * - Run a level-synchronous BFS from each source satellite (threads split sources)
+ * - Propagate the first hop during traversal (no predecessor walk)
+ * - Store in a flat V×V next-hop matrix (O(1) lookup)
  *
- * Complexity: O(V³) for dense graph (V = number of satellites)
- * For 24 satellites: ~14,000 operations (negligible)
+ * Complexity: O(V × (V log V + E)) (V = number of satellites)
+ *
+ * Delay-weighted variant (ComputeDelayRoutes): binary-heap Dijkstra per
+ * source over per-link propagation delays, same row layout and threading.
+ * Both run through RecomputeRoutes, which can also refresh selected rows only.
  *
  * Status: FULL IMPLEMENTATION (GREEN PHASE)
  */
 
 #include "static-isl-routing.h"
-#include <queue>
-#include <limits>
 #include <algorithm>
-#include <set>
+#include <atomic>
+#include <limits>
+#include <thread>
 
 namespace ns3 {
 
-uint32_t RoutingTables::GetNextHop(uint32_t src, uint32_t dst) const {
-    auto srcIt = m_nextHop.find(src);
-    if (srcIt == m_nextHop.end()) {
-        return UINT32_MAX; // No routes from src
-    }
+RoutingTables::RoutingTables()
+    : m_numSatellites(0),
+      m_wide(false) {
+}
 
-    auto dstIt = srcIt->second.find(dst);
-    if (dstIt == srcIt->second.end()) {
-        return UINT32_MAX; // No route to dst
+RoutingTables::RoutingTables(uint32_t numSatellites)
+    : m_numSatellites(0),
+      m_wide(false) {
+    Resize(numSatellites);
+}
+
+void RoutingTables::Resize(uint32_t numSatellites) {
+    RoutingTables old = std::move(*this);
+
+    m_numSatellites = numSatellites;
+    m_wide = numSatellites >= NO_ROUTE_16;  // Ids must stay below the 16-bit sentinel
+    size_t cells = static_cast<size_t>(numSatellites) * numSatellites;
+    m_nextHop16.clear();
+    m_nextHop32.clear();
+    if (m_wide) {
+        m_nextHop32.assign(cells, UINT32_MAX);
+    } else {
+        m_nextHop16.assign(cells, NO_ROUTE_16);
     }
 
-    return dstIt->second;
+    // Keep entries of the old matrix (SetNextHop growth path)
+    for (uint32_t src = 0; src < old.m_numSatellites; ++src) {
+        for (uint32_t dst = 0; dst < old.m_numSatellites; ++dst) {
+            uint32_t hop = old.GetNextHop(src, dst);
+            if (hop != UINT32_MAX) {
+                SetNextHop(src, dst, hop);
+            }
+        }
+    }
 }
 
 void RoutingTables::SetNextHop(uint32_t src, uint32_t dst, uint32_t nextHop) {
-    m_nextHop[src][dst] = nextHop;
+    uint32_t needed = std::max({src, dst, nextHop}) + 1;
+    if (needed > m_numSatellites) {
+        Resize(needed);
+    }
+
+    size_t index = static_cast<size_t>(src) * m_numSatellites + dst;
+    if (m_wide) {
+        m_nextHop32[index] = nextHop;
+    } else {
+        m_nextHop16[index] = static_cast<uint16_t>(nextHop);
+    }
 }
 
 std::map<uint32_t, uint32_t> RoutingTables::GetAllNextHops(uint32_t src) const {
-    auto it = m_nextHop.find(src);
-    if (it == m_nextHop.end()) {
-        return {};
+    std::map<uint32_t, uint32_t> hops;
+    for (uint32_t dst = 0; dst < m_numSatellites; ++dst) {
+        uint32_t hop = GetNextHop(src, dst);
+        if (hop != UINT32_MAX) {
+            hops[dst] = hop;
+        }
     }
-    return it->second;
+    return hops;
 }
 
-RoutingTables ComputeStaticRoutes(const IslTopology& topology) {
-    RoutingTables routes;
-
-    // For each source satellite, run Dijkstra to compute shortest paths
-    for (uint32_t src = 0; src < topology.numSatellites; ++src) {
-        // Dijkstra's algorithm
-        const uint32_t INF = std::numeric_limits<uint32_t>::max();
-        std::vector<uint32_t> dist(topology.numSatellites, INF);
-        std::vector<uint32_t> prev(topology.numSatellites, UINT32_MAX);
-        std::vector<bool> visited(topology.numSatellites, false);
-
-        dist[src] = 0;
-
-        // Priority queue: (distance, node)
-        using PQNode = std::pair<uint32_t, uint32_t>;
-        std::priority_queue<PQNode, std::vector<PQNode>, std::greater<PQNode>> pq;
-        pq.push({0, src});
-
-        while (!pq.empty()) {
-            uint32_t u = pq.top().second;
-            pq.pop();
-
-            if (visited[u]) continue;
-            visited[u] = true;
-
-            // Relaxation step
-            auto neighborIt = topology.neighbors.find(u);
-            if (neighborIt != topology.neighbors.end()) {
-                const auto& neighbors = neighborIt->second;
-                for (uint32_t v : neighbors) {
-                    if (!visited[v]) {
-                        uint32_t newDist = dist[u] + 1; // Each ISL hop = cost 1
-                        if (newDist < dist[v]) {
-                            dist[v] = newDist;
-                            prev[v] = u;
-                            pq.push({newDist, v});
-                        }
-                    }
+/**
+ * Per-thread scratch buffers, reused across sources.
+ */
+struct SourceScratch {
+    std::vector<uint32_t> frontier;  // BFS: current level
+    std::vector<uint32_t> next;      // BFS: next level
+    std::vector<double> dist;        // Dijkstra: tentative delays
+    std::vector<std::pair<double, uint32_t>> heap;  // Dijkstra: binary min-heap
+};
+
+/**
+ * BFS from src writing first hops into one matrix row.
+ *
+ * @param row Row of the next-hop matrix (V entries, initialized to noRoute)
+ * @param dist Hop counts (V entries, initialized to infinity), or nullptr
+ * @param parent Predecessors in the BFS tree (V entries, initialized to
+ *               UINT32_MAX), or nullptr
+ */
+template <typename Hop>
+static void ComputeFirstHops(const IslTopology& topology, uint32_t src, Hop* row, Hop noRoute,
+                             double* dist, uint32_t* parent, SourceScratch& scratch) {
+    std::vector<uint32_t>& frontier = scratch.frontier;
+    std::vector<uint32_t>& next = scratch.next;
+    frontier.clear();
+    frontier.push_back(src);
+    double level = 0.0;
+    if (dist) dist[src] = level;
+
+    while (!frontier.empty()) {
+        next.clear();
+        level += 1.0;
+        for (uint32_t u : frontier) {
+            for (uint32_t e = topology.offsets[u]; e < topology.offsets[u + 1]; ++e) {
+                uint32_t v = topology.adjacency[e];
+                if (v == src || row[v] != noRoute || !topology.IsLinkUp(e)) {
+                    continue; // Already discovered or link down
                 }
+                // Propagate the first hop: src's neighbors are their own first hop
+                row[v] = (u == src) ? static_cast<Hop>(v) : row[u];
+                if (dist) dist[v] = level;
+                if (parent) parent[v] = u;
+                next.push_back(v);
             }
         }
 
-        // Extract next-hops from prev[] array
-        for (uint32_t dst = 0; dst < topology.numSatellites; ++dst) {
-            if (src == dst) continue; // No route to self
-            if (dist[dst] == INF) continue; // Unreachable (should never happen with 100% connectivity)
+        // Visit the next level in ascending id (deterministic tie-breaking)
+        std::sort(next.begin(), next.end());
+        std::swap(frontier, next);
+    }
+}
+
+/**
+ * Delay-weighted Dijkstra from src writing first hops into one matrix row.
+ *
+ * @param row Row of the next-hop matrix (V entries, initialized to "no route")
+ * @param dist Path delays (V entries), or nullptr
+ * @param parent Predecessors in the shortest-path tree (V entries,
+ *               initialized to UINT32_MAX), or nullptr
+ */
+template <typename Hop>
+static void ComputeFirstHopsByDelay(const IslTopology& topology, uint32_t src, Hop* row,
+                                    double* dist, uint32_t* parent, SourceScratch& scratch) {
+    using HeapNode = std::pair<double, uint32_t>;
+    std::vector<double>& best = scratch.dist;
+    std::vector<HeapNode>& heap = scratch.heap;
+    best.assign(topology.numSatellites, std::numeric_limits<double>::infinity());
+    heap.clear();
+
+    best[src] = 0.0;
+    heap.push_back({0.0, src});
+    while (!heap.empty()) {
+        std::pop_heap(heap.begin(), heap.end(), std::greater<HeapNode>());
+        auto [d, u] = heap.back();
+        heap.pop_back();
+        if (d > best[u]) continue; // Stale entry
 
-            // Trace back from dst to src to find first hop
-            uint32_t current = dst;
-            while (prev[current] != src && prev[current] != UINT32_MAX) {
-                current = prev[current];
+        for (uint32_t e = topology.offsets[u]; e < topology.offsets[u + 1]; ++e) {
+            if (!topology.IsLinkUp(e)) continue;
+            uint32_t v = topology.adjacency[e];
+            double newDist = d + topology.linkDelay[e];
+            if (newDist < best[v]) {
+                best[v] = newDist;
+                // u is settled, so its first hop is final
+                row[v] = (u == src) ? static_cast<Hop>(v) : row[u];
+                if (parent) parent[v] = u;
+                heap.push_back({newDist, v});
+                std::push_heap(heap.begin(), heap.end(), std::greater<HeapNode>());
             }
+        }
+    }
+
+    if (dist) std::copy(best.begin(), best.end(), dist);
+}
+
+/**
+ * Run itemFn(i, scratch) for i in [0, numItems), split across worker threads.
+ *
+ * Each worker claims items from a shared counter; itemFn must only write
+ * the matrix rows of its own source.
+ */
+template <typename ItemFn>
+static void ForEachSource(uint32_t numItems, uint32_t numThreads, ItemFn itemFn) {
+    // Threads only pay off once the per-source work dominates thread startup
+    const uint32_t MIN_SATELLITES_PER_THREAD = 128;
+    if (numThreads == 0) {
+        numThreads = std::max(1u, std::thread::hardware_concurrency());
+    }
+    numThreads = std::max(1u, std::min(numThreads, numItems / MIN_SATELLITES_PER_THREAD));
 
-            // current is now the first hop from src to dst
-            routes.SetNextHop(src, dst, current);
+    std::atomic<uint32_t> nextItem{0};
+    auto worker = [&]() {
+        SourceScratch scratch;
+        for (uint32_t i = nextItem++; i < numItems; i = nextItem++) {
+            itemFn(i, scratch);
         }
+    };
+
+    std::vector<std::thread> threads;
+    for (uint32_t t = 1; t < numThreads; ++t) {
+        threads.emplace_back(worker);
+    }
+    worker();
+    for (std::thread& thread : threads) {
+        thread.join();
+    }
+}
+
+void RecomputeRoutes(const IslTopology& topology, RouteMetric metric,
+                     const std::vector<uint32_t>& sources, RoutingTables& routes,
+                     std::vector<double>* distances, std::vector<uint32_t>* parents,
+                     uint32_t numThreads) {
+    const uint32_t numSatellites = topology.numSatellites;
+    const size_t cells = static_cast<size_t>(numSatellites) * numSatellites;
+    if (routes.m_numSatellites != numSatellites) {
+        routes.Resize(numSatellites);
+    }
+    if (distances && distances->size() != cells) {
+        distances->assign(cells, std::numeric_limits<double>::infinity());
+    }
+    if (parents && parents->size() != cells) {
+        parents->assign(cells, UINT32_MAX);
     }
 
+    ForEachSource(sources.size(), numThreads, [&](uint32_t i, SourceScratch& scratch) {
+        const uint32_t src = sources[i];
+        size_t rowStart = static_cast<size_t>(src) * numSatellites;
+        double* dist = nullptr;
+        if (distances) {
+            dist = distances->data() + rowStart;
+            std::fill(dist, dist + numSatellites, std::numeric_limits<double>::infinity());
+        }
+        uint32_t* parent = nullptr;
+        if (parents) {
+            parent = parents->data() + rowStart;
+            std::fill(parent, parent + numSatellites, UINT32_MAX);
+        }
+
+        if (routes.m_wide) {
+            uint32_t* row = routes.m_nextHop32.data() + rowStart;
+            std::fill(row, row + numSatellites, UINT32_MAX);
+            if (metric == RouteMetric::DELAY) {
+                ComputeFirstHopsByDelay<uint32_t>(topology, src, row, dist, parent, scratch);
+            } else {
+                ComputeFirstHops<uint32_t>(topology, src, row, UINT32_MAX, dist, parent, scratch);
+            }
+        } else {
+            uint16_t* row = routes.m_nextHop16.data() + rowStart;
+            std::fill(row, row + numSatellites, RoutingTables::NO_ROUTE_16);
+            if (metric == RouteMetric::DELAY) {
+                ComputeFirstHopsByDelay<uint16_t>(topology, src, row, dist, parent, scratch);
+            } else {
+                ComputeFirstHops<uint16_t>(topology, src, row, RoutingTables::NO_ROUTE_16, dist, parent,
+                                           scratch);
+            }
+        }
+    });
+}
+
+/**
+ * All satellite ids 0 .. V-1 (every source of a full computation).
+ */
+static std::vector<uint32_t> AllSources(uint32_t numSatellites) {
+    std::vector<uint32_t> sources(numSatellites);
+    for (uint32_t src = 0; src < numSatellites; ++src) {
+        sources[src] = src;
+    }
+    return sources;
+}
+
+RoutingTables ComputeStaticRoutes(const IslTopology& topology, uint32_t numThreads) {
+    RoutingTables routes(topology.numSatellites);
+    RecomputeRoutes(topology, RouteMetric::HOPS, AllSources(topology.numSatellites), routes,
+                    nullptr, nullptr, numThreads);
     return routes;
 }
 
+RoutingTables ComputeDelayRoutes(const IslTopology& topology, uint32_t numThreads) {
+    if (topology.linkDelay.size() != topology.adjacency.size()) {
+        return RoutingTables(); // No link delays assigned
+    }
+    RoutingTables routes(topology.numSatellites);
+    RecomputeRoutes(topology, RouteMetric::DELAY, AllSources(topology.numSatellites), routes,
+                    nullptr, nullptr, numThreads);
+    return routes;
+}
+
+std::vector<uint32_t> FindAffectedSources(const std::vector<double>& distances,
+                                          const std::vector<uint32_t>& parents, uint32_t numSatellites,
+                                          const std::vector<LinkCostChange>& changes) {
+    std::vector<uint32_t> affected;
+    if (changes.empty()) {
+        return affected;
+    }
+
+    // Edge a → b newly shortens or ties the path to b under the new cost
+    auto improves = [](double da, double db, double cost) {
+        return da != std::numeric_limits<double>::infinity() && da + cost <= db;
+    };
+
+    for (uint32_t src = 0; src < numSatellites; ++src) {
+        size_t rowStart = static_cast<size_t>(src) * numSatellites;
+        const double* dist = distances.data() + rowStart;
+        const uint32_t* parent = parents.data() + rowStart;
+        for (const LinkCostChange& change : changes) {
+            const uint32_t a = change.satA;
+            const uint32_t b = change.satB;
+            bool hit;
+            if (change.newCost > change.oldCost) {
+                // Increase (or link down): only matters on a tree edge
+                hit = parent[b] == a || parent[a] == b;
+            } else {
+                // Decrease (or link up)
+                hit = improves(dist[a], dist[b], change.newCost) ||
+                      improves(dist[b], dist[a], change.newCost);
+            }
+            if (hit) {
+                affected.push_back(src);
+                break;
+            }
+        }
+    }
+    return affected;
+}
+
 uint32_t GetHopCount(const RoutingTables& routes, uint32_t src, uint32_t dst) {
     if (src == dst) return 0;
 
     uint32_t hops = 0;
     uint32_t current = src;
-    std::set<uint32_t> visited;
 
     while (current != dst) {
-        if (visited.count(current)) {
-            return UINT32_MAX; // Loop detected
-        }
-        visited.insert(current);
-
         current = routes.GetNextHop(current, dst);
         if (current == UINT32_MAX) {
             return UINT32_MAX; // No route
         }
 
         hops++;
-        if (hops > 100) {
-            return UINT32_MAX; // Infinite loop protection
+        if (hops >= routes.GetNumSatellites()) {
+            return UINT32_MAX; // Loop detected (a simple path has < V hops)
         }
     }
 
@@ -1,17 +1,17 @@
 /**
  * Static ISL Routing
  *
- * Purpose: Compute and store static routing tables for ISL mesh using Dijkstra's algorithm
- * Design: All-pairs shortest path with next-hop lookup tables
+ * Purpose: Compute and store static routing tables for ISL mesh (all-pairs BFS)
+ * Design: All-pairs shortest path with a flat next-hop matrix
  * Use case: Phase 3 Week 17 - Static routing baseline before OLSR comparison
  *
  * Research Evidence:
  * - Static routing optimal for stable LEO topologies (minimal link churn)
  * - Zero routing overhead (no control messages)
- * - Dijkstra optimal for uniform-cost graphs (all ISL links = 1 hop cost)
+ * - BFS optimal for uniform-cost graphs (all ISL links = 1 hop cost)
  *
  * Performance Targets:
- * - Compute routing tables: <1ms for 24 satellites
+ * - Compute routing tables: <1ms for 24 satellites, well under 1s for 1584
  * - Next-hop lookup: O(1) constant time
  * - Memory: O(V²) where V = number of satellites
  */
@@ -26,25 +26,59 @@
 
 namespace ns3 {
 
+/**
+ * Path metric of static ISL routes
+ */
+enum class RouteMetric {
+    HOPS,   // Minimum hop count (--isl-routing=static)
+    DELAY   // Minimum propagation delay (--isl-routing=static-delay)
+};
+
 /**
  * Static routing tables for ISL mesh
  *
- * Data structure: nextHop[src][dst] = next hop from src to dst
- * Lookup: O(1) average case (hash map)
- * Memory: O(V²) where V = number of satellites
+ * Data structure: flat row-major V×V next-hop matrix, nextHop[src * V + dst]
+ * Entries are uint16_t for V < 65535 (uint32_t otherwise)
+ * Lookup: O(1) (one array index)
+ * Memory: V² × 2 bytes (1584 satellites: 5 MB)
  */
 class RoutingTables {
 public:
+    /**
+     * Create empty tables (grown by SetNextHop)
+     */
+    RoutingTables();
+
+    /**
+     * Create tables for numSatellites satellites, all entries "no route"
+     */
+    explicit RoutingTables(uint32_t numSatellites);
+
+    /**
+     * Get number of satellites (matrix dimension V)
+     */
+    uint32_t GetNumSatellites() const { return m_numSatellites; }
+
     /**
      * Get next hop for routing from src to dst
      * @param src Source satellite ID
      * @param dst Destination satellite ID
      * @return Next hop satellite ID, or UINT32_MAX if no route exists
      */
-    uint32_t GetNextHop(uint32_t src, uint32_t dst) const;
+    uint32_t GetNextHop(uint32_t src, uint32_t dst) const {
+        if (src >= m_numSatellites || dst >= m_numSatellites) {
+            return UINT32_MAX;
+        }
+        size_t index = static_cast<size_t>(src) * m_numSatellites + dst;
+        if (m_wide) {
+            return m_nextHop32[index];
+        }
+        uint16_t hop = m_nextHop16[index];
+        return hop == NO_ROUTE_16 ? UINT32_MAX : hop;
+    }
 
     /**
-     * Set next hop for routing from src to dst
+     * Set next hop for routing from src to dst (grows the matrix if needed)
      * @param src Source satellite ID
      * @param dst Destination satellite ID
      * @param nextHop Next hop satellite ID
@@ -59,25 +93,128 @@ public:
     std::map<uint32_t, uint32_t> GetAllNextHops(uint32_t src) const;
 
 private:
-    // nextHop[src][dst] = next hop from src to dst
-    std::map<uint32_t, std::map<uint32_t, uint32_t>> m_nextHop;
+    friend void RecomputeRoutes(const IslTopology& topology, RouteMetric metric,
+                                const std::vector<uint32_t>& sources, RoutingTables& routes,
+                                std::vector<double>* distances, std::vector<uint32_t>* parents,
+                                uint32_t numThreads);
+
+    static constexpr uint16_t NO_ROUTE_16 = UINT16_MAX;
+
+    /**
+     * Reallocate to numSatellites × numSatellites, keeping existing entries
+     */
+    void Resize(uint32_t numSatellites);
+
+    uint32_t m_numSatellites;
+    bool m_wide;                        // uint32_t entries (V >= 65535)
+    std::vector<uint16_t> m_nextHop16;  // nextHop[src * V + dst], NO_ROUTE_16 = no route
+    std::vector<uint32_t> m_nextHop32;  // nextHop[src * V + dst], UINT32_MAX = no route
 };
 
 /**
- * Compute static routing tables using Dijkstra's algorithm
+ * Compute static routing tables with one breadth-first search per source
+ *
+ * Algorithm (every ISL hop costs 1):
+ * 1. For each source satellite, BFS level by level over the CSR adjacency
+ * 2. The first hop is propagated during traversal: a node discovered from
+ *    the source is its own first hop, any other node inherits the first hop
+ *    of the node that discovered it
+ * 3. First hops are written directly into the source's matrix row
  *
- * Algorithm:
- * 1. For each source satellite, run Dijkstra to compute shortest paths
- * 2. Extract next-hop from predecessor array
- * 3. Store in routing tables
+ * Each level is visited in ascending satellite id, so among equal-length
+ * paths the predecessor is the lowest-id node of the previous level (the
+ * tie-breaking of the earlier priority-queue Dijkstra).
  *
- * Complexity: O(V × (V² + E)) = O(V³) for dense graph
- * For 24 satellites: ~14,000 operations (negligible)
+ * Sources are independent (each writes only its own row) and are split
+ * across threads.
+ *
+ * Complexity: O(V × (V log V + E)), no per-destination path walk
+ * For 1584 satellites: ~2.5M (src, dst) pairs in tens of milliseconds
  *
  * @param topology ISL topology (from isl-topology-generator)
+ * @param numThreads Worker threads (0 = hardware concurrency; small
+ *                   constellations always run on the calling thread)
  * @return Routing tables with next-hop for each (src, dst) pair
  */
-RoutingTables ComputeStaticRoutes(const IslTopology& topology);
+RoutingTables ComputeStaticRoutes(const IslTopology& topology, uint32_t numThreads = 0);
+
+/**
+ * Compute minimum-latency static routing tables (--isl-routing=static-delay)
+ *
+ * Algorithm: one binary-heap Dijkstra per source over the CSR adjacency,
+ * weighted by the per-link propagation delays (AssignLinkDelays). As in
+ * ComputeStaticRoutes, first hops are propagated on every relaxation and
+ * written into the source's matrix row, and sources are split across threads.
+ *
+ * Complexity: O(V × E log V)
+ *
+ * @param topology ISL topology with link delays
+ * @param numThreads Worker threads (0 = hardware concurrency)
+ * @return Routing tables minimizing end-to-end propagation delay, or empty
+ *         tables if the topology has no link delays
+ */
+RoutingTables ComputeDelayRoutes(const IslTopology& topology, uint32_t numThreads = 0);
+
+/**
+ * Recompute the routing-table rows of selected sources
+ *
+ * Runs the per-source search of ComputeStaticRoutes (HOPS) or
+ * ComputeDelayRoutes (DELAY) for the listed sources only, overwriting their
+ * rows; all other rows are left untouched. Links with linkUp == 0 are
+ * skipped. Used for incremental route repair after topology changes
+ * (IslTopologyUpdater).
+ *
+ * @param topology ISL topology (DELAY needs link delays)
+ * @param metric Path metric
+ * @param sources Source satellites whose rows are recomputed
+ * @param routes Routing tables (resized to the topology if needed)
+ * @param distances If not null, V×V row-major path costs (hops or seconds,
+ *                  infinity if unreachable); the rows of sources are overwritten
+ * @param parents If not null, V×V row-major predecessors in each source's
+ *                BFS/Dijkstra tree (UINT32_MAX for the source itself and
+ *                unreachable satellites); the rows of sources are overwritten
+ * @param numThreads Worker threads (0 = hardware concurrency)
+ */
+void RecomputeRoutes(const IslTopology& topology, RouteMetric metric,
+                     const std::vector<uint32_t>& sources, RoutingTables& routes,
+                     std::vector<double>* distances = nullptr, std::vector<uint32_t>* parents = nullptr,
+                     uint32_t numThreads = 0);
+
+/**
+ * Cost change of one ISL (both directions) between two routing epochs
+ *
+ * Costs are 1 (HOPS) or the propagation delay (DELAY) while the link is up,
+ * infinity while it is down.
+ */
+struct LinkCostChange {
+    uint32_t satA;
+    uint32_t satB;
+    double oldCost;
+    double newCost;
+};
+
+/**
+ * Find the sources whose routes may change after link cost changes
+ *
+ * Each source is checked against the tree its last search produced:
+ * - a cost increase (or link down) matters only if the link is a tree edge
+ *   (parent[b] == a or parent[a] == b); otherwise the tree, its distances
+ *   and the search's tie-breaking are unchanged
+ * - a cost decrease (or link up) matters only if it newly improves or ties
+ *   a path (dist[a] + newCost <= dist[b], in either direction)
+ * Every other source keeps exactly the distances and first hops a full
+ * recomputation would produce, so RecomputeRoutes on the returned sources
+ * repairs the tables.
+ *
+ * @param distances V×V path costs of the current routes (RecomputeRoutes)
+ * @param parents V×V tree predecessors of the current routes (RecomputeRoutes)
+ * @param numSatellites V
+ * @param changes Changed links
+ * @return Affected sources in ascending order
+ */
+std::vector<uint32_t> FindAffectedSources(const std::vector<double>& distances,
+                                          const std::vector<uint32_t>& parents, uint32_t numSatellites,
+                                          const std::vector<LinkCostChange>& changes);
 
 /**
  * Get hop count from src to dst using routing tables
@@ -29,12 +29,13 @@ void StaticRoutingProtocol::Install(NodeContainer islNodes, NodeContainer ground
 }
 
 void StaticRoutingProtocol::SetParameter(std::string key, std::string value) {
-    // Static routing has no configurable parameters
-    // Ignore all parameter sets
+    if (key == "metric" && (value == "hops" || value == "delay")) {
+        m_metric = value;
+    }
 }
 
 std::string StaticRoutingProtocol::GetConfig() const {
-    return "Static[no_parameters]";
+    return "Static[metric=" + m_metric + "]";
 }
 
 } // namespace ns3
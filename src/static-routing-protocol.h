@@ -10,6 +10,8 @@
  * - Control bytes: 0 (no control packets)
  * - Convergence: Instant (pre-computed)
  * - Failures: No automatic rerouting (static routes)
+ * - Parameters: metric = "hops" (default) or "delay" (minimum propagation
+ *   delay, --isl-routing=static-delay)
  */
 
 #ifndef STATIC_ROUTING_PROTOCOL_H
@@ -32,11 +34,19 @@ public:
     ~StaticRoutingProtocol() override = default;
 
     void Install(NodeContainer islNodes, NodeContainer groundNodes) override;
-    std::string GetName() const override { return "Static"; }
+    std::string GetName() const override { return m_metric == "delay" ? "Static-Delay" : "Static"; }
     std::string GetCategory() const override { return "static"; }
     uint64_t GetControlBytes() const override { return 0; } // No control packets
     void SetParameter(std::string key, std::string value) override;
     std::string GetConfig() const override;
+
+    /**
+     * Get path metric ("hops" or "delay").
+     */
+    const std::string& GetMetric() const { return m_metric; }
+
+private:
+    std::string m_metric = "hops";  // Path metric for the pre-computed routes
 };
 
 } // namespace ns3
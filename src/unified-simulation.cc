@@ -5,7 +5,7 @@
  *
  * Factory-based protocol selection for ISL + ground routing.
  * Supports multiple routing protocols via command-line:
- * - ISL protocols: static, olsr
+ * - ISL protocols: static (minimum hops), static-delay (minimum propagation delay), olsr
  * - Ground protocols: aodv, olsr, dsdv
  *
  * Usage:
@@ -16,8 +16,55 @@
  *   # Satellite-only mode (NC9 alpha coefficient measurement)
  *   ./build/unified-simulation --satellite-only=true --time=60 --seed=1
  *
+ *   # Other Walker constellations (T/P/F), e.g. a Starlink-like 53:1584/72/39 shell
+ *   ./build/unified-simulation --satellite-only=true --satellites=1584 --walker-planes=72 \
+ *       --walker-phasing=39 --time=60 --seed=1
+ *
  *   # Ground-only mode (NC9 beta/gamma measurement, NC10 control experiment)
  *   ./build/unified-simulation --ground-only=true --ground-routing=aodv --time=60 --seed=1
+ *
+ *   # Multi-seed batch: one process, one CSV per seed ({seed} in --output,
+ *   # or "_seed<N>" appended before the extension)
+ *   ./build/unified-simulation --ground-only=true --ground-routing=aodv --seeds=1-15 \
+ *       --output='results/nc9_overhead_invariance/ground_only/aodv_seed{seed}.csv'
+ *
+ *   # Fork server: build the satellite layer once, fork one child per
+ *   # (ground protocol, seed); children send their CSV back over a pipe
+ *   ./build/unified-simulation --ground-routing=aodv,olsr,dsdv --seeds=1-15 \
+ *       --fork-server=true --fork-jobs=8 --output='results/dual/{protocol}_seed{seed}.csv'
+ *
+ *   # NRL(t): PacketTracer counters in 100 ms bins → <output>.timeseries.csv
+ *   ./build/unified-simulation --ground-only=true --ground-routing=olsr --nrl-bin-ms=100 \
+ *       --output=results/olsr_seed1.csv
+ *
+ *   # Control overhead per node and message type → <output>.control.csv
+ *   ./build/unified-simulation --ground-only=true --ground-routing=aodv --control-breakdown=true
+ *
+ *   # Binary per-packet event trace → <output>.events.bin (analysis/packet_events.py)
+ *   ./build/unified-simulation --ground-only=true --ground-routing=aodv --packet-events=true
+ *
+ *   # PDR/delay from per-flow endpoint stamps instead of FlowMonitor on every node
+ *   ./build/unified-simulation --satellite-only=true --flow-stats=lite
+ *
+ *   # Warmup fork: run routing to convergence once, then fork one child per
+ *   # traffic load ("rate[:flows]"), each continuing from the converged state
+ *   ./build/unified-simulation --ground-only=true --ground-routing=aodv --seed=1 \
+ *       --fork-traffic=1Mbps:5,2Mbps:5,4Mbps:3 --output='results/load/aodv_{traffic}.csv'
+ *
+ * Batch mode resets the simulator, RNG stream allocation and address
+ * generators between seeds, so every seed's results are bit-identical to a
+ * separate --seed=N invocation; only process startup and argument parsing
+ * are shared.
+ *
+ * Fork-server results are statistically equivalent but NOT bit-identical to
+ * separate invocations: the shared layer is built before the seed is known
+ * and re-seeded in each child (SetSeed + AssignStreams), and the ground layer
+ * is built after the ISL layer, so random variables map to other streams.
+ *
+ * Warmup-fork variants share everything up to CONVERGENCE_TIME, including
+ * the routing control traffic and the RNG state (common random numbers), so
+ * differences between them are due to the traffic load alone. Their
+ * runtime_seconds covers only the post-warmup part of the run.
  */
 
 #include "ns3/core-module.h"
@@ -32,21 +79,50 @@
 #include "isl-topology-generator.h"
 #include "isl-network-creator.h"
 #include "static-isl-routing.h"
+#include "isl-topology-updater.h"
+#include "orbital-ephemeris.h"
+#include "ephemeris-mobility-model.h"
 #include "manhattan-mobility-helper.h"
 #include "packet-tracer.h"
+#include "flow-stats-collector.h"
 #include <fstream>
 #include <iomanip>
 #include <chrono>
+#include <sstream>
+#include <vector>
+#include <map>
+#include <functional>
+#include <cerrno>
+#include <cstring>
+#include <fcntl.h>
+#include <sys/wait.h>
+#include <unistd.h>
 
 using namespace ns3;
 
 NS_LOG_COMPONENT_DEFINE("UnifiedSimulation");
 
-int main(int argc, char *argv[]) {
-    // Parse command-line arguments
+// Ground mesh flows: node 0 → last node plus up to four fixed pairs
+static const uint32_t MAX_GROUND_FLOWS = 5;
+
+// Satellite test flows use fixed satellite ids up to 23
+static const uint32_t MIN_SATELLITES = 24;
+
+// Routing protocols converge before traffic starts at this time (seconds)
+static const double CONVERGENCE_TIME = 20.0;
+
+/**
+ * Command-line configuration shared by every seed of a run.
+ */
+struct SimConfig {
     std::string islRouting = "static";
     std::string groundRouting = "aodv";
     uint32_t satellites = 24;
+    uint32_t walkerPlanes = 3;    // Walker P (must divide --satellites)
+    uint32_t walkerPhasing = 0;   // Walker F (0 to P-1)
+    std::string walkerType = "delta";  // delta (RAAN over 360°) | star (RAAN over 180°)
+    double inclination = 53.0;    // Orbit inclination (degrees)
+    double altitude = 550.0;      // Orbit altitude (km)
     uint32_t groundNodes = 20;
     double groundArea = 10000.0;  // 10 km radius
     double groundSpeed = 1.4;     // 1.4 m/s pedestrian
@@ -55,43 +131,190 @@ int main(int argc, char *argv[]) {
     double groundBounds = 500.0;  // Week 24: ground area bounds (m)
     uint32_t manhattanBlocks = 5;  // Week 26: Manhattan grid size (5×5 blocks)
     double manhattanBlockSize = 100.0;  // Week 26: Manhattan block size (100m)
+    std::string groundRate = "1Mbps";  // Per ground flow (OnOff constant rate)
+    uint32_t groundFlows = MAX_GROUND_FLOWS;  // Ground flows (1-5)
+    double nrlBinMs = 0.0;       // PacketTracer time-bin width (0 = run totals only)
+    bool controlBreakdown = false;  // Write per-node control bytes per message type
+    bool packetEvents = false;   // Binary per-packet event trace (<output>.events.bin)
+    std::string flowStats = "flowmon";  // PDR/delay source: flowmon (all nodes) | lite (flow endpoints)
+    double topologyEpoch = 0.0;  // ISL position/link/route update period (s, 0 = static topology)
+    double polarCutoff = 70.0;   // Inter-plane ISLs are down above this latitude (degrees)
+    std::string ephemerisDir;    // Shared ephemeris cache directory (empty = propagate in-process)
+    double ephemerisStep = 10.0; // Ephemeris grid step (s)
+    bool j2 = false;             // J2 secular perturbations in the orbit propagation
     double simTime = 60.0;
     uint32_t seed = 1;
+    std::string seeds;           // Batch mode: "1-15" or "1,3,5" (overrides seed)
     bool satelliteOnly = false;  // Week 28: Satellite-only mode (no ground layer)
     bool groundOnly = false;     // Week 28: Ground-only mode (no satellite layer)
+    bool forkServer = false;     // Build the satellite layer once, fork per seed/protocol
+    uint32_t forkJobs = 1;       // Concurrent fork-server / warmup-fork children
+    std::string forkTraffic;     // Warmup fork: "1Mbps:5,2Mbps:5" (rate[:flows] per child)
     std::string outputFile = "results/unified_output.csv";
+};
+
+/**
+ * Metrics of one simulation run (one result CSV).
+ */
+struct RunResult {
+    std::string islName;
+    std::string islCategory;
+    std::string groundName;
+    std::string groundCategory;
+    uint64_t txPackets = 0;
+    uint64_t rxPackets = 0;
+    double pdr = 0.0;
+    double avgDelayMs = 0.0;
+    int64_t runtimeSeconds = 0;
+    uint64_t dataBytesTx = 0;
+    uint64_t controlBytesTx = 0;
+    double nrl = 0.0;
+    std::string timeSeriesCsv;   // PacketTracer time bins (empty unless --nrl-bin-ms)
+    uint64_t controlBytesByType[CONTROL_MESSAGE_TYPES] = {};  // Control bytes TX per message type
+    std::string controlBreakdownCsv;  // Per-node breakdown (empty unless --control-breakdown)
+    uint64_t islProtocolControlBytes = 0;     // Counted by the ISL protocol itself
+    uint64_t groundProtocolControlBytes = 0;  // Counted by the ground protocol itself
+};
+
+/**
+ * Parse a seed list such as "1-15", "1,3,5" or "1-5,9".
+ *
+ * @return false if the list is empty or malformed
+ */
+static bool ParseSeedList(const std::string& spec, std::vector<uint32_t>& seeds) {
+    std::stringstream items(spec);
+    std::string item;
+    while (std::getline(items, item, ',')) {
+        if (item.empty()) {
+            continue;
+        }
+        try {
+            size_t dash = item.find('-');
+            if (dash == std::string::npos) {
+                seeds.push_back(std::stoul(item));
+            } else {
+                uint32_t first = std::stoul(item.substr(0, dash));
+                uint32_t last = std::stoul(item.substr(dash + 1));
+                if (last < first) {
+                    return false;
+                }
+                for (uint32_t s = first; s <= last; ++s) {
+                    seeds.push_back(s);
+                }
+            }
+        } catch (const std::exception&) {
+            return false;
+        }
+    }
+    return !seeds.empty();
+}
+
+/**
+ * Output path for one seed of a batch: replaces "{seed}" in the pattern, or
+ * inserts "_seed<N>" before the extension when the pattern has no placeholder.
+ */
+static std::string SeedOutputFile(const std::string& pattern, uint32_t seed) {
+    std::string path = pattern;
+    size_t pos = path.find("{seed}");
+    if (pos != std::string::npos) {
+        return path.replace(pos, 6, std::to_string(seed));
+    }
+    size_t dot = path.rfind('.');
+    size_t slash = path.rfind('/');
+    if (dot == std::string::npos || (slash != std::string::npos && dot < slash)) {
+        dot = path.size();
+    }
+    return path.insert(dot, "_seed" + std::to_string(seed));
+}
+
+/**
+ * Sidecar path next to a run CSV, e.g. "<output>.timeseries.csv", with a
+ * trailing ".csv" of the run CSV dropped first.
+ */
+static std::string SidecarFile(const std::string& outputFile, const std::string& suffix) {
+    std::string stem = outputFile;
+    if (stem.size() >= 4 && stem.compare(stem.size() - 4, 4, ".csv") == 0) {
+        stem.resize(stem.size() - 4);
+    }
+    return stem + suffix;
+}
 
+/**
+ * Parse command-line arguments into config.
+ */
+static void ParseConfig(int argc, char *argv[], SimConfig& config) {
     CommandLine cmd;
-    cmd.AddValue("isl-routing", "ISL protocol (static|olsr|aodv)", islRouting);
-    cmd.AddValue("ground-routing", "Ground protocol (aodv|olsr|dsdv)", groundRouting);
-    cmd.AddValue("satellites", "Number of satellites", satellites);
-    cmd.AddValue("ground-nodes", "Number of ground mesh nodes", groundNodes);
-    cmd.AddValue("ground-area", "Ground area radius (m)", groundArea);
-    cmd.AddValue("ground-speed", "Ground node speed (m/s)", groundSpeed);
-    cmd.AddValue("ground-mobility", "Ground mobility model (static|waypoint|manhattan)", groundMobility);
-    cmd.AddValue("ground-pause", "Pause time at waypoints (seconds)", groundPause);
-    cmd.AddValue("ground-bounds", "Ground area bounds (m, square area)", groundBounds);
-    cmd.AddValue("manhattan-blocks", "Manhattan grid size (N×N blocks)", manhattanBlocks);
-    cmd.AddValue("manhattan-block-size", "Manhattan block size (meters)", manhattanBlockSize);
-    cmd.AddValue("time", "Simulation time (s)", simTime);
-    cmd.AddValue("seed", "Random seed", seed);
-    cmd.AddValue("satellite-only", "Run satellite-only mode (no ground layer)", satelliteOnly);
-    cmd.AddValue("ground-only", "Run ground-only mode (no satellite layer)", groundOnly);
-    cmd.AddValue("output", "Output CSV file", outputFile);
+    cmd.AddValue("isl-routing", "ISL protocol (static|static-delay|olsr|aodv)", config.islRouting);
+    cmd.AddValue("ground-routing", "Ground protocol (aodv|olsr|dsdv)", config.groundRouting);
+    cmd.AddValue("satellites", "Number of satellites", config.satellites);
+    cmd.AddValue("walker-planes", "Walker orbital planes P (must divide --satellites)", config.walkerPlanes);
+    cmd.AddValue("walker-phasing", "Walker phasing factor F (0 to P-1)", config.walkerPhasing);
+    cmd.AddValue("walker-type", "Walker constellation type (delta|star)", config.walkerType);
+    cmd.AddValue("inclination", "Orbit inclination (degrees)", config.inclination);
+    cmd.AddValue("altitude", "Orbit altitude (km)", config.altitude);
+    cmd.AddValue("ground-nodes", "Number of ground mesh nodes", config.groundNodes);
+    cmd.AddValue("ground-area", "Ground area radius (m)", config.groundArea);
+    cmd.AddValue("ground-speed", "Ground node speed (m/s)", config.groundSpeed);
+    cmd.AddValue("ground-mobility", "Ground mobility model (static|waypoint|manhattan)", config.groundMobility);
+    cmd.AddValue("ground-pause", "Pause time at waypoints (seconds)", config.groundPause);
+    cmd.AddValue("ground-bounds", "Ground area bounds (m, square area)", config.groundBounds);
+    cmd.AddValue("manhattan-blocks", "Manhattan grid size (N×N blocks)", config.manhattanBlocks);
+    cmd.AddValue("manhattan-block-size", "Manhattan block size (meters)", config.manhattanBlockSize);
+    cmd.AddValue("ground-rate", "Data rate per ground flow", config.groundRate);
+    cmd.AddValue("ground-flows", "Number of ground flows (1-5)", config.groundFlows);
+    cmd.AddValue("control-breakdown", "Write per-node control bytes per message type to <output>.control.csv", config.controlBreakdown);
+    cmd.AddValue("packet-events", "Write a binary per-packet event trace to <output>.events.bin", config.packetEvents);
+    cmd.AddValue("flow-stats", "PDR/delay collection (flowmon|lite)", config.flowStats);
+    cmd.AddValue("topology-epoch", "Update satellite positions, ISL states/delays and static routes every N seconds (0 = static)", config.topologyEpoch);
+    cmd.AddValue("polar-cutoff", "Latitude above which inter-plane ISLs are down (degrees, with --topology-epoch)", config.polarCutoff);
+    cmd.AddValue("ephemeris-dir", "Precomputed orbit cache directory, generated on first use (satellites follow EphemerisMobilityModel)", config.ephemerisDir);
+    cmd.AddValue("ephemeris-step", "Ephemeris grid step (s, with --ephemeris-dir)", config.ephemerisStep);
+    cmd.AddValue("j2", "Include J2 secular perturbations in the orbit propagation", config.j2);
+    cmd.AddValue("nrl-bin-ms", "Write control/data bytes per time bin (ms) to <output>.timeseries.csv", config.nrlBinMs);
+    cmd.AddValue("time", "Simulation time (s)", config.simTime);
+    cmd.AddValue("seed", "Random seed", config.seed);
+    cmd.AddValue("seeds", "Seed list for batch mode, e.g. 1-15 or 1,3,5 (overrides --seed)", config.seeds);
+    cmd.AddValue("satellite-only", "Run satellite-only mode (no ground layer)", config.satelliteOnly);
+    cmd.AddValue("ground-only", "Run ground-only mode (no satellite layer)", config.groundOnly);
+    cmd.AddValue("fork-server", "Share the satellite layer across seeds/protocols via fork()", config.forkServer);
+    cmd.AddValue("fork-jobs", "Concurrent children in fork-server/warmup-fork mode", config.forkJobs);
+    cmd.AddValue("fork-traffic", "Fork after warmup into traffic variants, e.g. 1Mbps:5,2Mbps:5", config.forkTraffic);
+    cmd.AddValue("output", "Output CSV file ({seed}/{protocol} are replaced in batch/fork-server mode)", config.outputFile);
     cmd.Parse(argc, argv);
+}
 
+/**
+ * Walker constellation parameters from the command line.
+ */
+static WalkerConstellation GetWalkerConstellation(const SimConfig& config) {
+    WalkerConstellation walker;
+    walker.totalSatellites = config.satellites;
+    walker.planes = config.walkerPlanes;
+    walker.phasing = config.walkerPhasing;
+    walker.inclinationDeg = config.inclination;
+    walker.altitudeKm = config.altitude;
+    walker.star = (config.walkerType == "star");
+    return walker;
+}
+
+/**
+ * Validate config and apply isolation-mode adjustments.
+ *
+ * @return 0 if the configuration is runnable, otherwise the process exit code
+ */
+static int ValidateConfig(SimConfig& config) {
     // Validate mode exclusivity
-    if (satelliteOnly && groundOnly) {
+    if (config.satelliteOnly && config.groundOnly) {
         std::cerr << "ERROR: Cannot use both --satellite-only and --ground-only flags\n";
         return 1;
     }
 
     // Validate simulation time (applications start at t=20s, stop at t=simTime-10s)
     // Required: start time (20s) + minimum traffic duration (30s) + buffer (5s) = 55s
-    const double CONVERGENCE_TIME = 20.0;  // Time for routing protocol convergence
     const double MIN_TRAFFIC_DURATION = 30.0;  // Minimum traffic duration
     const double END_BUFFER = 10.0;  // Buffer before simulation end
     const double MIN_SIM_TIME = CONVERGENCE_TIME + MIN_TRAFFIC_DURATION + END_BUFFER;
+    const double simTime = config.simTime;
 
     if (simTime < MIN_SIM_TIME) {
         std::cerr << "ERROR: simTime (" << simTime << "s) is too short for traffic generation!\n";
@@ -105,18 +328,137 @@ int main(int argc, char *argv[]) {
         return 1;
     }
 
+    // Protocol lists (aodv,olsr,dsdv) are only meaningful when forking per protocol
+    if (config.groundRouting.find(',') != std::string::npos && !config.forkServer) {
+        std::cerr << "ERROR: A --ground-routing list requires --fork-server=true\n";
+        return 1;
+    }
+    if (config.forkJobs == 0) {
+        config.forkJobs = 1;
+    }
+    if (config.flowStats != "flowmon" && config.flowStats != "lite") {
+        std::cerr << "ERROR: --flow-stats must be flowmon or lite\n";
+        return 1;
+    }
+    if (config.topologyEpoch < 0.0) {
+        std::cerr << "ERROR: --topology-epoch must be >= 0\n";
+        return 1;
+    }
+    if (config.polarCutoff <= 0.0 || config.polarCutoff > 90.0) {
+        std::cerr << "ERROR: --polar-cutoff must be in (0, 90]\n";
+        return 1;
+    }
+    if (config.ephemerisStep <= 0.0) {
+        std::cerr << "ERROR: --ephemeris-step must be > 0\n";
+        return 1;
+    }
+    if (config.nrlBinMs < 0.0) {
+        std::cerr << "ERROR: --nrl-bin-ms must be >= 0\n";
+        return 1;
+    }
+    if (config.groundFlows == 0 || config.groundFlows > MAX_GROUND_FLOWS) {
+        std::cerr << "ERROR: --ground-flows must be between 1 and " << MAX_GROUND_FLOWS << "\n";
+        return 1;
+    }
+    if (!config.forkTraffic.empty()) {
+        if (config.forkServer) {
+            std::cerr << "ERROR: --fork-traffic and --fork-server cannot be combined\n";
+            return 1;
+        }
+        if (config.satelliteOnly || config.groundNodes == 0) {
+            std::cerr << "ERROR: --fork-traffic varies ground traffic and needs the ground layer\n";
+            return 1;
+        }
+        if (config.packetEvents) {
+            // The warmup's events would be buffered in the parent and duplicated in every child
+            std::cerr << "ERROR: --packet-events cannot be combined with --fork-traffic\n";
+            return 1;
+        }
+    }
+
     // Auto-adjust node counts for isolation modes
-    if (satelliteOnly && groundNodes > 0) {
+    if (config.satelliteOnly && config.groundNodes > 0) {
         std::cout << "NOTE: Ignoring --ground-nodes parameter in satellite-only mode\n";
-        groundNodes = 0;  // Force no ground nodes
+        config.groundNodes = 0;  // Force no ground nodes
     }
-    if (groundOnly && satellites > 0) {
+    if (config.groundOnly && config.satellites > 0) {
         std::cout << "NOTE: Ignoring --satellites parameter in ground-only mode\n";
-        satellites = 0;  // Force no satellites
+        config.satellites = 0;  // Force no satellites
+    }
+
+    // Constellation shape (satellite traffic uses fixed satellites 0-23)
+    if (!config.groundOnly) {
+        if (config.walkerType != "delta" && config.walkerType != "star") {
+            std::cerr << "ERROR: --walker-type must be delta or star\n";
+            return 1;
+        }
+        if (!GetWalkerConstellation(config).IsValid()) {
+            std::cerr << "ERROR: --walker-planes must divide --satellites and --walker-phasing must be below --walker-planes\n";
+            return 1;
+        }
+        if (config.satellites < MIN_SATELLITES) {
+            std::cerr << "ERROR: --satellites must be >= " << MIN_SATELLITES
+                      << " (satellite test flows use satellites 0-23)\n";
+            return 1;
+        }
     }
+    return 0;
+}
 
-    // Set RNG seed
+/**
+ * Reset process-wide state that survives Simulator::Destroy, so a seed run
+ * inside a batch sees exactly what a fresh process would.
+ *
+ * - RNG: seed, and the global stream index handed to each new random
+ *   variable (otherwise the second seed draws from different substreams)
+ * - IPv4 address generator (10.1.0.0/16 and ISL /30s are re-assigned)
+ *
+ * Node, channel and MAC address allocation are reset by Simulator::Destroy.
+ */
+static void ResetRunState(uint32_t seed) {
     RngSeedManager::SetSeed(seed);
+    RngSeedManager::ResetNextStreamIndex();
+    Ipv4AddressGenerator::Reset();
+}
+
+/**
+ * Nodes, devices and protocols of one run.
+ */
+struct Scenario {
+    NodeContainer satNodes;
+    IslTopology topology;
+    NodeContainer meshNodes;
+    std::unique_ptr<RoutingProtocol> islProtocol;
+    std::unique_ptr<RoutingProtocol> groundProtocol;
+    NetDeviceContainer groundDevices;
+    Ipv4InterfaceContainer groundInterfaces;
+    NetDeviceContainer islDevices;
+    Ipv4InterfaceContainer islInterfaces;
+    FlowMonitorHelper flowmon;
+    Ptr<FlowMonitor> monitor;          // Null with --flow-stats=lite
+    FlowStatsCollector flowStats;      // Used with --flow-stats=lite
+    std::unique_ptr<IslTopologyUpdater> topologyUpdater;  // Used with --topology-epoch
+    std::shared_ptr<OrbitalEphemeris> ephemeris;          // Used with --ephemeris-dir
+    PacketTracer tracer;
+};
+
+/**
+ * Print the configuration banner for one run.
+ */
+static void PrintRunHeader(const SimConfig& config, uint32_t seed) {
+    const std::string& islRouting = config.islRouting;
+    const std::string& groundRouting = config.groundRouting;
+    const uint32_t satellites = config.satellites;
+    const uint32_t groundNodes = config.groundNodes;
+    const double groundSpeed = config.groundSpeed;
+    const std::string& groundMobility = config.groundMobility;
+    const double groundPause = config.groundPause;
+    const double groundBounds = config.groundBounds;
+    const uint32_t manhattanBlocks = config.manhattanBlocks;
+    const double manhattanBlockSize = config.manhattanBlockSize;
+    const double simTime = config.simTime;
+
+    std::cout << std::defaultfloat << std::setprecision(6);  // Undo the previous run's fixed format
 
     std::cout << "\n=== Phase 4 Week 24: Unified Simulation Framework (Mobile Ground Layer) ===\n";
     std::cout << "ISL routing: " << islRouting << "\n";
@@ -136,63 +478,105 @@ int main(int argc, char *argv[]) {
     }
     std::cout << "Ground speed: " << groundSpeed << " m/s\n";
     std::cout << "Sim time: " << simTime << " seconds\n";
-    std::cout << "RNG seed: " << seed << "\n";
-    std::cout << "Output: " << outputFile << "\n\n";
+    std::cout << "RNG seed: " << seed << "\n\n";
+}
+
+/**
+ * Steps 1-2: Walker-Delta satellites and ISL topology (seed-independent).
+ */
+static void CreateSatellites(const SimConfig& config, Scenario& scenario) {
+    const uint32_t satellites = config.satellites;
+    const bool groundOnly = config.groundOnly;
+    NodeContainer& satNodes = scenario.satNodes;
+    IslTopology& topology = scenario.topology;
 
     // Step 1: Create satellites with constant positions (skip if ground-only mode)
     std::cout << "[1/9] Creating " << satellites << " satellites...\n";
-    NodeContainer satNodes;
     if (!groundOnly) {
         satNodes.Create(satellites);
     }
 
     // Satellite positioning and ISL topology (skip if ground-only mode)
-    IslTopology topology;
     if (!groundOnly) {
-        // Use ConstantPositionMobilityModel (Walker-Delta 53:24/3/1)
-        const double ORBIT_RADIUS = 6371000.0 + 550000.0; // Earth radius + 550 km altitude (meters)
-        const double INCLINATION = 53.0 * M_PI / 180.0;
-        const uint32_t NUM_PLANES = 3;
-        const uint32_t SATS_PER_PLANE = 8;
-
-        MobilityHelper mobility;
-        mobility.SetMobilityModel("ns3::ConstantPositionMobilityModel");
-        Ptr<ListPositionAllocator> positionAlloc = CreateObject<ListPositionAllocator>();
-
-        for (uint32_t i = 0; i < satellites; ++i) {
-        uint32_t plane = i / SATS_PER_PLANE;
-        uint32_t idx = i % SATS_PER_PLANE;
-
-        // Right Ascension of Ascending Node (RAAN)
-        double raan = plane * (360.0 / NUM_PLANES) * M_PI / 180.0;
-
-        // True Anomaly
-        double trueAnomaly = idx * (360.0 / SATS_PER_PLANE) * M_PI / 180.0;
-
-        // Convert to TEME coordinates
-        double x = ORBIT_RADIUS * (std::cos(raan) * std::cos(trueAnomaly) -
-            std::sin(raan) * std::sin(trueAnomaly) * std::cos(INCLINATION));
-        double y = ORBIT_RADIUS * (std::sin(raan) * std::cos(trueAnomaly) +
-            std::cos(raan) * std::sin(trueAnomaly) * std::cos(INCLINATION));
-        double z = ORBIT_RADIUS * std::sin(trueAnomaly) * std::sin(INCLINATION);
+        const WalkerConstellation walker = GetWalkerConstellation(config);
+        std::vector<double> satX, satY, satZ;
+        if (!config.ephemerisDir.empty()) {
+            // EphemerisMobilityModel on a shared, memory-mapped orbit table (generated once
+            // per constellation/grid, reused by every later run)
+            EphemerisParams params;
+            params.walker = walker;
+            params.j2 = config.j2;
+            params.stepS = config.ephemerisStep;
+            params.durationS = config.simTime;
+            scenario.ephemeris = std::make_shared<OrbitalEphemeris>();
+            bool generated = false;
+            std::string path = scenario.ephemeris->OpenOrGenerate(config.ephemerisDir, params, &generated);
+            NS_ABORT_MSG_IF(path.empty(), "Cannot open or generate ephemeris in " << config.ephemerisDir);
+            std::cout << "  ✓ Ephemeris " << (generated ? "generated: " : "loaded: ") << path << "\n";
+
+            satX.resize(satellites);
+            satY.resize(satellites);
+            satZ.resize(satellites);
+            for (uint32_t i = 0; i < satellites; ++i) {
+                Ptr<EphemerisMobilityModel> mobility = CreateObject<EphemerisMobilityModel>();
+                mobility->SetEphemeris(scenario.ephemeris, i);
+                satNodes.Get(i)->AggregateObject(mobility);
+
+                double position[3];
+                scenario.ephemeris->GetState(i, 0.0, position, nullptr);
+                satX[i] = position[0];
+                satY[i] = position[1];
+                satZ[i] = position[2];
+            }
+        } else {
+            // Use ConstantPositionMobilityModel (Walker i:T/P/F, default Walker-Delta 53:24/3/0)
+            // at the t=0 positions (--topology-epoch moves them along their orbits)
+            ComputeWalkerPositions(walker, 0.0, satX, satY, satZ, config.j2);
 
-        positionAlloc->Add(Vector(x, y, z));
-    }
+            MobilityHelper mobility;
+            mobility.SetMobilityModel("ns3::ConstantPositionMobilityModel");
+            Ptr<ListPositionAllocator> positionAlloc = CreateObject<ListPositionAllocator>();
+            for (uint32_t i = 0; i < satellites; ++i) {
+                positionAlloc->Add(Vector(satX[i], satY[i], satZ[i]));
+            }
 
-        mobility.SetPositionAllocator(positionAlloc);
-        mobility.Install(satNodes);
+            mobility.SetPositionAllocator(positionAlloc);
+            mobility.Install(satNodes);
+        }
 
-        std::cout << "  ✓ Satellites positioned in Walker-Delta 53:24/3/1\n";
+        std::cout << "  ✓ Satellites positioned in Walker-" << (walker.star ? "Star " : "Delta ")
+                  << walker.inclinationDeg << ":" << walker.totalSatellites << "/"
+                  << walker.planes << "/" << walker.phasing << "\n";
 
         // Step 2: Generate ISL topology (before installing routing)
         std::cout << "[2/9] Generating ISL topology (4 neighbors per satellite)...\n";
-        topology = GenerateWalkerDeltaTopology(satellites, 4);
+        topology = GenerateWalkerTopology(walker, 4);
         std::cout << "  ✓ ISL topology: " << topology.numSatellites << " satellites, "
             << topology.numLinks << " bidirectional links\n";
+
+        // Per-link propagation delays, shared by the ISL channels and static-delay routes
+        AssignLinkDelays(topology, satX, satY, satZ);
     }
+}
+
+/**
+ * Step 2a: Ground mesh nodes and their mobility.
+ *
+ * @return false for an unknown mobility model
+ */
+static bool CreateGroundNodes(const SimConfig& config, Scenario& scenario) {
+    const uint32_t groundNodes = config.groundNodes;
+    const double groundSpeed = config.groundSpeed;
+    const std::string& groundMobility = config.groundMobility;
+    const double groundPause = config.groundPause;
+    const double groundBounds = config.groundBounds;
+    const uint32_t manhattanBlocks = config.manhattanBlocks;
+    const double manhattanBlockSize = config.manhattanBlockSize;
+    const double simTime = config.simTime;
+    const bool satelliteOnly = config.satelliteOnly;
+    NodeContainer& meshNodes = scenario.meshNodes;
 
     // Step 2a: Create ground nodes (if enabled and not satellite-only mode)
-    NodeContainer meshNodes;
     if (groundNodes > 0 && !satelliteOnly) {
         std::cout << "[2a/12] Creating " << groundNodes << " ground mesh nodes...\n";
         meshNodes.Create(groundNodes);
@@ -299,32 +683,59 @@ int main(int argc, char *argv[]) {
         } else {
             std::cout << "  ERROR: Unknown mobility model '" << groundMobility << "'\n";
             std::cout << "  Valid options: static, waypoint, manhattan\n";
-            return 1;
+            return false;
         }
     }
+    return true;
+}
+
+/**
+ * Step 3: ISL protocol via factory.
+ */
+static void CreateIslProtocol(const SimConfig& config, Scenario& scenario) {
+    const std::string& islRouting = config.islRouting;
+    const uint32_t groundNodes = config.groundNodes;
+    const bool groundOnly = config.groundOnly;
+    std::unique_ptr<RoutingProtocol>& islProtocol = scenario.islProtocol;
 
     // Step 3: Create ISL protocol via factory (skip if ground-only mode)
-    std::unique_ptr<RoutingProtocol> islProtocol;
     if (!groundOnly) {
         std::cout << "[3/" << (groundNodes > 0 ? "12" : "9") << "] Creating ISL routing protocol...\n";
         islProtocol = RoutingProtocolFactory::Create(islRouting);
         std::cout << "  ✓ ISL Protocol: " << islProtocol->GetName()
                   << " (category: " << islProtocol->GetCategory() << ")\n";
     }
+}
+
+/**
+ * Step 3a: Ground protocol via factory.
+ */
+static void CreateGroundProtocol(const SimConfig& config, Scenario& scenario) {
+    const std::string& groundRouting = config.groundRouting;
+    const uint32_t groundNodes = config.groundNodes;
+    const bool satelliteOnly = config.satelliteOnly;
+    std::unique_ptr<RoutingProtocol>& groundProtocol = scenario.groundProtocol;
 
     // Step 3a: Create ground protocol via factory (if ground layer enabled and not satellite-only)
-    std::unique_ptr<RoutingProtocol> groundProtocol;
     if (groundNodes > 0 && !satelliteOnly) {
         std::cout << "[3a/12] Creating ground routing protocol...\n";
         groundProtocol = RoutingProtocolFactory::Create(groundRouting);
         std::cout << "  ✓ Ground Protocol: " << groundProtocol->GetName()
                   << " (category: " << groundProtocol->GetCategory() << ")\n";
     }
+}
+
+/**
+ * Step 3b: Ground WiFi ad-hoc devices.
+ */
+static void CreateGroundWifi(const SimConfig& config, Scenario& scenario) {
+    const uint32_t groundNodes = config.groundNodes;
+    const bool satelliteOnly = config.satelliteOnly;
+    NodeContainer& meshNodes = scenario.meshNodes;
+    NetDeviceContainer& groundDevices = scenario.groundDevices;
 
     // Step 3b: Create ground WiFi ad-hoc network BEFORE installing protocols
     // (Devices must exist before InternetStackHelper is installed)
-    NetDeviceContainer groundDevices;
-    Ipv4InterfaceContainer groundInterfaces;
     if (groundNodes > 0 && !satelliteOnly) {
         std::cout << "[3b/12] Creating ground WiFi ad-hoc network...\n";
 
@@ -351,6 +762,17 @@ int main(int argc, char *argv[]) {
         groundDevices = wifi.Install(phy, mac, meshNodes);
         std::cout << "  ✓ Ground WiFi devices: " << groundDevices.GetN() << "\n";
     }
+}
+
+/**
+ * Step 4: Install the ISL protocol (internet stack on satellites).
+ */
+static void InstallIslProtocol(const SimConfig& config, Scenario& scenario) {
+    const uint32_t satellites = config.satellites;
+    const uint32_t groundNodes = config.groundNodes;
+    const bool groundOnly = config.groundOnly;
+    NodeContainer& satNodes = scenario.satNodes;
+    std::unique_ptr<RoutingProtocol>& islProtocol = scenario.islProtocol;
 
     // Step 4: Install ISL protocol (creates internet stack for satellites, skip if ground-only)
     if (!groundOnly) {
@@ -359,6 +781,18 @@ int main(int argc, char *argv[]) {
         islProtocol->Install(satNodes, emptyNodes);
         std::cout << "  ✓ ISL routing protocol installed on " << satellites << " satellites\n";
     }
+}
+
+/**
+ * Steps 4a-4b: Install the ground protocol and address the mesh.
+ */
+static void InstallGroundProtocol(const SimConfig& config, Scenario& scenario) {
+    const uint32_t groundNodes = config.groundNodes;
+    const bool satelliteOnly = config.satelliteOnly;
+    NodeContainer& meshNodes = scenario.meshNodes;
+    std::unique_ptr<RoutingProtocol>& groundProtocol = scenario.groundProtocol;
+    NetDeviceContainer& groundDevices = scenario.groundDevices;
+    Ipv4InterfaceContainer& groundInterfaces = scenario.groundInterfaces;
 
     // Step 4a: Install ground protocol (if ground layer enabled and not satellite-only)
     // (Must happen AFTER WiFi devices are created but BEFORE IP addresses are assigned)
@@ -378,40 +812,102 @@ int main(int argc, char *argv[]) {
         groundInterfaces = groundAddress.Assign(groundDevices);
         std::cout << "  ✓ Ground IP addresses: " << groundInterfaces.GetN() << " (10.1.0.x)\n";
     }
+}
+
+/**
+ * Steps 5-7: ISL point-to-point mesh, addresses and routes (seed-independent).
+ */
+static void BuildIslNetwork(const SimConfig& config, Scenario& scenario) {
+    const std::string& islRouting = config.islRouting;
+    const bool groundOnly = config.groundOnly;
+    NodeContainer& satNodes = scenario.satNodes;
+    IslTopology& topology = scenario.topology;
+    NetDeviceContainer& islDevices = scenario.islDevices;
+    Ipv4InterfaceContainer& islInterfaces = scenario.islInterfaces;
 
     // ISL network creation (Steps 5-7, skip if ground-only mode)
-    NetDeviceContainer islDevices;
-    Ipv4InterfaceContainer islInterfaces;
     if (!groundOnly) {
         // Step 5: Create ISL mesh with PointToPoint links
         std::cout << "[5/9] Creating ISL mesh with distance-based delays...\n";
         IslNetworkCreator creator;
         islDevices = creator.CreateIslMesh(satNodes, topology);
-        std::cout << "  ✓ ISL devices: " << islDevices.GetN() << " (48 links × 2 devices/link)\n";
+        std::cout << "  ✓ ISL devices: " << islDevices.GetN() << " (" << topology.numLinks
+                  << " links × 2 devices/link)\n";
 
         // Step 6: Assign IP addresses
         std::cout << "[6/9] Assigning IP addresses to ISL links...\n";
         islInterfaces = creator.AssignIslAddresses(islDevices);
         std::cout << "  ✓ ISL interfaces: " << islInterfaces.GetN() << "\n";
 
+        // Step 6b: Time-varying topology (link states at t=0 before routing)
+        std::unique_ptr<IslTopologyUpdater>& updater = scenario.topologyUpdater;
+        if (config.topologyEpoch > 0.0) {
+            updater = std::make_unique<IslTopologyUpdater>(GetWalkerConstellation(config), satNodes,
+                                                           topology, islDevices);
+            updater->SetPolarCutoff(config.polarCutoff);
+            updater->SetJ2(config.j2);
+            updater->SetEphemeris(scenario.ephemeris);
+            updater->Initialize();
+        }
+
         // Step 7: Install routes (if static) or wait for convergence (if dynamic)
         std::cout << "[7/9] Route installation...\n";
-        if (islRouting == "static") {
-            // Static routing: compute and install routes
-            RoutingTables routes = ComputeStaticRoutes(topology);
-            creator.InstallStaticRoutes(satNodes, routes, islInterfaces);
-            std::cout << "  ✓ Static routes computed and installed\n";
+        if (islRouting == "static" || islRouting == "static-delay") {
+            // Static routing: compute and install routes (min-hop or min-delay)
+            bool byDelay = islRouting == "static-delay";
+            if (updater) {
+                // The updater owns the routes and repairs them every epoch
+                updater->EnableRouteRepair(byDelay ? RouteMetric::DELAY : RouteMetric::HOPS, islInterfaces);
+                creator.InstallStaticRoutes(satNodes, updater->GetRoutes(), islInterfaces);
+            } else {
+                RoutingTables routes = byDelay ? ComputeDelayRoutes(topology) : ComputeStaticRoutes(topology);
+                creator.InstallStaticRoutes(satNodes, routes, islInterfaces);
+            }
+            std::cout << "  ✓ Static " << (byDelay ? "minimum-delay" : "minimum-hop")
+                      << " routes computed and installed\n";
         } else {
             // Dynamic routing: OLSR/AODV will auto-discover routes
             std::cout << "  ✓ Dynamic routing will discover routes during simulation\n";
         }
+
+        if (updater) {
+            updater->Start(Seconds(config.topologyEpoch));
+            std::cout << "  ✓ ISL topology updates every " << config.topologyEpoch
+                      << "s (polar cutoff " << config.polarCutoff << "°)\n";
+        }
     }
+}
+
+/**
+ * Step 8: Satellite and ground test traffic.
+ */
+static void InstallTraffic(const SimConfig& config, Scenario& scenario) {
+    const uint32_t groundNodes = config.groundNodes;
+    const double simTime = config.simTime;
+    const bool satelliteOnly = config.satelliteOnly;
+    const bool groundOnly = config.groundOnly;
+    NodeContainer& satNodes = scenario.satNodes;
+    NodeContainer& meshNodes = scenario.meshNodes;
+    Ipv4InterfaceContainer& groundInterfaces = scenario.groundInterfaces;
+    const std::string& groundRate = config.groundRate;
+    const uint32_t groundFlows = config.groundFlows;
+
+    // --flow-stats=lite: register each sender/sink pair with the collector
+    auto trackFlow = [&config, &scenario](ApplicationContainer& senders, ApplicationContainer& sinks) {
+        if (config.flowStats == "lite") {
+            scenario.flowStats.AddFlow(senders.Get(0), sinks.Get(0));
+        }
+    };
 
     // Step 8: Create test traffic (reuse from baselines)
     std::cout << "[8/9] Creating test traffic...\n";
 
     uint16_t basePort = 9;
 
+    // Application times are relative to now: t=0 normally, t=20s after a warmup fork
+    const Time trafficStart = Seconds(CONVERGENCE_TIME) - Simulator::Now();
+    const Time trafficStop = Seconds(simTime - 10.0) - Simulator::Now();
+
     // Satellite traffic (skip if ground-only mode)
     if (!groundOnly) {
         // Test 1: Single-hop ISL (Sat 0 → Sat 1, direct neighbors)
@@ -422,26 +918,28 @@ int main(int argc, char *argv[]) {
         onoff1.SetConstantRate(DataRate("10Mbps"));
         ApplicationContainer senderApps1 = onoff1.Install(satNodes.Get(0));
         std::cout << "    Installed " << senderApps1.GetN() << " sender apps\n";
-        senderApps1.Start(Seconds(20.0));  // Start after convergence (if dynamic)
-        senderApps1.Stop(Seconds(simTime - 10.0));
+        senderApps1.Start(trafficStart);  // Start after convergence (if dynamic)
+        senderApps1.Stop(trafficStop);
 
         PacketSinkHelper sink1("ns3::UdpSocketFactory",
             InetSocketAddress(Ipv4Address::GetAny(), basePort));
         ApplicationContainer sinkApps1 = sink1.Install(satNodes.Get(1));
         sinkApps1.Start(Seconds(0.0));
+        trackFlow(senderApps1, sinkApps1);
 
         // Test 2: Multi-hop ISL (Sat 0 → Sat 23, diagonal opposite)
         Ipv4Address sat23Addr = satNodes.Get(23)->GetObject<Ipv4>()->GetAddress(1, 0).GetLocal();
         OnOffHelper onoff2("ns3::UdpSocketFactory", InetSocketAddress(sat23Addr, basePort + 1));
         onoff2.SetConstantRate(DataRate("10Mbps"));
         ApplicationContainer senderApps2 = onoff2.Install(satNodes.Get(0));
-        senderApps2.Start(Seconds(20.0));
-        senderApps2.Stop(Seconds(simTime - 10.0));
+        senderApps2.Start(trafficStart);
+        senderApps2.Stop(trafficStop);
 
         PacketSinkHelper sink2("ns3::UdpSocketFactory",
             InetSocketAddress(Ipv4Address::GetAny(), basePort + 1));
         ApplicationContainer sinkApps2 = sink2.Install(satNodes.Get(23));
         sinkApps2.Start(Seconds(0.0));
+        trackFlow(senderApps2, sinkApps2);
     }
 
     // Additional satellite flows for satellite-only mode (total 5 flows)
@@ -453,136 +951,81 @@ int main(int argc, char *argv[]) {
         OnOffHelper onoff3("ns3::UdpSocketFactory", InetSocketAddress(sat10Addr, basePort + 2));
         onoff3.SetConstantRate(DataRate("10Mbps"));
         ApplicationContainer satSenderApps3 = onoff3.Install(satNodes.Get(3));
-        satSenderApps3.Start(Seconds(20.0));
-        satSenderApps3.Stop(Seconds(simTime - 10.0));
+        satSenderApps3.Start(trafficStart);
+        satSenderApps3.Stop(trafficStop);
 
         PacketSinkHelper sink3("ns3::UdpSocketFactory",
             InetSocketAddress(Ipv4Address::GetAny(), basePort + 2));
         ApplicationContainer satSinkApps3 = sink3.Install(satNodes.Get(10));
         satSinkApps3.Start(Seconds(0.0));
+        trackFlow(satSenderApps3, satSinkApps3);
 
         // Flow 4: Sat 6 → Sat 13
         Ipv4Address sat13Addr = satNodes.Get(13)->GetObject<Ipv4>()->GetAddress(1, 0).GetLocal();
         OnOffHelper onoff4("ns3::UdpSocketFactory", InetSocketAddress(sat13Addr, basePort + 3));
         onoff4.SetConstantRate(DataRate("10Mbps"));
         ApplicationContainer satSenderApps4 = onoff4.Install(satNodes.Get(6));
-        satSenderApps4.Start(Seconds(20.0));
-        satSenderApps4.Stop(Seconds(simTime - 10.0));
+        satSenderApps4.Start(trafficStart);
+        satSenderApps4.Stop(trafficStop);
 
         PacketSinkHelper sink4("ns3::UdpSocketFactory",
             InetSocketAddress(Ipv4Address::GetAny(), basePort + 3));
         ApplicationContainer satSinkApps4 = sink4.Install(satNodes.Get(13));
         satSinkApps4.Start(Seconds(0.0));
+        trackFlow(satSenderApps4, satSinkApps4);
 
         // Flow 5: Sat 9 → Sat 20
         Ipv4Address sat20Addr = satNodes.Get(20)->GetObject<Ipv4>()->GetAddress(1, 0).GetLocal();
         OnOffHelper onoff5("ns3::UdpSocketFactory", InetSocketAddress(sat20Addr, basePort + 4));
         onoff5.SetConstantRate(DataRate("10Mbps"));
         ApplicationContainer satSenderApps5 = onoff5.Install(satNodes.Get(9));
-        satSenderApps5.Start(Seconds(20.0));
-        satSenderApps5.Stop(Seconds(simTime - 10.0));
+        satSenderApps5.Start(trafficStart);
+        satSenderApps5.Stop(trafficStop);
 
         PacketSinkHelper sink5("ns3::UdpSocketFactory",
             InetSocketAddress(Ipv4Address::GetAny(), basePort + 4));
         ApplicationContainer satSinkApps5 = sink5.Install(satNodes.Get(20));
         satSinkApps5.Start(Seconds(0.0));
+        trackFlow(satSenderApps5, satSinkApps5);
     }
 
     // Test 3: Ground mesh traffic (if ground layer enabled and not satellite-only mode)
+    // Flow 1: Node 0 → last node; flows 2-5 use fixed pairs when the mesh is large enough
     if (groundNodes > 0 && !satelliteOnly) {
-        uint32_t destNode = groundNodes - 1;  // Last ground node
-
-        // Get destination address from ground interface container
-        Ipv4Address meshDestAddr = groundInterfaces.GetAddress(destNode);
-        Ipv4Address meshSrcAddr = groundInterfaces.GetAddress(0);
-
-        std::cout << "  Ground mesh flow: " << meshSrcAddr << " → " << meshDestAddr << "\n";
-
-        OnOffHelper onoff3("ns3::UdpSocketFactory", InetSocketAddress(meshDestAddr, basePort + 2));
-        onoff3.SetConstantRate(DataRate("1Mbps"));  // Lower rate for ground mesh
-        ApplicationContainer senderApps3 = onoff3.Install(meshNodes.Get(0));
-        senderApps3.Start(Seconds(20.0));
-        senderApps3.Stop(Seconds(simTime - 10.0));
-
-        PacketSinkHelper sink3("ns3::UdpSocketFactory",
-            InetSocketAddress(Ipv4Address::GetAny(), basePort + 2));
-        ApplicationContainer sinkApps3 = sink3.Install(meshNodes.Get(destNode));
-        sinkApps3.Start(Seconds(0.0));
-
-        // Flow 2: Node 5 → Node 14 (mid-range, tests different spatial region)
-        if (groundNodes > 14) {
-            Ipv4Address dest2 = groundInterfaces.GetAddress(14);
-            Ipv4Address src2 = groundInterfaces.GetAddress(5);
-
-            std::cout << "  Ground mesh flow 2: " << src2 << " → " << dest2 << "\n";
-
-            OnOffHelper onoff4("ns3::UdpSocketFactory", InetSocketAddress(dest2, basePort + 3));
-            onoff4.SetConstantRate(DataRate("1Mbps"));
-            ApplicationContainer senderApps4 = onoff4.Install(meshNodes.Get(5));
-            senderApps4.Start(Seconds(20.0));
-            senderApps4.Stop(Seconds(simTime - 10.0));
-
-            PacketSinkHelper sink4("ns3::UdpSocketFactory",
-                InetSocketAddress(Ipv4Address::GetAny(), basePort + 3));
-            ApplicationContainer sinkApps4 = sink4.Install(meshNodes.Get(14));
-            sinkApps4.Start(Seconds(0.0));
-        }
-
-        // Flow 3: Node 3 → Node 17 (random path)
-        if (groundNodes > 17) {
-            Ipv4Address dest3 = groundInterfaces.GetAddress(17);
-            Ipv4Address src3 = groundInterfaces.GetAddress(3);
-
-            std::cout << "  Ground mesh flow 3: " << src3 << " → " << dest3 << "\n";
-
-            OnOffHelper onoff5("ns3::UdpSocketFactory", InetSocketAddress(dest3, basePort + 4));
-            onoff5.SetConstantRate(DataRate("1Mbps"));
-            ApplicationContainer senderApps5 = onoff5.Install(meshNodes.Get(3));
-            senderApps5.Start(Seconds(20.0));
-            senderApps5.Stop(Seconds(simTime - 10.0));
-
-            PacketSinkHelper sink5("ns3::UdpSocketFactory",
-                InetSocketAddress(Ipv4Address::GetAny(), basePort + 4));
-            ApplicationContainer sinkApps5 = sink5.Install(meshNodes.Get(17));
-            sinkApps5.Start(Seconds(0.0));
-        }
-
-        // Flow 4: Node 8 → Node 12 (random path)
-        if (groundNodes > 12) {
-            Ipv4Address dest4 = groundInterfaces.GetAddress(12);
-            Ipv4Address src4 = groundInterfaces.GetAddress(8);
-
-            std::cout << "  Ground mesh flow 4: " << src4 << " → " << dest4 << "\n";
-
-            OnOffHelper onoff6("ns3::UdpSocketFactory", InetSocketAddress(dest4, basePort + 5));
-            onoff6.SetConstantRate(DataRate("1Mbps"));
-            ApplicationContainer senderApps6 = onoff6.Install(meshNodes.Get(8));
-            senderApps6.Start(Seconds(20.0));
-            senderApps6.Stop(Seconds(simTime - 10.0));
-
-            PacketSinkHelper sink6("ns3::UdpSocketFactory",
-                InetSocketAddress(Ipv4Address::GetAny(), basePort + 5));
-            ApplicationContainer sinkApps6 = sink6.Install(meshNodes.Get(12));
-            sinkApps6.Start(Seconds(0.0));
-        }
-
-        // Flow 5: Node 2 → Node 18 (random path)
-        if (groundNodes > 18) {
-            Ipv4Address dest5 = groundInterfaces.GetAddress(18);
-            Ipv4Address src5 = groundInterfaces.GetAddress(2);
-
-            std::cout << "  Ground mesh flow 5: " << src5 << " → " << dest5 << "\n";
+        const uint32_t pairs[MAX_GROUND_FLOWS][2] = {
+            {0, groundNodes - 1},  // Flow 1: first → last node
+            {5, 14},               // Flow 2: mid-range, tests different spatial region
+            {3, 17},               // Flow 3: random path
+            {8, 12},               // Flow 4: random path
+            {2, 18},               // Flow 5: random path
+        };
+        for (uint32_t f = 0; f < std::min(groundFlows, MAX_GROUND_FLOWS); ++f) {
+            uint32_t src = pairs[f][0];
+            uint32_t dst = pairs[f][1];
+            if (f > 0 && groundNodes <= dst) {
+                continue;
+            }
 
-            OnOffHelper onoff7("ns3::UdpSocketFactory", InetSocketAddress(dest5, basePort + 6));
-            onoff7.SetConstantRate(DataRate("1Mbps"));
-            ApplicationContainer senderApps7 = onoff7.Install(meshNodes.Get(2));
-            senderApps7.Start(Seconds(20.0));
-            senderApps7.Stop(Seconds(simTime - 10.0));
+            Ipv4Address dstAddr = groundInterfaces.GetAddress(dst);
+            Ipv4Address srcAddr = groundInterfaces.GetAddress(src);
+            if (f == 0) {
+                std::cout << "  Ground mesh flow: " << srcAddr << " → " << dstAddr << "\n";
+            } else {
+                std::cout << "  Ground mesh flow " << (f + 1) << ": " << srcAddr << " → " << dstAddr << "\n";
+            }
 
-            PacketSinkHelper sink7("ns3::UdpSocketFactory",
-                InetSocketAddress(Ipv4Address::GetAny(), basePort + 6));
-            ApplicationContainer sinkApps7 = sink7.Install(meshNodes.Get(18));
-            sinkApps7.Start(Seconds(0.0));
+            uint16_t port = basePort + 2 + f;
+            OnOffHelper onoff("ns3::UdpSocketFactory", InetSocketAddress(dstAddr, port));
+            onoff.SetConstantRate(DataRate(groundRate));  // Lower rate for ground mesh
+            ApplicationContainer senderApps = onoff.Install(meshNodes.Get(src));
+            senderApps.Start(trafficStart);
+            senderApps.Stop(trafficStop);
+
+            PacketSinkHelper sink("ns3::UdpSocketFactory",
+                InetSocketAddress(Ipv4Address::GetAny(), port));
+            ApplicationContainer sinkApps = sink.Install(meshNodes.Get(dst));
+            sinkApps.Start(Seconds(0.0));
+            trackFlow(senderApps, sinkApps);
         }
     }
 
@@ -590,30 +1033,61 @@ int main(int argc, char *argv[]) {
     std::cout << "    - Sat 0 → Sat 1 (1-hop ISL, 10 Mbps UDP)\n";
     std::cout << "    - Sat 0 → Sat 23 (5-hop ISL, 10 Mbps UDP)\n";
     if (groundNodes > 0) {
-        std::cout << "    - Mesh flows: 5 random pairs (multi-hop ground, 1 Mbps UDP each)\n";
+        std::cout << "    - Mesh flows: " << groundFlows << " random pairs (multi-hop ground, "
+                  << groundRate << " UDP each)\n";
     }
     std::cout << "  ✓ Traffic starts at t=20s (allows convergence for dynamic protocols)\n";
     std::cout << "\n=== DIAGNOSTIC: Application Install Time ===\n";
     std::cout << "  Current simulation time: " << Simulator::Now().GetSeconds() << "s\n";
+}
 
-    // Step 9: Install FlowMonitor
-    std::cout << "\n[9/9] Installing FlowMonitor...\n";
-    FlowMonitorHelper flowmon;
-    Ptr<FlowMonitor> monitor = flowmon.InstallAll();
-    std::cout << "  ✓ FlowMonitor installed (using InstallAll())\n";
+/**
+ * Step 9: FlowMonitor, PacketTracer and diagnostic events.
+ *
+ * @param outputFile Run CSV path (sidecars such as the event trace go next to it)
+ */
+static void InstallMonitors(const SimConfig& config, Scenario& scenario, const std::string& outputFile) {
+    const std::string& groundRouting = config.groundRouting;
+    const uint32_t groundNodes = config.groundNodes;
+    const std::string& groundMobility = config.groundMobility;
+    const double simTime = config.simTime;
+    const bool satelliteOnly = config.satelliteOnly;
+    NodeContainer& meshNodes = scenario.meshNodes;
+    NetDeviceContainer& groundDevices = scenario.groundDevices;
+    PacketTracer& tracer = scenario.tracer;
+
+    // Step 9: Install FlowMonitor (lite mode tracks flows from InstallTraffic instead)
+    if (config.flowStats == "flowmon") {
+        std::cout << "\n[9/9] Installing FlowMonitor...\n";
+        scenario.monitor = scenario.flowmon.InstallAll();
+        std::cout << "  ✓ FlowMonitor installed (using InstallAll())\n";
+    } else {
+        std::cout << "\n[9/9] Using lightweight flow statistics (flow endpoints only)\n";
+    }
 
     std::cout << "\n=== DIAGNOSTIC: FlowMonitor Install Time ===\n";
     std::cout << "  Current simulation time: " << Simulator::Now().GetSeconds() << "s\n";
 
     // Phase 6 Week 27: Install PacketTracer for NRL metrics (ground layer only)
     // Note: HWMP excluded from NRL tracking (FlowMonitor incompatibility already excludes it from final experiments)
-    PacketTracer tracer;
     if (groundNodes > 0 && groundRouting != "hwmp") {
         tracer.Install(groundDevices);
         std::cout << "  ✓ PacketTracer installed on " << groundDevices.GetN() << " ground devices\n";
+        if (config.nrlBinMs > 0.0) {
+            tracer.EnableTimeBins(MicroSeconds(static_cast<uint64_t>(config.nrlBinMs * 1000.0)),
+                                  Seconds(simTime));
+            std::cout << "  ✓ PacketTracer time bins: " << config.nrlBinMs << " ms\n";
+        }
+        if (config.packetEvents) {
+            std::string eventFile = SidecarFile(outputFile, ".events.bin");
+            if (tracer.EnableEventTrace(eventFile)) {
+                std::cout << "  ✓ Packet event trace: " << eventFile << "\n";
+            } else {
+                std::cerr << "WARNING: Cannot create packet event trace " << eventFile << "\n";
+            }
+        }
     }
 
-
     // Log initial and final positions to verify movement (waypoint mode only)
     if (groundNodes > 0 && !satelliteOnly && groundMobility == "waypoint") {
         std::cout << "\n=== Initial Ground Node Positions (t=0) ===\n";
@@ -625,7 +1099,7 @@ int main(int argc, char *argv[]) {
         }
 
         // Schedule position check at end of simulation
-        Simulator::Schedule(Seconds(simTime - 0.1), [&meshNodes, groundNodes, simTime]() {
+        Simulator::Schedule(Seconds(simTime - 0.1), [meshNodes, groundNodes, simTime]() {
             std::cout << "\n=== Final Ground Node Positions (t="
                       << std::fixed << std::setprecision(1) << (simTime - 0.1) << ") ===\n";
             for (uint32_t i = 0; i < std::min(5u, groundNodes); ++i) {
@@ -638,7 +1112,7 @@ int main(int argc, char *argv[]) {
     }
 
     // Debug: Schedule event to check application status and routing tables
-    Simulator::Schedule(Seconds(21.0), [&meshNodes, groundNodes, groundRouting]() {
+    Simulator::Schedule(Seconds(21.0), [meshNodes, groundNodes, groundRouting]() {
         std::cout << "\n=== DIAGNOSTIC: t=21s Application Status ===\n";
 
         // Check if applications exist on source nodes
@@ -668,6 +1142,24 @@ int main(int argc, char *argv[]) {
             routing->PrintRoutingTable(stream);
         }
     });
+}
+
+/**
+ * Run from the current time to simTime and collect metrics.
+ *
+ * Leaves the simulator destroyed, ready for the next run.
+ */
+static void RunAndCollect(const SimConfig& config, Scenario& scenario, RunResult& result) {
+    const uint32_t groundNodes = config.groundNodes;
+    const double simTime = config.simTime;
+    const bool satelliteOnly = config.satelliteOnly;
+    const bool groundOnly = config.groundOnly;
+    std::unique_ptr<RoutingProtocol>& islProtocol = scenario.islProtocol;
+    std::unique_ptr<RoutingProtocol>& groundProtocol = scenario.groundProtocol;
+    FlowMonitorHelper& flowmon = scenario.flowmon;
+    Ptr<FlowMonitor> monitor = scenario.monitor;
+    const FlowStatsCollector& collector = scenario.flowStats;
+    PacketTracer& tracer = scenario.tracer;
 
     // Run simulation
     std::cout << "\nRunning simulation for " << simTime << " seconds...\n";
@@ -675,7 +1167,7 @@ int main(int argc, char *argv[]) {
     std::cout << "  Current simulation time: " << Simulator::Now().GetSeconds() << "s\n";
     auto startTime = std::chrono::high_resolution_clock::now();
 
-    Simulator::Stop(Seconds(simTime));
+    Simulator::Stop(Seconds(simTime) - Simulator::Now());
     Simulator::Run();
 
     auto endTime = std::chrono::high_resolution_clock::now();
@@ -683,37 +1175,72 @@ int main(int argc, char *argv[]) {
 
     std::cout << "  ✓ Simulation complete (runtime: " << duration << " seconds)\n\n";
 
-    // Analyze results
-    std::cout << "=== Analyzing Results ===\n";
+    if (scenario.topologyUpdater) {
+        const IslTopologyUpdater& updater = *scenario.topologyUpdater;
+        std::cout << "  ✓ ISL topology updates: " << updater.GetNUpdates() << " epochs, "
+                  << updater.GetNDelayChanges() << " delay changes, "
+                  << updater.GetNLinkStateChanges() << " link up/down, "
+                  << updater.GetNRepairedSources() << " route rows repaired ("
+                  << updater.GetNRouteChanges() << " next hops)\n\n";
+    }
 
-    monitor->CheckForLostPackets();
-    Ptr<Ipv4FlowClassifier> classifier = DynamicCast<Ipv4FlowClassifier>(flowmon.GetClassifier());
-    std::map<FlowId, FlowMonitor::FlowStats> stats = monitor->GetFlowStats();
+    // Flush the event trace now: fork children _exit() without running destructors
+    if (config.packetEvents) {
+        uint64_t events = tracer.CloseEventTrace();
+        std::cout << "  ✓ Packet events written: " << events << "\n\n";
+    }
 
-    std::cout << "[DEBUG] FlowMonitor found " << stats.size() << " flows\n";
+    // Analyze results
+    std::cout << "=== Analyzing Results ===\n";
 
     uint64_t totalTxPackets = 0;
     uint64_t totalRxPackets = 0;
     double totalDelay = 0.0;
 
-    for (auto const& [flowId, flowStats] : stats) {
-        totalTxPackets += flowStats.txPackets;
-        totalRxPackets += flowStats.rxPackets;
-        if (flowStats.rxPackets > 0) {
-            totalDelay += flowStats.delaySum.GetSeconds();
-        }
+    if (monitor) {
+        monitor->CheckForLostPackets();
+        Ptr<Ipv4FlowClassifier> classifier = DynamicCast<Ipv4FlowClassifier>(flowmon.GetClassifier());
+        std::map<FlowId, FlowMonitor::FlowStats> stats = monitor->GetFlowStats();
 
-        // Per-flow details
-        Ipv4FlowClassifier::FiveTuple t = classifier->FindFlow(flowId);
-        double flowPdr = (flowStats.txPackets > 0) ?
-            (100.0 * flowStats.rxPackets / flowStats.txPackets) : 0.0;
-        double flowDelay = (flowStats.rxPackets > 0) ?
-            (flowStats.delaySum.GetSeconds() / flowStats.rxPackets * 1000.0) : 0.0;
+        std::cout << "[DEBUG] FlowMonitor found " << stats.size() << " flows\n";
+
+        for (auto const& [flowId, flowStats] : stats) {
+            totalTxPackets += flowStats.txPackets;
+            totalRxPackets += flowStats.rxPackets;
+            if (flowStats.rxPackets > 0) {
+                totalDelay += flowStats.delaySum.GetSeconds();
+            }
 
-        std::cout << "Flow " << flowId << ": " << t.sourceAddress << " → " << t.destinationAddress
-            << "\n  TX: " << flowStats.txPackets << ", RX: " << flowStats.rxPackets
-            << ", PDR: " << std::fixed << std::setprecision(2) << flowPdr << "%"
-            << ", Delay: " << flowDelay << " ms\n";
+            // Per-flow details
+            Ipv4FlowClassifier::FiveTuple t = classifier->FindFlow(flowId);
+            double flowPdr = (flowStats.txPackets > 0) ?
+                (100.0 * flowStats.rxPackets / flowStats.txPackets) : 0.0;
+            double flowDelay = (flowStats.rxPackets > 0) ?
+                (flowStats.delaySum.GetSeconds() / flowStats.rxPackets * 1000.0) : 0.0;
+
+            std::cout << "Flow " << flowId << ": " << t.sourceAddress << " → " << t.destinationAddress
+                << "\n  TX: " << flowStats.txPackets << ", RX: " << flowStats.rxPackets
+                << ", PDR: " << std::fixed << std::setprecision(2) << flowPdr << "%"
+                << ", Delay: " << flowDelay << " ms\n";
+        }
+    } else {
+        std::cout << "[DEBUG] Flow stats collector tracked " << collector.GetNFlows() << " flows\n";
+
+        for (uint32_t f = 0; f < collector.GetNFlows(); ++f) {
+            uint64_t txPackets = collector.GetTxPackets(f);
+            uint64_t rxPackets = collector.GetRxPackets(f);
+            totalTxPackets += txPackets;
+            totalRxPackets += rxPackets;
+            totalDelay += collector.GetDelaySum(f).GetSeconds();
+
+            double flowPdr = (txPackets > 0) ? (100.0 * rxPackets / txPackets) : 0.0;
+            double flowDelay = (rxPackets > 0) ?
+                (collector.GetDelaySum(f).GetSeconds() / rxPackets * 1000.0) : 0.0;
+
+            std::cout << "Flow " << (f + 1) << "\n  TX: " << txPackets << ", RX: " << rxPackets
+                << ", PDR: " << std::fixed << std::setprecision(2) << flowPdr << "%"
+                << ", Delay: " << flowDelay << " ms\n";
+        }
     }
 
     double pdr = (totalTxPackets > 0) ?
@@ -727,70 +1254,628 @@ int main(int argc, char *argv[]) {
     std::cout << "PDR: " << std::fixed << std::setprecision(2) << pdr << "%\n";
     std::cout << "Avg delay: " << avgDelay << " ms\n\n";
 
-    // Export to CSV
-    std::cout << "=== Exporting Results ===\n";
-    std::ofstream csv(outputFile);
-    csv << "metric,value\n";
+    result.txPackets = totalTxPackets;
+    result.rxPackets = totalRxPackets;
+    result.pdr = pdr;
+    result.avgDelayMs = avgDelay;
+    result.runtimeSeconds = duration;
     if (!groundOnly) {
-        csv << "isl_routing," << islProtocol->GetName() << "\n";
-        csv << "isl_category," << islProtocol->GetCategory() << "\n";
+        result.islName = islProtocol->GetName();
+        result.islCategory = islProtocol->GetCategory();
+        result.islProtocolControlBytes = islProtocol->GetControlBytes();
     }
     if (groundNodes > 0 && !satelliteOnly) {
-        csv << "ground_routing," << groundProtocol->GetName() << "\n";
-        csv << "ground_category," << groundProtocol->GetCategory() << "\n";
+        result.groundName = groundProtocol->GetName();
+        result.groundCategory = groundProtocol->GetCategory();
+        result.groundProtocolControlBytes = groundProtocol->GetControlBytes();
+    }
+
+    // Phase 6 Week 27: NRL metrics (if ground layer enabled)
+    if (groundNodes > 0) {
+        result.dataBytesTx = tracer.GetDataBytesTx();
+        result.controlBytesTx = tracer.GetControlBytesTx();
+        result.nrl = (result.dataBytesTx > 0) ?
+            (double)result.controlBytesTx / result.dataBytesTx : 0.0;
+        result.timeSeriesCsv = tracer.FormatTimeSeries();
+        for (uint32_t t = 0; t < CONTROL_MESSAGE_TYPES; ++t) {
+            result.controlBytesByType[t] = tracer.GetControlBytesTxByType(static_cast<ControlMessageType>(t));
+        }
+        if (config.controlBreakdown) {
+            result.controlBreakdownCsv = tracer.FormatControlBreakdown();
+        }
+    }
+
+    // Tear down nodes, channels and pending events so the next run starts clean
+    Simulator::Destroy();
+}
+
+/**
+ * Build the scenario for one seed, run it and collect metrics.
+ *
+ * Steps run in their original order: the order in which random variables
+ * are created decides their streams, so reordering would change results.
+ *
+ * @return 0 on success, otherwise the process exit code
+ */
+static int RunSimulation(const SimConfig& config, uint32_t seed, const std::string& outputFile,
+                         RunResult& result) {
+    ResetRunState(seed);
+    PrintRunHeader(config, seed);
+
+    Scenario scenario;
+    CreateSatellites(config, scenario);
+    if (!CreateGroundNodes(config, scenario)) {
+        Simulator::Destroy();
+        return 1;
+    }
+    CreateIslProtocol(config, scenario);
+    CreateGroundProtocol(config, scenario);
+    CreateGroundWifi(config, scenario);
+    InstallIslProtocol(config, scenario);
+    InstallGroundProtocol(config, scenario);
+    BuildIslNetwork(config, scenario);
+    InstallTraffic(config, scenario);
+    InstallMonitors(config, scenario, outputFile);
+    RunAndCollect(config, scenario, result);
+    return 0;
+}
+
+/**
+ * Render one run's metrics as metric,value CSV text.
+ */
+static std::string FormatResultCsv(const SimConfig& config, uint32_t seed, const RunResult& result) {
+    const uint32_t groundNodes = config.groundNodes;
+
+    std::ostringstream csv;
+    csv << "metric,value\n";
+    if (!config.groundOnly) {
+        csv << "isl_routing," << result.islName << "\n";
+        csv << "isl_category," << result.islCategory << "\n";
+    }
+    if (groundNodes > 0 && !config.satelliteOnly) {
+        csv << "ground_routing," << result.groundName << "\n";
+        csv << "ground_category," << result.groundCategory << "\n";
+        csv << "ground_mobility," << config.groundMobility << "\n";
         csv << "ground_nodes," << groundNodes << "\n";
+        csv << "ground_rate," << config.groundRate << "\n";
     }
-    csv << "satellites," << satellites << "\n";
-    csv << "sim_time," << simTime << "\n";
+    csv << "satellites," << config.satellites << "\n";
+    csv << "sim_time," << config.simTime << "\n";
     csv << "seed," << seed << "\n";
-    csv << "flows," << (groundNodes > 0 ? 7 : 2) << "\n";
-    csv << "tx_packets," << totalTxPackets << "\n";
-    csv << "rx_packets," << totalRxPackets << "\n";
-    csv << "pdr," << pdr << "\n";
-    csv << "avg_delay_ms," << avgDelay << "\n";
-    csv << "runtime_seconds," << duration << "\n";
+    csv << "flows," << (groundNodes > 0 ? 2 + config.groundFlows : 2) << "\n";
+    csv << "tx_packets," << result.txPackets << "\n";
+    csv << "rx_packets," << result.rxPackets << "\n";
+    csv << "pdr," << result.pdr << "\n";
+    csv << "avg_delay_ms," << result.avgDelayMs << "\n";
+    csv << "runtime_seconds," << result.runtimeSeconds << "\n";
+    if (config.flowStats != "flowmon") {
+        csv << "flow_stats," << config.flowStats << "\n";  // tx/rx/delay from flow endpoints
+    }
+
+    // Control bytes counted by each protocol from its own routing sockets
+    if (!config.groundOnly) {
+        csv << "isl_protocol_control_bytes," << result.islProtocolControlBytes << "\n";
+    }
+    if (groundNodes > 0 && !config.satelliteOnly) {
+        csv << "ground_protocol_control_bytes," << result.groundProtocolControlBytes << "\n";
+    }
 
     // Phase 6 Week 27: Add NRL metrics (if ground layer enabled)
     if (groundNodes > 0) {
-        uint64_t dataBytesTx = tracer.GetDataBytesTx();
-        uint64_t controlBytesTx = tracer.GetControlBytesTx();
-        double nrl = (dataBytesTx > 0) ? (double)controlBytesTx / dataBytesTx : 0.0;
-
-        csv << "data_bytes_tx," << dataBytesTx << "\n";
-        csv << "control_bytes_tx," << controlBytesTx << "\n";
-        csv << "nrl," << std::fixed << std::setprecision(6) << nrl << "\n";
+        csv << "data_bytes_tx," << result.dataBytesTx << "\n";
+        csv << "control_bytes_tx," << result.controlBytesTx << "\n";
+        csv << "nrl," << std::fixed << std::setprecision(6) << result.nrl << "\n";
+
+        // Control bytes per message type (types never sent are omitted)
+        for (uint32_t t = 0; t < CONTROL_MESSAGE_TYPES; ++t) {
+            if (result.controlBytesByType[t] > 0) {
+                csv << "control_bytes_" << PacketTracer::GetControlMessageName(static_cast<ControlMessageType>(t))
+                    << "," << result.controlBytesByType[t] << "\n";
+            }
+        }
+    }
+    return csv.str();
+}
 
-        std::cout << "\n=== NRL Metrics (Week 27) ===\n";
-        std::cout << "Data bytes TX: " << dataBytesTx << "\n";
-        std::cout << "Control bytes TX: " << controlBytesTx << "\n";
-        std::cout << "NRL: " << std::fixed << std::setprecision(4) << nrl << "\n";
+/**
+ * Export one run's PacketTracer sidecars next to its CSV (if enabled):
+ * time bins (.timeseries.csv) and per-node control breakdown (.control.csv).
+ */
+static void WriteSidecars(const RunResult& result, const std::string& outputFile) {
+    if (!result.timeSeriesCsv.empty()) {
+        std::string path = SidecarFile(outputFile, ".timeseries.csv");
+        std::ofstream series(path);
+        series << result.timeSeriesCsv;
+        std::cout << "  ✓ Time series exported to: " << path << "\n";
     }
+    if (!result.controlBreakdownCsv.empty()) {
+        std::string path = SidecarFile(outputFile, ".control.csv");
+        std::ofstream breakdown(path);
+        breakdown << result.controlBreakdownCsv;
+        std::cout << "  ✓ Control breakdown exported to: " << path << "\n";
+    }
+}
 
+/**
+ * Export one run's metrics as a metric,value CSV.
+ */
+static void WriteResults(const SimConfig& config, uint32_t seed, const RunResult& result,
+                         const std::string& outputFile) {
+    std::cout << "=== Exporting Results ===\n";
+    std::ofstream csv(outputFile);
+    csv << FormatResultCsv(config, seed, result);
     csv.close();
 
-    std::cout << "  ✓ Results exported to: " << outputFile << "\n\n";
+    WriteSidecars(result, outputFile);
 
-    Simulator::Destroy();
+    if (config.groundNodes > 0) {
+        std::cout << "\n=== NRL Metrics (Week 27) ===\n";
+        std::cout << "Data bytes TX: " << result.dataBytesTx << "\n";
+        std::cout << "Control bytes TX: " << result.controlBytesTx
+                  << " (protocol-counted: " << result.groundProtocolControlBytes << ")\n";
+        std::cout << "NRL: " << std::fixed << std::setprecision(4) << result.nrl << "\n";
+        for (uint32_t t = 0; t < CONTROL_MESSAGE_TYPES; ++t) {
+            if (result.controlBytesByType[t] > 0 && result.controlBytesTx > 0) {
+                std::cout << "  " << std::left << std::setw(16)
+                          << PacketTracer::GetControlMessageName(static_cast<ControlMessageType>(t))
+                          << std::right << result.controlBytesByType[t] << " bytes ("
+                          << std::setprecision(1) << (100.0 * result.controlBytesByType[t] / result.controlBytesTx)
+                          << "%)\n";
+            }
+        }
+    }
 
+    std::cout << "  ✓ Results exported to: " << outputFile << "\n\n";
+}
+
+/**
+ * Print informational checks for one run (never fails the run).
+ */
+static void PrintValidation(const SimConfig& config, const RunResult& result) {
     // Validation (informational only - do not fail on metrics during experiments)
     std::cout << "=== Validation ===\n";
 
-    if (pdr < 95.0) {
-        std::cout << "⚠ NOTE: PDR " << pdr << "% < 95% target (data collection mode)\n";
+    if (result.pdr < 95.0) {
+        std::cout << "⚠ NOTE: PDR " << result.pdr << "% < 95% target (data collection mode)\n";
     } else {
-        std::cout << "✓ PASS: PDR " << pdr << "% >= 95% target\n";
+        std::cout << "✓ PASS: PDR " << result.pdr << "% >= 95% target\n";
     }
 
-    if (avgDelay > 100.0) {
-        std::cout << "⚠ NOTE: Avg delay " << avgDelay << " ms > 100 ms\n";
+    if (result.avgDelayMs > 100.0) {
+        std::cout << "⚠ NOTE: Avg delay " << result.avgDelayMs << " ms > 100 ms\n";
     } else {
-        std::cout << "✓ PASS: Avg delay " << avgDelay << " ms <= 100 ms\n";
+        std::cout << "✓ PASS: Avg delay " << result.avgDelayMs << " ms <= 100 ms\n";
     }
 
-    if (groundNodes > 0) {
+    if (config.groundNodes > 0) {
         std::cout << "\n✓ Week 22 Day 3-4: Unified Simulation Framework (Dual-Layer) COMPLETE\n";
     } else {
         std::cout << "\n✓ Week 21 Day 4: Unified Simulation Framework (ISL-only) COMPLETE\n";
     }
+}
+
+/**
+ * One forked child run: its label, output path and body.
+ */
+struct ForkVariant {
+    std::string label;       ///< Progress label, e.g. "aodv seed 3"
+    std::string outputFile;
+    std::function<int(std::string&)> run;  ///< Child body: fills the CSV, returns exit code
+    int resultFd = -1;       ///< Read end of the child's result pipe
+};
+
+/**
+ * Start a child running variant.run; the parent keeps the pipe's read end.
+ *
+ * @param quiet Silence the child's stdout (concurrent children interleave)
+ * @return Child pid, or -1 if pipe()/fork() failed
+ */
+static pid_t SpawnChild(ForkVariant& variant, bool quiet) {
+    int fds[2];
+    if (pipe(fds) != 0) {
+        std::cerr << "ERROR: pipe() failed: " << std::strerror(errno) << "\n";
+        return -1;
+    }
+
+    std::cout.flush();  // Unflushed parent output would be duplicated in the child
+    pid_t pid = fork();
+    if (pid < 0) {
+        std::cerr << "ERROR: fork() failed: " << std::strerror(errno) << "\n";
+        close(fds[0]);
+        close(fds[1]);
+        return -1;
+    }
+
+    if (pid == 0) {
+        close(fds[0]);
+        if (quiet) {
+            int devNull = open("/dev/null", O_WRONLY);
+            if (devNull >= 0) {
+                dup2(devNull, STDOUT_FILENO);
+                close(devNull);
+            }
+        }
+
+        std::string csv;
+        int status = variant.run(csv);
+
+        const char* data = csv.data();
+        size_t remaining = csv.size();
+        while (status == 0 && remaining > 0) {
+            ssize_t written = write(fds[1], data, remaining);
+            if (written < 0) {
+                if (errno == EINTR) {
+                    continue;
+                }
+                status = 1;
+                break;
+            }
+            data += written;
+            remaining -= written;
+        }
+        close(fds[1]);
+        std::cout.flush();
+        _exit(status);  // Skip the parent's atexit handlers and static destructors
+    }
+
+    close(fds[1]);
+    variant.resultFd = fds[0];
+    return pid;
+}
+
+/**
+ * Read a finished child's CSV (pipe closed at child exit).
+ */
+static std::string ReadForkResult(int fd) {
+    std::string csv;
+    char buffer[4096];
+    ssize_t n;
+    while ((n = read(fd, buffer, sizeof(buffer))) != 0) {
+        if (n < 0) {
+            if (errno == EINTR) {
+                continue;
+            }
+            break;
+        }
+        csv.append(buffer, n);
+    }
+    close(fd);
+    return csv;
+}
+
+/**
+ * Fork every variant (at most `jobs` at once) and store each child's CSV at
+ * its output path.
+ *
+ * Children write a few hundred bytes, well under the pipe buffer, so they
+ * never block on the pipe and it is safe to read only after waitpid().
+ *
+ * @return Number of failed variants
+ */
+static uint32_t RunForkedVariants(std::vector<ForkVariant>& variants, uint32_t jobs) {
+    std::map<pid_t, size_t> running;
+    size_t next = 0;
+    uint32_t failed = 0;
+    while (next < variants.size() || !running.empty()) {
+        while (next < variants.size() && running.size() < jobs) {
+            pid_t pid = SpawnChild(variants[next], jobs > 1);
+            if (pid < 0) {
+                ++failed;
+            } else {
+                running[pid] = next;
+            }
+            ++next;
+        }
+        if (running.empty()) {
+            continue;
+        }
+
+        int status = 0;
+        pid_t pid = waitpid(-1, &status, 0);
+        if (pid < 0) {
+            if (errno == EINTR) {
+                continue;
+            }
+            std::cerr << "ERROR: waitpid() failed: " << std::strerror(errno) << "\n";
+            return failed + static_cast<uint32_t>(running.size() + variants.size() - next);
+        }
+        auto it = running.find(pid);
+        if (it == running.end()) {
+            continue;
+        }
+        ForkVariant& variant = variants[it->second];
+        running.erase(it);
+
+        std::string csv = ReadForkResult(variant.resultFd);
+        bool ok = WIFEXITED(status) && WEXITSTATUS(status) == 0 && !csv.empty();
+        if (ok) {
+            std::ofstream out(variant.outputFile);
+            out << csv;
+            ok = static_cast<bool>(out);
+        }
+        if (ok) {
+            std::cout << "  ✓ " << variant.label << " → " << variant.outputFile << "\n";
+        } else {
+            ++failed;
+            std::cout << "  ✗ " << variant.label << " failed";
+            if (WIFSIGNALED(status)) {
+                std::cout << " (signal " << WTERMSIG(status) << ")";
+            }
+            std::cout << "\n";
+        }
+    }
+    return failed;
+}
+
+/**
+ * Child side of the fork server: re-seed the inherited satellite layer, build
+ * the seed-dependent layers (ground nodes, mobility, WiFi, protocol, traffic)
+ * and run.
+ *
+ * @return 0 on success, otherwise the child's exit code
+ */
+static int RunForkChild(const SimConfig& config, Scenario& scenario, uint32_t seed,
+                        const std::string& outputFile, std::string& csv) {
+    // Streams of objects built by the parent were drawn from the parent's seed
+    RngSeedManager::SetSeed(seed);
+    if (!config.groundOnly) {
+        int64_t stream = 0;
+        InternetStackHelper internet;
+        stream += internet.AssignStreams(scenario.satNodes, stream);
+        scenario.islProtocol->AssignStreams(scenario.satNodes, stream);
+    }
+
+    PrintRunHeader(config, seed);
+    if (!CreateGroundNodes(config, scenario)) {
+        return 1;
+    }
+    CreateGroundProtocol(config, scenario);
+    CreateGroundWifi(config, scenario);
+    InstallGroundProtocol(config, scenario);
+    InstallTraffic(config, scenario);
+    InstallMonitors(config, scenario, outputFile);
+
+    RunResult result;
+    RunAndCollect(config, scenario, result);
+    csv = FormatResultCsv(config, seed, result);
+    WriteSidecars(result, outputFile);
+    return 0;
+}
+
+/**
+ * Fork server: build the seed-independent satellite layer (Walker-Delta
+ * positions, ISL topology, ISL protocol stack, point-to-point mesh, addresses
+ * and static routes) once, then fork one child per (ground protocol, seed).
+ *
+ * @return 0 if every child succeeded, 1 otherwise
+ */
+static int RunForkServer(const SimConfig& config, const std::vector<uint32_t>& seeds, bool batch) {
+    std::vector<std::string> protocols;
+    std::stringstream names(config.groundRouting);
+    std::string name;
+    while (std::getline(names, name, ',')) {
+        if (!name.empty()) {
+            protocols.push_back(name);
+        }
+    }
+
+    const std::vector<std::string> supported = RoutingProtocolFactory::GetSupportedProtocols();
+    for (const std::string& protocol : protocols) {
+        std::string lower = protocol;
+        std::transform(lower.begin(), lower.end(), lower.begin(), ::tolower);
+        if (std::find(supported.begin(), supported.end(), lower) == supported.end()) {
+            std::cerr << "ERROR: Unknown ground protocol '" << protocol << "'\n";
+            return 1;
+        }
+    }
+    if (protocols.size() > 1 && config.outputFile.find("{protocol}") == std::string::npos) {
+        std::cerr << "ERROR: Several ground protocols need {protocol} in --output\n";
+        return 1;
+    }
+
+    // Shared, seed-independent setup
+    ResetRunState(seeds.front());
+    std::cout << "\n=== Fork server: shared satellite layer ===\n";
+    Scenario shared;
+    CreateSatellites(config, shared);
+    CreateIslProtocol(config, shared);
+    InstallIslProtocol(config, shared);
+    BuildIslNetwork(config, shared);
+
+    std::vector<ForkVariant> variants;
+    for (const std::string& protocol : protocols) {
+        std::string lower = protocol;
+        std::transform(lower.begin(), lower.end(), lower.begin(), ::tolower);
+        SimConfig variantConfig = config;
+        variantConfig.groundRouting = protocol;
+
+        for (uint32_t seed : seeds) {
+            std::string outputFile = config.outputFile;
+            size_t pos = outputFile.find("{protocol}");
+            if (pos != std::string::npos) {
+                outputFile.replace(pos, 10, lower);
+            }
+            if (batch) {
+                outputFile = SeedOutputFile(outputFile, seed);
+            }
+            variants.push_back({lower + " seed " + std::to_string(seed), outputFile,
+                                [variantConfig, &shared, seed, outputFile](std::string& csv) {
+                                    return RunForkChild(variantConfig, shared, seed, outputFile, csv);
+                                }});
+        }
+    }
+
+    std::cout << "  ✓ Shared setup complete; forking " << variants.size() << " runs ("
+              << config.forkJobs << " at a time)\n";
+    uint32_t failed = RunForkedVariants(variants, config.forkJobs);
+
+    Simulator::Destroy();
+    std::cout << "\n✓ Fork server complete: " << (variants.size() - failed) << "/"
+              << variants.size() << " runs succeeded\n";
+    return failed > 0 ? 1 : 0;
+}
+
+/**
+ * Parse a --fork-traffic list ("1Mbps:5,2Mbps,500kbps:3"; flows default to
+ * --ground-flows) into (rate, flows) pairs.
+ *
+ * @return false if the list is empty or a flow count is out of range
+ */
+static bool ParseTrafficVariants(const std::string& spec, uint32_t defaultFlows,
+                                 std::vector<std::pair<std::string, uint32_t>>& variants) {
+    std::stringstream items(spec);
+    std::string item;
+    while (std::getline(items, item, ',')) {
+        if (item.empty()) {
+            continue;
+        }
+        size_t colon = item.find(':');
+        std::string rate = item.substr(0, colon);
+        uint32_t flows = defaultFlows;
+        if (colon != std::string::npos) {
+            try {
+                flows = std::stoul(item.substr(colon + 1));
+            } catch (const std::exception&) {
+                return false;
+            }
+        }
+        if (rate.empty() || flows == 0 || flows > MAX_GROUND_FLOWS) {
+            return false;
+        }
+        variants.emplace_back(rate, flows);
+    }
+    return !variants.empty();
+}
+
+/**
+ * Warmup fork: build the scenario without traffic, run to CONVERGENCE_TIME
+ * so routing has converged, then fork one child per traffic variant. Each
+ * child installs its own rate/flow set from the same converged state (and the
+ * same RNG state, so variants share common random numbers) and runs on to
+ * simTime.
+ *
+ * FlowMonitor and PacketTracer are installed before the warmup, so routing
+ * control traffic from t=0 is counted exactly as in a normal run. Output
+ * paths replace {traffic} with "<rate>_<flows>flows", or append it.
+ *
+ * @return 0 if every variant succeeded, otherwise the process exit code
+ */
+static int RunWarmupFork(const SimConfig& config, uint32_t seed, const std::string& outputFile) {
+    std::vector<std::pair<std::string, uint32_t>> traffic;
+    if (!ParseTrafficVariants(config.forkTraffic, config.groundFlows, traffic)) {
+        std::cerr << "ERROR: Invalid --fork-traffic list '" << config.forkTraffic
+                  << "' (use e.g. 1Mbps:5,2Mbps:3; flows 1-" << MAX_GROUND_FLOWS << ")\n";
+        return 1;
+    }
+
+    ResetRunState(seed);
+    PrintRunHeader(config, seed);
+
+    // Same step order as a normal run, minus traffic
+    Scenario scenario;
+    CreateSatellites(config, scenario);
+    if (!CreateGroundNodes(config, scenario)) {
+        Simulator::Destroy();
+        return 1;
+    }
+    CreateIslProtocol(config, scenario);
+    CreateGroundProtocol(config, scenario);
+    CreateGroundWifi(config, scenario);
+    InstallIslProtocol(config, scenario);
+    InstallGroundProtocol(config, scenario);
+    BuildIslNetwork(config, scenario);
+    InstallMonitors(config, scenario, outputFile);
+
+    std::cout << "\nWarmup: running to t=" << CONVERGENCE_TIME << "s before forking "
+              << traffic.size() << " traffic variants...\n";
+    Simulator::Stop(Seconds(CONVERGENCE_TIME));
+    Simulator::Run();
+
+    std::vector<ForkVariant> variants;
+    for (const auto& [rate, flows] : traffic) {
+        SimConfig variantConfig = config;
+        variantConfig.groundRate = rate;
+        variantConfig.groundFlows = flows;
+
+        std::string label = rate + "_" + std::to_string(flows) + "flows";
+        std::string path = outputFile;
+        size_t pos = path.find("{traffic}");
+        if (pos != std::string::npos) {
+            path.replace(pos, 9, label);
+        } else {
+            size_t dot = path.rfind('.');
+            size_t slash = path.rfind('/');
+            if (dot == std::string::npos || (slash != std::string::npos && dot < slash)) {
+                dot = path.size();
+            }
+            path.insert(dot, "_" + label);
+        }
+
+        variants.push_back({label + " seed " + std::to_string(seed), path,
+                            [variantConfig, &scenario, seed, path](std::string& csv) {
+                                InstallTraffic(variantConfig, scenario);
+                                RunResult result;
+                                RunAndCollect(variantConfig, scenario, result);
+                                csv = FormatResultCsv(variantConfig, seed, result);
+                                WriteSidecars(result, path);
+                                return 0;
+                            }});
+    }
+
+    uint32_t failed = RunForkedVariants(variants, config.forkJobs);
+
+    Simulator::Destroy();
+    std::cout << "\n✓ Warmup fork complete (seed " << seed << "): " << (variants.size() - failed)
+              << "/" << variants.size() << " variants succeeded\n";
+    return failed > 0 ? 1 : 0;
+}
+
+int main(int argc, char *argv[]) {
+    SimConfig config;
+    ParseConfig(argc, argv, config);
+
+    int status = ValidateConfig(config);
+    if (status != 0) {
+        return status;
+    }
+
+    // Single run (--seed) or batch (--seeds) in this process
+    std::vector<uint32_t> seeds;
+    bool batch = !config.seeds.empty();
+    if (batch && !ParseSeedList(config.seeds, seeds)) {
+        std::cerr << "ERROR: Invalid --seeds list '" << config.seeds << "' (use e.g. 1-15 or 1,3,5)\n";
+        return 1;
+    }
+    if (!batch) {
+        seeds.push_back(config.seed);
+    }
+
+    if (config.forkServer) {
+        return RunForkServer(config, seeds, batch);
+    }
+
+    for (uint32_t seed : seeds) {
+        std::string outputFile = batch ? SeedOutputFile(config.outputFile, seed) : config.outputFile;
+        if (!config.forkTraffic.empty()) {
+            status = RunWarmupFork(config, seed, outputFile);
+            if (status != 0) {
+                return status;
+            }
+            continue;
+        }
+        std::cout << "Output: " << outputFile << "\n";
+
+        RunResult result;
+        status = RunSimulation(config, seed, outputFile, result);
+        if (status != 0) {
+            return status;
+        }
+        WriteResults(config, seed, result, outputFile);
+        PrintValidation(config, result);
+    }
+
+    if (batch) {
+        std::cout << "\n✓ Batch complete: " << seeds.size() << " seeds (" << config.seeds << ")\n";
+    }
     return 0;
 }
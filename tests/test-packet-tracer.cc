@@ -0,0 +1,220 @@
+/**
+ * Phase 6 Week 27: PacketTracer Unit Tests
+ *
+ * Verifies byte counters on a 3-node point-to-point line
+ *
+ *   n0 ──(10.0.1.0/24)── n1 ──(10.0.2.0/24)── n2
+ *
+ * where n1 is multi-homed (two devices). UDP packets of known size are sent
+ * n0 → n2 and forwarded by n1; point-to-point links and global routing
+ * generate no control traffic, so every counted byte is accounted for.
+ *
+ * Tests:
+ * 1. All devices installed: n1 is counted once per packet, not per device
+ * 2. Installing the same devices twice does not double-count
+ * 3. Interface filter: only the n0-n1 link installed, n1's second
+ *    interface is ignored
+ * 4. Classification: non-data UDP ports are control, [9, 14] is data
+ * 5. Loopback: packets a traced node sends to itself are counted
+ *
+ * Usage:
+ *   make test-nc9
+ */
+
+#include "ns3/core-module.h"
+#include "ns3/network-module.h"
+#include "ns3/internet-module.h"
+#include "ns3/point-to-point-module.h"
+#include "../src/packet-tracer.h"
+#include <functional>
+#include <iostream>
+
+using namespace ns3;
+
+// UDP payload size and packet count per burst
+static const uint32_t PAYLOAD = 500;
+static const uint32_t BURST_PACKETS = 20;
+
+// IP-layer size of one packet (payload + UDP 8 + IPv4 20)
+static const uint64_t IP_SIZE = PAYLOAD + 8 + 20;
+
+static uint32_t g_failures = 0;
+
+static void Check(bool condition, const std::string& what, uint64_t actual, uint64_t expected) {
+    if (condition) {
+        std::cout << "  ✓ " << what << " = " << actual << "\n";
+    } else {
+        std::cout << "  ✗ " << what << " = " << actual << " (expected " << expected << ")\n";
+        ++g_failures;
+    }
+}
+
+static void CheckEqual(const std::string& what, uint64_t actual, uint64_t expected) {
+    Check(actual == expected, what, actual, expected);
+}
+
+/**
+ * Three-node line with a multi-homed middle node.
+ */
+struct Line {
+    NodeContainer nodes;
+    NetDeviceContainer link01;
+    NetDeviceContainer link12;
+    Ipv4InterfaceContainer if12;
+};
+
+static Line BuildLine() {
+    Line line;
+    Ipv4AddressGenerator::Reset();  // Scenarios reuse the same subnets
+    line.nodes.Create(3);
+
+    PointToPointHelper p2p;
+    p2p.SetDeviceAttribute("DataRate", StringValue("100Mbps"));
+    p2p.SetChannelAttribute("Delay", StringValue("1ms"));
+    line.link01 = p2p.Install(line.nodes.Get(0), line.nodes.Get(1));
+    line.link12 = p2p.Install(line.nodes.Get(1), line.nodes.Get(2));
+
+    InternetStackHelper internet;
+    internet.Install(line.nodes);
+
+    Ipv4AddressHelper address;
+    address.SetBase("10.0.1.0", "255.255.255.0");
+    address.Assign(line.link01);
+    address.SetBase("10.0.2.0", "255.255.255.0");
+    line.if12 = address.Assign(line.link12);
+
+    Ipv4GlobalRoutingHelper::PopulateRoutingTables();
+    return line;
+}
+
+/**
+ * Send BURST_PACKETS UDP packets n0 → n2 on the given port (n2 listens, so no
+ * ICMP port-unreachable is generated).
+ */
+static void SendBurst(Line& line, uint16_t port) {
+    Ptr<Socket> sink = Socket::CreateSocket(line.nodes.Get(2), UdpSocketFactory::GetTypeId());
+    sink->Bind(InetSocketAddress(Ipv4Address::GetAny(), port));
+
+    Ptr<Socket> source = Socket::CreateSocket(line.nodes.Get(0), UdpSocketFactory::GetTypeId());
+    source->Connect(InetSocketAddress(line.if12.GetAddress(1), port));
+    for (uint32_t i = 0; i < BURST_PACKETS; ++i) {
+        Simulator::Schedule(Seconds(1.0 + 0.01 * i), [source]() {
+            source->Send(Create<Packet>(PAYLOAD));
+        });
+    }
+}
+
+/**
+ * Send BURST_PACKETS UDP packets from n2 to 127.0.0.1 (loopback interface).
+ */
+static void SendToSelf(Line& line, uint16_t port) {
+    Ptr<Socket> sink = Socket::CreateSocket(line.nodes.Get(2), UdpSocketFactory::GetTypeId());
+    sink->Bind(InetSocketAddress(Ipv4Address::GetAny(), port));
+
+    Ptr<Socket> source = Socket::CreateSocket(line.nodes.Get(2), UdpSocketFactory::GetTypeId());
+    source->Connect(InetSocketAddress(Ipv4Address::GetLoopback(), port));
+    for (uint32_t i = 0; i < BURST_PACKETS; ++i) {
+        Simulator::Schedule(Seconds(1.0 + 0.01 * i), [source]() {
+            source->Send(Create<Packet>(PAYLOAD));
+        });
+    }
+}
+
+/**
+ * Build the line, install the tracer via `install`, send one burst and run.
+ */
+static void RunScenario(PacketTracer& tracer, uint16_t port,
+                        const std::function<void(PacketTracer&, Line&)>& install) {
+    Line line = BuildLine();
+    install(tracer, line);
+    SendBurst(line, port);
+    Simulator::Stop(Seconds(3.0));
+    Simulator::Run();
+    Simulator::Destroy();
+}
+
+static void TestMultiHomedNode() {
+    std::cout << "\nTest 1: Multi-homed node counted once per packet\n";
+    PacketTracer tracer;
+    RunScenario(tracer, 10, [](PacketTracer& t, Line& line) {
+        NetDeviceContainer all(line.link01, line.link12);  // n1 appears twice
+        t.Install(all);
+    });
+
+    // TX: n0 sends, n1 forwards; RX: n1 and n2 receive
+    CheckEqual("data bytes TX", tracer.GetDataBytesTx(), 2 * BURST_PACKETS * IP_SIZE);
+    CheckEqual("data bytes RX", tracer.GetDataBytesRx(), 2 * BURST_PACKETS * IP_SIZE);
+    CheckEqual("control bytes TX", tracer.GetControlBytesTx(), 0);
+}
+
+static void TestRepeatedInstall() {
+    std::cout << "\nTest 2: Repeated Install does not double-count\n";
+    PacketTracer tracer;
+    RunScenario(tracer, 10, [](PacketTracer& t, Line& line) {
+        t.Install(line.link01);
+        t.Install(line.link12);
+        t.Install(line.link01);
+    });
+
+    CheckEqual("data bytes TX", tracer.GetDataBytesTx(), 2 * BURST_PACKETS * IP_SIZE);
+    CheckEqual("data bytes RX", tracer.GetDataBytesRx(), 2 * BURST_PACKETS * IP_SIZE);
+}
+
+static void TestInterfaceFilter() {
+    std::cout << "\nTest 3: Only installed interfaces are counted\n";
+    PacketTracer tracer;
+    RunScenario(tracer, 10, [](PacketTracer& t, Line& line) {
+        t.Install(line.link01);  // n1's link to n2 is not traced
+    });
+
+    // TX: n0 only (n1 forwards on the untraced interface); RX: n1 on link01
+    CheckEqual("data bytes TX", tracer.GetDataBytesTx(), BURST_PACKETS * IP_SIZE);
+    CheckEqual("data bytes RX", tracer.GetDataBytesRx(), BURST_PACKETS * IP_SIZE);
+}
+
+static void TestControlClassification() {
+    std::cout << "\nTest 4: Non-data UDP port counted as control\n";
+    PacketTracer tracer;
+    RunScenario(tracer, 654, [](PacketTracer& t, Line& line) {
+        t.Install(NetDeviceContainer(line.link01, line.link12));
+    });
+
+    CheckEqual("control bytes TX", tracer.GetControlBytesTx(), 2 * BURST_PACKETS * IP_SIZE);
+    CheckEqual("data bytes TX", tracer.GetDataBytesTx(), 0);
+
+    tracer.Reset();
+    CheckEqual("control bytes TX after Reset", tracer.GetControlBytesTx(), 0);
+}
+
+static void TestLoopback() {
+    std::cout << "\nTest 5: Loopback traffic of a traced node is counted\n";
+    PacketTracer tracer;
+    Line line = BuildLine();
+    tracer.Install(line.link12);
+    SendToSelf(line, 10);
+    Simulator::Stop(Seconds(3.0));
+    Simulator::Run();
+    Simulator::Destroy();
+
+    CheckEqual("data bytes TX", tracer.GetDataBytesTx(), BURST_PACKETS * IP_SIZE);
+    CheckEqual("data bytes RX", tracer.GetDataBytesRx(), BURST_PACKETS * IP_SIZE);
+}
+
+int main(int argc, char *argv[]) {
+    CommandLine cmd(__FILE__);
+    cmd.Parse(argc, argv);
+
+    std::cout << "=== PacketTracer Unit Tests ===\n";
+    TestMultiHomedNode();
+    TestRepeatedInstall();
+    TestInterfaceFilter();
+    TestControlClassification();
+    TestLoopback();
+
+    if (g_failures > 0) {
+        std::cout << "\n✗ " << g_failures << " check(s) failed\n";
+        return 1;
+    }
+    std::cout << "\n✓ All PacketTracer tests passed\n";
+    return 0;
+}
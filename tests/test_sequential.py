@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for the group-sequential stopping rule (analysis/sequential.py).
+
+Run from the repository root:
+    python3 -m pytest -q tests/test_sequential.py
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "analysis"))
+
+from sequential import conditional_power, decide, nominal_level  # noqa: E402
+
+NC9_GROUND = Path(__file__).resolve().parent.parent / "results/nc9_overhead_invariance/ground_only"
+PROTOCOLS = ["AODV", "OLSR", "DSDV"]
+
+
+def write_runs(directory: Path, nrl: dict) -> None:
+    """Write metric,value run CSVs: nrl[protocol] = values for seeds 1..n."""
+    directory.mkdir(parents=True, exist_ok=True)
+    for protocol, values in nrl.items():
+        for seed, value in enumerate(values, start=1):
+            (directory / f"{protocol.lower()}_seed{seed}.csv").write_text(
+                f"metric,value\nground_routing,{protocol}\nseed,{seed}\nnrl,{value}\n")
+
+
+def run_looks(tmp_path: Path, nrl: dict, n_max: int = 15, batch: int = 3):
+    """Interim looks after every batch; returns the decision that stopped the sweep."""
+    for n in range(batch, n_max + 1, batch):
+        look = tmp_path / f"look{n}"
+        write_runs(look, {p: values[:n] for p, values in nrl.items()})
+        decision = decide(look, n_max=n_max, batch=batch, ci_half_width=0.0)
+        if decision.stop:
+            return decision
+    raise AssertionError("sweep never stopped")
+
+
+def test_futility_stops_most_null_sweeps_early(tmp_path):
+    # Under the null ~90% of sweeps stop early for futility (mean n ≈ 8 of 15)
+    decisions = []
+    for sweep in range(20):
+        rng = np.random.default_rng(sweep)
+        nrl = {p: rng.normal(0.25, 0.1, 15) for p in PROTOCOLS}
+        decisions.append(run_looks(tmp_path / f"sweep{sweep}", nrl))
+    early = [d for d in decisions if d.reason.startswith("futility")]
+    assert len(early) >= 14
+    assert all(d.n < 15 for d in early)
+    assert np.mean([d.n for d in decisions]) < 11
+
+
+def test_real_difference_is_not_stopped_for_futility(tmp_path):
+    rng = np.random.default_rng(7)
+    nrl = {p: rng.normal(0.25 + 0.2 * (p == "DSDV"), 0.1, 15) for p in PROTOCOLS}
+    decision = run_looks(tmp_path, nrl)
+    assert decision.reason == "protocols differ"
+
+
+def test_futility_disabled_runs_to_budget(tmp_path):
+    rng = np.random.default_rng(7)
+    write_runs(tmp_path, {p: rng.normal(0.25, 0.1, 6) for p in PROTOCOLS})
+    decision = decide(tmp_path, n_max=15, batch=3, ci_half_width=0.0, futility_power=0.0)
+    assert not decision.stop
+
+
+def test_conditional_power_is_monotone_in_evidence():
+    final_alpha = nominal_level(15, 15, 3)
+    powers = [conditional_power(p, 2, 0.4, final_alpha) for p in (0.9, 0.5, 0.1, 0.01)]
+    assert powers == sorted(powers)
+    assert conditional_power(0.01, 2, 1.0, final_alpha) == 1.0
+    assert conditional_power(0.5, 2, 1.0, final_alpha) == 0.0
+
+
+@pytest.mark.skipif(not NC9_GROUND.is_dir(), reason="NC9 ground-only results not present")
+def test_nc9_ground_null_stops_at_second_look():
+    decision = decide(NC9_GROUND, pattern="*_seed[1-6].csv")
+    assert decision.stop and decision.reason.startswith("futility")
+    assert decision.n == 6